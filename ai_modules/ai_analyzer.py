@@ -1,41 +1,104 @@
+import copy
 import logging
-import re
-import numpy as np
-import PyPDF2
-import docx
-import spacy
-from sklearn.feature_extraction.text import CountVectorizer
 import streamlit as st
 
+from ai_modules.ats_scoring import get_scorer
+from ai_modules.document import CONTACT_PATTERNS, SECTIONS, ParsedResume
+from ai_modules.extraction import extract_text_from_bytes
+from ai_modules.extraction_sandbox import SANDBOX_ENABLED, ExtractionFailed, get_sandbox_pool
+from ai_modules.job_profile import JobProfile, get_job_profile
+from ai_modules.nlp_model import get_nlp
+from ai_modules.result_cache import analysis_key, get_analysis_cache
+from ai_modules.skill_taxonomy import get_taxonomy
+from ai_modules.text_cache import content_hash, get_text_cache, read_upload_bytes
+
 logger = logging.getLogger(__name__)
 
+
+def find_skills(text):
+    """Returns {category: set of skills} found in ``text``."""
+    return get_taxonomy().find_by_category(text)
+
+
 class ResumeAnalyzer:
-    def __init__(self):
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except Exception:
-            # fallback: create blank english model if not available
-            self.nlp = spacy.blank("en")
+    @property
+    def nlp(self):
+        # shared per process and warmed up at server start, see ai_modules.nlp_model
+        return get_nlp()
+
+    def analyze(self, uploaded_file, job_desc, job_role=""):
+        """
+        Runs the full pipeline (text, ATS, format, skills, suggestions) for one
+        upload. ``job_desc`` may be text or a JobProfile. Results are memoized
+        per (resume hash, normalized JD hash, scorer version), so repeat
+        analyses and reruns return immediately.
+
+        The result also carries the extracted ``text`` and ``complete``, which
+        is False when extraction or scoring failed (the error is already shown).
+        """
+        job_desc = self.build_job_profile(job_role, job_desc)
+        cache = get_analysis_cache()
+        key = analysis_key(content_hash(read_upload_bytes(uploaded_file)), job_desc)
+        # a text cache hit whenever the analysis itself is cached
+        resume_text = self.extract_text(uploaded_file)
+        result = cache.get(key)
+        complete = result is not None and bool(resume_text)
+        if result is None:
+            resume = self.parse(resume_text)
+            ats_score = self.calculate_ats_score(resume, job_desc)
+            format_score = self.analyze_format(resume)
+            skills_data = self.extract_skills(resume, job_desc)
+            result = {
+                "ats_score": ats_score,
+                "format_score": format_score,
+                "skills_data": skills_data,
+                "suggestions": self.get_suggestions(ats_score, format_score, skills_data)
+            }
+            # a failed stage reports None or an error; only cache complete results
+            complete = bool(resume_text) and (ats_score is not None or not job_desc)
+            if complete:
+                cache.put(key, result)
+        return {**copy.deepcopy(result), "text": resume_text, "complete": complete}
+
+    def build_job_profile(self, job_role, job_desc):
+        """
+        Compiles a job description once for scoring any number of resumes.
+        Profiles are cached by JD hash; an existing JobProfile is returned as is.
+        """
+        return get_job_profile(job_role, job_desc)
+
+    def parse(self, text):
+        """
+        Normalizes resume text once for all scoring stages. Every stage also
+        accepts plain text and parses it on the fly.
+        """
+        return ParsedResume.of(text)
 
     def extract_text(self, uploaded_file):
         """
         Accepts a file-like UploadedFile (Streamlit) and returns extracted text.
+        Results are cached by the SHA-256 of the file contents, so re-analyzing
+        the same upload skips PDF/DOCX parsing. Parsing itself runs in the
+        sandboxed worker pool unless SMARTHIRE_SANDBOX_ENABLED=0.
         """
         try:
-            file_type = getattr(uploaded_file, "type", "")
-            # PDF
-            if file_type == "application/pdf" or str(uploaded_file.name).lower().endswith(".pdf"):
-                reader = PyPDF2.PdfReader(uploaded_file)
-                text = ""
-                for page in reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            else:
-                # DOCX / other
-                doc = docx.Document(uploaded_file)
-                text = " ".join([p.text for p in doc.paragraphs])
-            return text or ""
+            data = read_upload_bytes(uploaded_file)
+            digest = content_hash(data)
+            cache = get_text_cache()
+            text = cache.get(digest)
+            if text is None:
+                name = str(getattr(uploaded_file, "name", ""))
+                file_type = getattr(uploaded_file, "type", "")
+                if SANDBOX_ENABLED:
+                    text = get_sandbox_pool().extract(data, name, file_type)
+                else:
+                    text = extract_text_from_bytes(data, name, file_type)
+                cache.put(digest, text)
+            return text
+        except ExtractionFailed as e:
+            logger.warning("Extraction of %s failed: %s", getattr(uploaded_file, "name", ""), e)
+            st.error(f"Error extracting text from file: {e}")
+            return ""
         except Exception as e:
             logger.exception("Failed to extract text")
             st.error(f"Error extracting text from file: {e}")
@@ -45,72 +108,26 @@ class ResumeAnalyzer:
         if not job_desc:
             return None
 
-        def preprocess_text(text):
-            text = re.sub(r"[^\w\s]", " ", (text or "").lower())
-            text = " ".join(text.split())
-            return text
-
         try:
-            resume_processed = preprocess_text(resume_text)
-            job_processed = preprocess_text(job_desc)
-
-            vectorizer = CountVectorizer(
-                stop_words="english",
-                ngram_range=(1, 2),
-                min_df=1,
-                binary=True
-            )
-
-            matrix = vectorizer.fit_transform([resume_processed, job_processed]).toarray()
-            feature_names = vectorizer.get_feature_names_out()
-
-            resume_vector = np.asarray(matrix[0], dtype=int)
-            job_vector = np.asarray(matrix[1], dtype=int)
-
-            # boolean matches
-            matches = (resume_vector > 0) & (job_vector > 0)
-            match_terms = [term for term, match in zip(feature_names, matches) if match]
-
-            total_weight = 0.0
-            matched_weight = 0.0
-
-            # Use vocabulary_ map to get indices safely
-            vocab = vectorizer.vocabulary_
-            for term, idx in vocab.items():
-                if idx is None or idx >= len(job_vector):
-                    continue
-                if job_vector[idx] > 0:
-                    weight = 2.0 if len(term.split()) > 1 else 1.0
-                    total_weight += weight
-                    if resume_vector[idx] > 0:
-                        matched_weight += weight
-
-            score = 0.0
-            if total_weight > 0:
-                score = (matched_weight / total_weight) * 100.0
-
-                # coverage bonus scaled safely
-                if len(feature_names) > 0:
-                    coverage_bonus = min(10.0, (len(match_terms) / len(feature_names)) * 20.0)
-                    score = min(100.0, score + coverage_bonus)
-
-            return int(round(score))
+            return get_scorer().score(resume_text, job_desc)
         except Exception as e:
             logger.exception("Error calculating ATS score")
             st.error(f"Error calculating ATS score: {e}")
             return None
 
+    def rank_resumes(self, job_desc, resumes, chunk_size=None, top_k=None):
+        """
+        Bulk entry point: ranks many resumes (texts or uploaded files) against
+        one job description or JobProfile. See ai_modules.batch_scorer.rank_resumes.
+        """
+        from ai_modules.batch_scorer import DEFAULT_CHUNK_SIZE, rank_resumes
+        return rank_resumes(self, job_desc, resumes, chunk_size=chunk_size or DEFAULT_CHUNK_SIZE, top_k=top_k)
+
     def analyze_format(self, text):
         try:
-            text_lower = (text or "").lower()
-            sections = ["experience", "education", "skills", "projects"]
-            section_score = sum(1 for s in sections if s in text_lower) / len(sections)
-
-            contact_patterns = [
-                r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
-                r"\b\d{3}[-.]?\d{3}[-.]?\d{4}\b"
-            ]
-            contact_score = sum(1 for p in contact_patterns if re.search(p, text, flags=re.IGNORECASE)) / len(contact_patterns)
+            resume = ParsedResume.of(text)
+            section_score = len(resume.section_mentions) / len(SECTIONS)
+            contact_score = sum(1 for hits in resume.contacts.values() if hits) / len(CONTACT_PATTERNS)
 
             final = round(((section_score + contact_score) / 2.0) * 100.0)
             return final
@@ -120,36 +137,12 @@ class ResumeAnalyzer:
             return 0
 
     def extract_skills(self, text, job_desc):
-        skills_categories = {
-            "programming": {
-                "python", "java", "javascript", "typescript", "c++", "c#", "ruby", "php",
-                "swift", "kotlin", "rust", "golang", "scala", "perl"
-            },
-            "web": {
-                "html", "css", "react", "angular", "vue", "node.js", "django", "flask",
-                "spring", "express.js", "jquery", "bootstrap", "sass", "webpack"
-            },
-            "database": {
-                "sql", "mysql", "postgresql", "mongodb", "oracle", "redis", "elasticsearch",
-                "dynamodb", "cassandra", "sqlite", "neo4j"
-            },
-            "cloud": {
-                "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "jenkins",
-                "circleci", "ansible", "puppet", "chef"
-            },
-            "ai_ml": {
-                "machine learning", "deep learning", "tensorflow", "pytorch", "keras",
-                "scikit-learn", "pandas", "numpy", "opencv", "nlp"
-            },
-            "soft_skills": {
-                "leadership", "communication", "teamwork", "problem solving",
-                "critical thinking", "time management", "project management"
-            }
-        }
-
         try:
-            resume_text = (text or "").lower()
-            job_text = (job_desc or "").lower()
+            resume_found = ParsedResume.of(text).skills
+            if isinstance(job_desc, JobProfile):
+                job_found = job_desc.skills
+            else:
+                job_found = find_skills(job_desc) if job_desc else {}
 
             results = {
                 "by_category": {},
@@ -158,9 +151,9 @@ class ResumeAnalyzer:
                 "additional_skills": set()
             }
 
-            for category, skills in skills_categories.items():
-                resume_skills = {s for s in skills if s in resume_text}
-                job_skills = {s for s in skills if s in job_text} if job_desc else set()
+            for category in get_taxonomy().categories:
+                resume_skills = resume_found[category]
+                job_skills = job_found.get(category, set())
 
                 matched = resume_skills & job_skills
                 missing = job_skills - resume_skills
@@ -0,0 +1,130 @@
+import re
+from functools import lru_cache
+from hashlib import blake2b
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+UNIGRAM_WEIGHT = 1.0
+BIGRAM_WEIGHT = 2.0
+
+# Terms hash to 62-bit ids; bigram ids also carry this flag, so the n-gram
+# weight can be read off a column index without keeping a vocabulary
+BIGRAM_FLAG = 1 << 62
+N_FEATURES = (1 << 63) - 1
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+# same tokenization as sklearn's CountVectorizer default token_pattern
+_TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+
+
+def preprocess_text(text):
+    text = _PUNCTUATION_RE.sub(" ", (text or "").lower())
+    return " ".join(text.split())
+
+
+@lru_cache(maxsize=1 << 18)
+def _term_id(term):
+    return int.from_bytes(blake2b(term.encode("utf-8"), digest_size=8).digest(), "little") >> 2
+
+
+def feature_ids(text) -> np.ndarray:
+    """Sorted, unique hashed unigram/bigram ids of ``text`` with English stop words removed."""
+    return feature_ids_from_tokens(_TOKEN_RE.findall(preprocess_text(text)))
+
+
+def feature_ids_from_tokens(tokens) -> np.ndarray:
+    """As feature_ids, for text that is already lower-cased and tokenized."""
+    tokens = [t for t in tokens if t not in ENGLISH_STOP_WORDS]
+    ids = {_term_id(t) for t in tokens}
+    ids.update(_term_id(f"{a} {b}") | BIGRAM_FLAG for a, b in zip(tokens, tokens[1:]))
+    return np.sort(np.fromiter(ids, dtype=np.int64, count=len(ids)))
+
+
+def term_ids_from_tokens(tokens) -> np.ndarray:
+    """Hashed unigram/bigram id of every occurrence (not de-duplicated), for term counts."""
+    tokens = [t for t in tokens if t not in ENGLISH_STOP_WORDS]
+    ids = [_term_id(t) for t in tokens]
+    ids.extend(_term_id(f"{a} {b}") | BIGRAM_FLAG for a, b in zip(tokens, tokens[1:]))
+    return np.array(ids, dtype=np.int64)
+
+
+def term_weights(ids: np.ndarray) -> np.ndarray:
+    return np.where(ids & BIGRAM_FLAG, BIGRAM_WEIGHT, UNIGRAM_WEIGHT)
+
+
+class ATSScorer:
+    """
+    Keyword-match ATS scoring over stateless hashed unigram/bigram features.
+
+    Nothing is fitted, so one instance can be shared by every session and
+    any number of documents can be vectorized independently. Documents are
+    binary CSR rows over the hashed id space; scoring joins them against the
+    job description's sorted ids, so no dense vector is ever built.
+    """
+
+    def transform(self, texts) -> sp.csr_matrix:
+        """
+        Binary feature matrix with one row per text. Items may also be
+        pre-parsed documents exposing ``feature_ids`` (e.g. ParsedResume).
+        """
+        rows = [t.feature_ids if hasattr(t, "feature_ids") else feature_ids(t) for t in texts]
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(r) for r in rows], out=indptr[1:])
+        indices = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        return sp.csr_matrix(
+            (np.ones(len(indices)), indices, indptr),
+            shape=(len(rows), N_FEATURES)
+        )
+
+    def score_matrix(self, resumes: sp.csr_matrix, job) -> np.ndarray:
+        """
+        Scores every row of ``resumes`` against ``job``: a single-row matrix
+        from ``transform`` or a compiled JobProfile. Returns float scores in [0, 100].
+        """
+        n_rows = resumes.shape[0]
+        if hasattr(job, "total_weight"):
+            job_ids, total_weight = job.feature_ids, job.total_weight
+        else:
+            job_ids = np.sort(job.indices)
+            total_weight = term_weights(job_ids).sum()
+        if total_weight <= 0:
+            return np.zeros(n_rows)
+
+        resume_ids = resumes.indices
+        positions = np.minimum(np.searchsorted(job_ids, resume_ids), len(job_ids) - 1)
+        hits = job_ids[positions] == resume_ids
+        row_of = np.repeat(np.arange(n_rows), np.diff(resumes.indptr))
+
+        match_count = np.bincount(row_of, weights=hits, minlength=n_rows)
+        matched_weight = np.bincount(row_of, weights=hits * term_weights(resume_ids), minlength=n_rows)
+        # size of the combined resume + JD vocabulary: |R| + |J| - |R & J|
+        vocab_size = np.diff(resumes.indptr) + len(job_ids) - match_count
+
+        scores = (matched_weight / total_weight) * 100.0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            coverage_bonus = np.where(vocab_size > 0, np.minimum(10.0, (match_count / vocab_size) * 20.0), 0.0)
+        return np.minimum(100.0, scores + coverage_bonus)
+
+    def score(self, resume_text, job_desc):
+        """
+        Integer score for one resume against a JD text or JobProfile, or None
+        without a job description.
+        """
+        if not job_desc:
+            return None
+        if hasattr(job_desc, "total_weight"):
+            return int(round(self.score_matrix(self.transform([resume_text]), job_desc)[0]))
+        matrix = self.transform([resume_text, job_desc])
+        return int(round(self.score_matrix(matrix[0], matrix[1])[0]))
+
+
+_default_scorer = None
+
+
+def get_scorer() -> ATSScorer:
+    global _default_scorer
+    if _default_scorer is None:
+        _default_scorer = ATSScorer()
+    return _default_scorer
@@ -0,0 +1,82 @@
+import heapq
+import logging
+from itertools import islice
+
+import pandas as pd
+
+from ai_modules.ats_scoring import get_scorer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 256
+RESULT_COLUMNS = ["Rank", "Resume", "ATS Score", "Format Score", "Skills Score", "Matched Skills"]
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _resume_name(item, position):
+    name = getattr(item, "name", None)
+    return str(name) if name else f"Resume {position + 1}"
+
+
+def rank_resumes(analyzer, job_desc, resumes, chunk_size: int = DEFAULT_CHUNK_SIZE, top_k: int = None) -> pd.DataFrame:
+    """
+    Scores an iterable of resumes (plain text or uploaded file objects)
+    against one job description and returns them ranked by ATS score.
+
+    The JD is compiled once into a JobProfile. Resumes are consumed ``chunk_size`` at a time:
+    each chunk is extracted and parsed once (ParsedResume), vectorized into
+    one sparse matrix and scored in a single operation, then dropped. With ``top_k`` only the
+    best rows are retained, so memory stays bounded for any pool size.
+    """
+    scorer = get_scorer()
+    profile = analyzer.build_job_profile("", job_desc)
+    job_skills = profile.skill_set
+
+    # (ats, format, skills, -position) sorts best first; position keeps ties stable
+    ranked = []
+    position = 0
+    for chunk in _chunks(resumes, chunk_size):
+        names, docs = [], []
+        for item in chunk:
+            names.append(_resume_name(item, position))
+            docs.append(analyzer.parse(item if isinstance(item, str) else analyzer.extract_text(item)))
+            position += 1
+
+        ats_scores = scorer.score_matrix(scorer.transform(docs), profile)
+        start = position - len(chunk)
+        for offset, (name, doc, ats) in enumerate(zip(names, docs, ats_scores)):
+            resume_skills = set().union(*doc.skills.values())
+            matched = resume_skills & job_skills
+            skills_score = 100 if not job_skills else int(round(len(matched) / len(job_skills) * 100))
+            row = (
+                int(round(ats)),
+                analyzer.analyze_format(doc),
+                skills_score,
+                -(start + offset),
+                name,
+                ", ".join(sorted(matched))
+            )
+            if top_k is None:
+                ranked.append(row)
+            elif len(ranked) < top_k:
+                heapq.heappush(ranked, row)
+            else:
+                heapq.heappushpop(ranked, row)
+        logger.info("Scored %d resumes", position)
+
+    ranked.sort(reverse=True)
+    return pd.DataFrame(
+        [
+            (rank, name, ats, fmt, skills, matched)
+            for rank, (ats, fmt, skills, _, name, matched) in enumerate(ranked, start=1)
+        ],
+        columns=RESULT_COLUMNS
+    )
@@ -0,0 +1,62 @@
+import re
+from functools import cached_property
+
+from ai_modules.ats_scoring import feature_ids_from_tokens
+from ai_modules.skill_taxonomy import get_taxonomy
+
+SECTIONS = ("experience", "education", "skills", "projects")
+
+# same tokenization as the ATS scorer (sklearn's default token_pattern)
+_TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+CONTACT_PATTERNS = {
+    "email": re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b", re.IGNORECASE),
+    "phone": re.compile(r"\b\d{3}[-.]?\d{3}[-.]?\d{4}\b")
+}
+
+
+class ParsedResume:
+    """
+    Resume text normalized once and shared by the ATS, format and skills
+    stages. The text is lower-cased and tokenized on construction; derived
+    views (sections, contacts, n-gram ids, skills) are computed on first use
+    and then cached on the instance.
+    """
+
+    def __init__(self, text):
+        self.text = text or ""
+        self.lower = self.text.lower()
+        self.tokens = _TOKEN_RE.findall(self.lower)
+
+    @classmethod
+    def of(cls, text_or_parsed):
+        """Returns ``text_or_parsed`` unchanged if it is already parsed."""
+        if isinstance(text_or_parsed, cls):
+            return text_or_parsed
+        return cls(text_or_parsed)
+
+    def __bool__(self):
+        return bool(self.text)
+
+    @cached_property
+    def section_mentions(self):
+        """Section names appearing anywhere in the text."""
+        return {s for s in SECTIONS if s in self.lower}
+
+    @cached_property
+    def contacts(self):
+        """{kind: first match or None} for each contact pattern."""
+        hits = {}
+        for kind, pattern in CONTACT_PATTERNS.items():
+            match = pattern.search(self.text)
+            hits[kind] = match.group() if match else None
+        return hits
+
+    @cached_property
+    def feature_ids(self):
+        """Hashed unigram/bigram ids used by the ATS scorer."""
+        return feature_ids_from_tokens(self.tokens)
+
+    @cached_property
+    def skills(self):
+        """{category: set of skills} from the shared taxonomy."""
+        return get_taxonomy().find_by_category(self.lower)
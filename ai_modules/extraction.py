@@ -0,0 +1,200 @@
+import atexit
+import io
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import PyPDF2
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+# Extraction budget: pages past MAX_PAGES are never parsed and text stops
+# growing once MAX_CHARS is reached
+MAX_PAGES = int(os.getenv("SMARTHIRE_MAX_PDF_PAGES", "200"))
+MAX_CHARS = int(os.getenv("SMARTHIRE_MAX_TEXT_CHARS", "2000000"))
+# PDFs with fewer pages are parsed inline; process start-up would dominate
+PARALLEL_MIN_PAGES = int(os.getenv("SMARTHIRE_PARALLEL_MIN_PAGES", "16"))
+MAX_WORKERS = int(os.getenv("SMARTHIRE_EXTRACTION_WORKERS", str(os.cpu_count() or 1)))
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_P = _W + "p"
+_W_T = _W + "t"
+_W_TAB = _W + "tab"
+_W_BR = _W + "br"
+_W_CR = _W + "cr"
+_W_TBL = _W + "tbl"
+_W_SDT = _W + "sdt"
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # the server is multi-threaded, so its workers must not be forked from it
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=multiprocessing.get_context(method))
+            atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+        return _pool
+
+
+def _extract_page_range(path: str, start: int, stop: int) -> list:
+    """Worker entry point: text of pages [start, stop) of the PDF at ``path``."""
+    # read on demand; the worker never holds a copy of the whole document
+    with open(path, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def iter_pdf_pages(data: bytes, max_pages: int = MAX_PAGES, workers: int = None, executor=None):
+    """
+    Yields the text of each page in order, stopping after ``max_pages``.
+
+    Long documents are split into contiguous page ranges parsed concurrently
+    in a process pool (``executor``, or the shared one); pages are still
+    yielded in order as their range completes. Ranges not yet started are
+    cancelled if the caller stops early. The document is written to a
+    temporary file once and the workers are sent its path, not the bytes.
+    """
+    workers = MAX_WORKERS if workers is None else workers
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    page_count = min(len(reader.pages), max_pages)
+
+    if workers <= 1 or page_count < PARALLEL_MIN_PAGES:
+        for i in range(page_count):
+            yield reader.pages[i].extract_text() or ""
+        return
+
+    # a few ranges per worker so early ranges come back quickly
+    range_size = max(1, -(-page_count // (workers * 4)))
+    pool = executor or _get_pool()
+    with tempfile.NamedTemporaryFile(prefix="smarthire-", suffix=".pdf", delete=False) as f:
+        f.write(data)
+    futures = []
+    try:
+        futures = [
+            pool.submit(_extract_page_range, f.name, start, min(start + range_size, page_count))
+            for start in range(0, page_count, range_size)
+        ]
+        for future in futures:
+            yield from future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+        # ranges already reading keep their open handle; results of the rest are discarded
+        os.remove(f.name)
+
+
+def extract_pdf_text(data: bytes, max_pages: int = MAX_PAGES, max_chars: int = MAX_CHARS, workers: int = None,
+                     executor=None) -> str:
+    buffer = io.StringIO()
+    written = 0
+    for page_text in iter_pdf_pages(data, max_pages=max_pages, workers=workers, executor=executor):
+        if not page_text:
+            continue
+        written += buffer.write(page_text[:max_chars - written])
+        if written >= max_chars:
+            logger.info("Stopped PDF extraction at the %d character budget", max_chars)
+            break
+        written += buffer.write("\n")
+    return buffer.getvalue()
+
+
+def _docx_parts(archive):
+    """Text-bearing parts of a DOCX package in reading order."""
+    names = set(archive.namelist())
+
+    def numbered(prefix):
+        return sorted(
+            (n for n in names if n.startswith(prefix) and n.endswith(".xml")),
+            key=lambda n: (len(n), n)
+        )
+
+    return (
+        numbered("word/header")
+        + [n for n in ("word/document.xml", "word/footnotes.xml", "word/endnotes.xml") if n in names]
+        + numbered("word/footer")
+    )
+
+
+def _iter_part_paragraphs(stream):
+    """
+    Yields paragraph text from one WordprocessingML part with an incremental
+    parser. Paragraphs nested in tables and text boxes come out in document
+    order; each element is cleared once read so the tree never accumulates.
+    """
+    paragraphs = []  # open paragraph buffers; text-box paragraphs nest inside runs
+    fallback_depth = 0
+    context = etree.iterparse(
+        stream, events=("start", "end"), resolve_entities=False, no_network=True, huge_tree=False
+    )
+    for event, elem in context:
+        tag = elem.tag
+        if event == "start":
+            if tag == _W_P:
+                paragraphs.append([])
+            elif tag == _MC_FALLBACK:
+                # a text box is stored twice: as DrawingML (Choice) and VML (Fallback)
+                fallback_depth += 1
+            continue
+
+        if tag == _MC_FALLBACK:
+            fallback_depth -= 1
+        elif fallback_depth == 0 and paragraphs:
+            if tag == _W_T and elem.text:
+                paragraphs[-1].append(elem.text)
+            elif tag == _W_TAB:
+                paragraphs[-1].append("\t")
+            elif tag in (_W_BR, _W_CR):
+                paragraphs[-1].append("\n")
+        if tag == _W_P:
+            text = "".join(paragraphs.pop())
+            if text.strip() and fallback_depth == 0:
+                yield text
+
+        elem.clear()
+        parent = elem.getparent()
+        if parent is not None and tag in (_W_P, _W_TBL, _W_SDT):
+            while elem.getprevious() is not None:
+                del parent[0]
+
+
+def iter_docx_paragraphs(data: bytes):
+    """Yields paragraph text from the headers, body, notes and footers of a DOCX file."""
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        for name in _docx_parts(archive):
+            with archive.open(name) as stream:
+                yield from _iter_part_paragraphs(stream)
+
+
+def extract_docx_text(data: bytes, max_chars: int = MAX_CHARS) -> str:
+    buffer = io.StringIO()
+    written = 0
+    for paragraph in iter_docx_paragraphs(data):
+        written += buffer.write(paragraph[:max_chars - written])
+        if written >= max_chars:
+            logger.info("Stopped DOCX extraction at the %d character budget", max_chars)
+            break
+        written += buffer.write("\n")
+    return buffer.getvalue()
+
+
+def is_pdf(name: str, file_type: str) -> bool:
+    return file_type == "application/pdf" or (name or "").lower().endswith(".pdf")
+
+
+def extract_text_from_bytes(data: bytes, name: str = "", file_type: str = "", workers: int = None,
+                            executor=None) -> str:
+    """Text of a PDF or DOCX upload, within the configured page and character budget."""
+    if is_pdf(name, file_type):
+        return extract_pdf_text(data, workers=workers, executor=executor)
+    # DOCX / other
+    return extract_docx_text(data)
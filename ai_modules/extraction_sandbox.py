@@ -0,0 +1,326 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from ai_modules.extraction import extract_text_from_bytes
+
+try:
+    import resource
+except ImportError:  # Windows: only the wall-clock limit applies
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Set to 0 to extract inline in the server process (e.g. for local debugging)
+SANDBOX_ENABLED = os.getenv("SMARTHIRE_SANDBOX_ENABLED", "1") == "1"
+POOL_SIZE = int(os.getenv("SMARTHIRE_SANDBOX_WORKERS", "2"))
+CPU_SECONDS = int(os.getenv("SMARTHIRE_SANDBOX_CPU_SECONDS", "20"))
+MEMORY_BYTES = int(os.getenv("SMARTHIRE_SANDBOX_MEMORY_MB", "512")) * 1024 * 1024
+TIMEOUT_SECONDS = float(os.getenv("SMARTHIRE_SANDBOX_TIMEOUT", "30"))
+MAX_JOBS_PER_WORKER = int(os.getenv("SMARTHIRE_SANDBOX_MAX_JOBS", "50"))
+# page-range processes a worker may fork for one long PDF; they share the job's limits
+PAGE_WORKERS = int(os.getenv("SMARTHIRE_SANDBOX_PAGE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_POLL_INTERVAL = 0.05
+
+
+class ExtractionFailed(Exception):
+    """An extraction job was killed or failed inside its worker."""
+
+    MESSAGES = {
+        "timeout": "the file took too long to process",
+        "cpu": "the file used too much CPU time",
+        "memory": "the file used too much memory",
+        "crashed": "the extraction worker crashed",
+        "error": "the file could not be parsed"
+    }
+
+    def __init__(self, reason, detail=""):
+        self.reason = reason
+        self.detail = detail
+        message = self.MESSAGES.get(reason, reason)
+        super().__init__(f"{message} ({detail})" if detail else message)
+
+
+def _vm_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def _group_usage(pid):
+    """
+    (resident bytes, CPU seconds) of ``pid`` and its live children, or None
+    where /proc is not available. Copy-on-write pages shared with forked
+    children count once per process, so the memory figure errs high.
+    """
+    rss = cpu = 0
+    pending = [pid]
+    try:
+        page_size, ticks = os.sysconf("SC_PAGE_SIZE"), os.sysconf("SC_CLK_TCK")
+        while pending:
+            current = pending.pop()
+            try:
+                with open(f"/proc/{current}/stat") as f:
+                    # fields after the parenthesised command name
+                    fields = f.read().rsplit(")", 1)[1].split()
+                with open(f"/proc/{current}/task/{current}/children") as f:
+                    pending.extend(int(child) for child in f.read().split())
+            except FileNotFoundError:
+                if current == pid:
+                    return None
+                continue  # a child that just exited
+            cpu += (int(fields[11]) + int(fields[12])) / ticks
+            rss += int(fields[21]) * page_size
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+    return rss, cpu
+
+
+def _set_cpu_budget(cpu_seconds):
+    # RLIMIT_CPU counts the worker's lifetime usage, so move the soft limit
+    # to "used so far + budget" before each job
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = int(usage.ru_utime + usage.ru_stime) + cpu_seconds
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _worker_main(conn, memory_bytes, page_workers):
+    if hasattr(os, "setpgrp"):
+        # page-range processes join this group, so killing the worker takes them along
+        os.setpgrp()
+    if resource is not None:
+        # address-space backstop; the parent enforces the RSS limit itself
+        limit = _vm_bytes() + 2 * memory_bytes
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard == resource.RLIM_INFINITY or limit < hard:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    # forked page workers inherit the rlimits and the imported modules
+    fork = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break  # the server process went away
+        if job is None:
+            break
+        data, name, file_type, cpu_seconds = job
+        if resource is not None:
+            _set_cpu_budget(cpu_seconds)
+        # page workers live for one job: forked after the CPU budget is set, and
+        # gone before the next one; they are only started for PDFs long enough to split
+        executor = ProcessPoolExecutor(page_workers, mp_context=fork) if fork and page_workers > 1 else None
+        try:
+            reply = ("ok", extract_text_from_bytes(data, name, file_type, workers=page_workers if executor else 1,
+                                                   executor=executor))
+        except MemoryError:
+            reply = ("memory", "")
+        except BrokenProcessPool:
+            # a page worker was killed, e.g. by its CPU or address-space limit
+            reply = ("crashed", "a page worker died")
+        except Exception as e:
+            reply = ("error", f"{e.__class__.__name__}: {e}")
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+        conn.send(reply)
+        if reply[0] in ("memory", "crashed"):
+            break
+
+
+class _Worker:
+    def __init__(self, context, memory_bytes, page_workers):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            # not a daemon: daemonic processes may not start page workers; the
+            # worker exits by itself once the server's end of the pipe closes
+            target=_worker_main, args=(child_conn, memory_bytes, page_workers), name="extraction-worker"
+        )
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.kill()
+        self.conn.close()
+
+    def kill(self):
+        try:
+            # the worker leads its own process group, page workers included
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (AttributeError, OSError):
+            self.process.kill()
+        self.process.join()
+
+
+class SandboxPool:
+    """
+    Runs text extraction in isolated worker processes.
+
+    Each job gets a CPU-time budget (RLIMIT_CPU), a resident-memory ceiling
+    (polled by the parent, with RLIMIT_AS as a backstop) and a wall-clock
+    timeout. Long PDFs are split over up to ``page_workers`` processes forked
+    by the worker for the job; they inherit its rlimits, and the parent counts
+    their memory and CPU time towards the job's limits. A worker that breaks
+    a limit is killed and replaced, together with its page workers, and the
+    caller gets an ExtractionFailed naming the limit. Workers are also
+    recycled after ``max_jobs_per_worker`` jobs.
+    """
+
+    def __init__(self, size: int = POOL_SIZE, cpu_seconds: int = CPU_SECONDS,
+                 memory_bytes: int = MEMORY_BYTES, timeout: float = TIMEOUT_SECONDS,
+                 max_jobs_per_worker: int = MAX_JOBS_PER_WORKER, page_workers: int = PAGE_WORKERS):
+        self.size = size
+        self.page_workers = page_workers
+        self.cpu_seconds = cpu_seconds
+        self.memory_bytes = memory_bytes
+        self.timeout = timeout
+        self.max_jobs_per_worker = max_jobs_per_worker
+
+        methods = multiprocessing.get_all_start_methods()
+        # never fork the server itself: workers start from a clean interpreter
+        self._context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self._slots = threading.Semaphore(size)
+        self._lock = threading.Lock()
+        self._idle = []
+        self._closed = False
+        self.stats = {
+            "queued": 0,
+            "running": 0,
+            "completed": 0,
+            "failed": 0,
+            "recycled": 0,
+            "kills": {"timeout": 0, "cpu": 0, "memory": 0, "crashed": 0}
+        }
+
+    def extract(self, data: bytes, name: str = "", file_type: str = "") -> str:
+        with self._lock:
+            self.stats["queued"] += 1
+        self._slots.acquire()
+        with self._lock:
+            self.stats["queued"] -= 1
+            self.stats["running"] += 1
+            worker = self._idle.pop() if self._idle else None
+        try:
+            if worker is None:
+                worker = _Worker(self._context, self.memory_bytes, self.page_workers)
+            return self._run(worker, (data, name, file_type, self.cpu_seconds))
+        finally:
+            with self._lock:
+                self.stats["running"] -= 1
+            self._slots.release()
+
+    def _run(self, worker, job):
+        try:
+            worker.conn.send(job)
+        except OSError:
+            self._discard(worker, "crashed")
+            raise ExtractionFailed("crashed")
+
+        deadline = time.monotonic() + self.timeout
+        usage = _group_usage(worker.process.pid)
+        cpu_before = usage[1] if usage else 0.0
+        while not worker.conn.poll(_POLL_INTERVAL):
+            if not worker.process.is_alive():
+                self._raise_for_exit(worker)
+            if time.monotonic() > deadline:
+                self._discard(worker, "timeout")
+                raise ExtractionFailed("timeout", f"{self.timeout:.0f}s")
+            usage = _group_usage(worker.process.pid)
+            if usage is None:
+                continue
+            rss, cpu = usage
+            if rss > self.memory_bytes:
+                self._discard(worker, "memory")
+                raise ExtractionFailed("memory", f"{rss // (1024 * 1024)} MB")
+            # RLIMIT_CPU is per process; this covers the worker and its page workers together
+            if cpu - cpu_before > self.cpu_seconds:
+                self._discard(worker, "cpu")
+                raise ExtractionFailed("cpu", f"{cpu - cpu_before:.0f}s")
+
+        try:
+            status, payload = worker.conn.recv()
+        except (EOFError, OSError):
+            # the pipe closes when the worker dies, e.g. on SIGXCPU
+            self._raise_for_exit(worker)
+
+        worker.jobs += 1
+        if status in ("memory", "crashed"):
+            self._discard(worker, status)
+            raise ExtractionFailed(status, payload)
+        self._release(worker)
+        with self._lock:
+            self.stats["completed" if status == "ok" else "failed"] += 1
+        if status != "ok":
+            raise ExtractionFailed("error", payload)
+        return payload
+
+    def _raise_for_exit(self, worker):
+        worker.process.join()
+        exitcode = worker.process.exitcode
+        reason = "cpu" if exitcode == -getattr(signal, "SIGXCPU", 0) else "crashed"
+        self._discard(worker, reason)
+        raise ExtractionFailed(reason, f"exit code {exitcode}")
+
+    def _discard(self, worker, reason):
+        worker.kill()
+        worker.conn.close()
+        logger.warning("Killed extraction worker %s: %s limit", worker.process.pid, reason)
+        with self._lock:
+            self.stats["failed"] += 1
+            self.stats["kills"][reason] += 1
+
+    def _release(self, worker):
+        if worker.jobs >= self.max_jobs_per_worker or self._closed:
+            worker.stop()
+            with self._lock:
+                self.stats["recycled"] += 1
+            return
+        with self._lock:
+            self._idle.append(worker)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["kills"] = dict(self.stats["kills"])
+            stats["idle_workers"] = len(self._idle)
+        stats["pool_size"] = self.size
+        return stats
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.stop()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_sandbox_pool() -> SandboxPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SandboxPool()
+            atexit.register(_pool.shutdown)
+        return _pool
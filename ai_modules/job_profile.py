@@ -0,0 +1,88 @@
+import json
+
+import numpy as np
+
+from ai_modules.ats_scoring import term_weights
+from ai_modules.document import ParsedResume
+from ai_modules.result_cache import SCORER_VERSION, job_desc_hash
+from ai_modules.skill_taxonomy import get_taxonomy
+from ai_modules.text_cache import LRUCache
+
+MAX_CACHED_PROFILES = 512
+
+
+class JobProfile:
+    """
+    A job description compiled once for scoring: its sorted hashed n-gram ids,
+    their total ATS weight, and the skills it asks for by category. Scoring a
+    resume against a profile only processes the resume side.
+    """
+
+    def __init__(self, job_role, job_desc):
+        self.job_role = job_role or ""
+        self.job_desc = job_desc or ""
+        self.hash = job_desc_hash(self.job_desc)
+        self.version = (SCORER_VERSION, get_taxonomy().fingerprint)
+
+        parsed = ParsedResume(self.job_desc)
+        self.feature_ids = parsed.feature_ids
+        self.total_weight = float(term_weights(self.feature_ids).sum())
+        self.skills = parsed.skills if self.job_desc else {}
+
+    def __bool__(self):
+        return bool(self.job_desc)
+
+    @property
+    def skill_set(self):
+        return set().union(*self.skills.values()) if self.skills else set()
+
+    def to_dict(self) -> dict:
+        return {
+            "version": list(self.version),
+            "job_role": self.job_role,
+            "job_desc": self.job_desc,
+            "hash": self.hash,
+            "feature_ids": self.feature_ids.tolist(),
+            "total_weight": self.total_weight,
+            "skills": {category: sorted(skills) for category, skills in self.skills.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """
+        Restores a profile without reprocessing the JD. Profiles saved by a
+        different scorer version or taxonomy are rebuilt from their text.
+        """
+        if tuple(data.get("version", ())) != (SCORER_VERSION, get_taxonomy().fingerprint):
+            return cls(data.get("job_role"), data.get("job_desc"))
+        profile = cls.__new__(cls)
+        profile.job_role = data["job_role"]
+        profile.job_desc = data["job_desc"]
+        profile.hash = data["hash"]
+        profile.version = tuple(data["version"])
+        profile.feature_ids = np.asarray(data["feature_ids"], dtype=np.int64)
+        profile.total_weight = data["total_weight"]
+        profile.skills = {category: set(skills) for category, skills in data["skills"].items()}
+        return profile
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, payload: str):
+        return cls.from_dict(json.loads(payload))
+
+
+_profiles = LRUCache(max_entries=MAX_CACHED_PROFILES)
+
+
+def get_job_profile(job_role, job_desc) -> JobProfile:
+    """Compiled profile for a JD, shared across sessions and keyed by JD hash."""
+    if isinstance(job_desc, JobProfile):
+        return job_desc
+    key = (job_desc_hash(job_desc), (job_role or "").strip().lower(), SCORER_VERSION, get_taxonomy().fingerprint)
+    profile = _profiles.get(key)
+    if profile is None:
+        profile = JobProfile(job_role, job_desc)
+        _profiles.put(key, profile)
+    return profile
@@ -0,0 +1,112 @@
+import logging
+import os
+import threading
+import time
+
+import spacy
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = os.getenv("SMARTHIRE_SPACY_MODEL", "en_core_web_sm")
+# Serialized copy of MODEL_NAME with the unused components stripped out,
+# written by save_trimmed_pipeline() (``python -m ai_modules.nlp_model``)
+TRIMMED_MODEL_PATH = os.getenv(
+    "SMARTHIRE_SPACY_TRIMMED_PATH",
+    os.path.join("models", f"{MODEL_NAME}_trimmed")
+)
+# The analyzer only needs tokenization and tagging; these are never loaded
+UNUSED_COMPONENTS = ("parser", "ner", "lemmatizer", "senter")
+
+_lock = threading.Lock()
+_nlp = None
+_warmup_thread = None
+_stats = {
+    "loaded": False,
+    "source": None,
+    "load_seconds": None,
+    "memory_bytes": None
+}
+
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _load():
+    if os.path.isdir(TRIMMED_MODEL_PATH):
+        try:
+            return spacy.load(TRIMMED_MODEL_PATH), "trimmed"
+        except Exception:
+            logger.exception("Failed to load trimmed pipeline from %s", TRIMMED_MODEL_PATH)
+    try:
+        return spacy.load(MODEL_NAME, exclude=list(UNUSED_COMPONENTS)), MODEL_NAME
+    except Exception:
+        # fallback: create blank english model if not available
+        logger.warning("spaCy model %s not available, using blank English pipeline", MODEL_NAME)
+        return spacy.blank("en"), "blank"
+
+
+def get_nlp():
+    """
+    Returns the process-wide spaCy pipeline, loading it on first use.
+    Safe to call from any thread; concurrent callers wait for a single load.
+    """
+    global _nlp
+    if _nlp is not None:
+        return _nlp
+    with _lock:
+        if _nlp is None:
+            rss_before = _rss_bytes()
+            started = time.perf_counter()
+            nlp, source = _load()
+            elapsed = time.perf_counter() - started
+            rss_after = _rss_bytes()
+
+            _stats.update({
+                "loaded": True,
+                "source": source,
+                "load_seconds": round(elapsed, 3),
+                "memory_bytes": (rss_after - rss_before) if rss_before is not None and rss_after is not None else None,
+                "pipeline": list(nlp.pipe_names)
+            })
+            logger.info("Loaded spaCy pipeline '%s' in %.2fs", source, elapsed)
+            _nlp = nlp
+    return _nlp
+
+
+def start_warmup():
+    """
+    Loads the pipeline on a background thread so the first analysis does not
+    pay the load cost. Calling it again (e.g. on every Streamlit rerun) is a no-op.
+    """
+    global _warmup_thread
+    with _lock:
+        if _nlp is not None or _warmup_thread is not None:
+            return _warmup_thread
+        _warmup_thread = threading.Thread(target=get_nlp, name="nlp-warmup", daemon=True)
+        _warmup_thread.start()
+    return _warmup_thread
+
+
+def model_stats() -> dict:
+    return dict(_stats)
+
+
+def save_trimmed_pipeline(path: str = TRIMMED_MODEL_PATH) -> str:
+    """
+    Serializes MODEL_NAME without its unused components so later processes
+    can load the smaller pipeline straight from disk.
+    """
+    nlp = spacy.load(MODEL_NAME, exclude=list(UNUSED_COMPONENTS))
+    nlp.to_disk(path)
+    logger.info("Saved trimmed pipeline %s to %s", nlp.pipe_names, path)
+    return path
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(save_trimmed_pipeline())
@@ -0,0 +1,67 @@
+import hashlib
+import threading
+
+from ai_modules.skill_taxonomy import get_taxonomy
+from ai_modules.text_cache import EXTRACTOR_VERSION, LRUCache
+
+# Bump whenever ATS, format, skills or suggestion output changes; entries
+# computed by an older scorer then stop matching and age out of the LRU
+SCORER_VERSION = 2
+MAX_ENTRIES = 2048
+
+
+def normalize_job_desc(job_desc) -> str:
+    """Case and whitespace differences in a pasted JD do not change any score."""
+    return " ".join((job_desc or "").lower().split())
+
+
+def job_desc_hash(job_desc) -> str:
+    return hashlib.sha256(normalize_job_desc(job_desc).encode("utf-8")).hexdigest()
+
+
+def analysis_key(resume_hash: str, job_desc) -> tuple:
+    """``job_desc`` is JD text or a compiled JobProfile (which carries its hash)."""
+    jd_hash = job_desc.hash if hasattr(job_desc, "hash") else job_desc_hash(job_desc)
+    return (resume_hash, jd_hash, SCORER_VERSION, EXTRACTOR_VERSION, get_taxonomy().fingerprint)
+
+
+class AnalysisCache:
+    """Process-wide memo of full analysis results, shared by all sessions."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self._entries = LRUCache(max_entries=max_entries)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        result = self._entries.get(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return result
+
+    def put(self, key, result):
+        self._entries.put(key, result)
+
+    def get_stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "evictions": self._entries.evictions
+        }
+
+
+_analysis_cache = None
+_analysis_cache_lock = threading.Lock()
+
+
+def get_analysis_cache() -> AnalysisCache:
+    global _analysis_cache
+    with _analysis_cache_lock:
+        if _analysis_cache is None:
+            _analysis_cache = AnalysisCache()
+        return _analysis_cache
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import logging
+import os
+import re
+from collections import deque
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = os.getenv(
+    "SMARTHIRE_SKILLS_TAXONOMY",
+    os.path.join(os.path.dirname(__file__), "data", "skills_taxonomy.json")
+)
+# skills are matched as token sequences: words and individual punctuation
+# marks, so "c++" is ["c", "+", "+"] and whitespace is insignificant. A dot
+# between word characters joins them, so "node.js" is the single token
+# "node.js" and never contains a "js" match
+_TOKEN_RE = re.compile(r"\w+(?:\.\w+)*|[^\w\s]")
+
+
+class SkillTaxonomy:
+    """
+    Skill categories and aliases compiled into an Aho-Corasick automaton.
+
+    ``find`` reports every skill (by canonical name) in one left-to-right pass
+    over the text's tokens, whatever the taxonomy size. The automaton steps
+    over whole words, so a skill never matches inside a longer word ("java"
+    does not match "javascript", "js" does not match "node.js"), and a match
+    inside a longer one is dropped ("google cloud" is gcp, not also cloud).
+
+    The taxonomy is ``{category: {skill: [aliases, ...]}}``.
+    """
+
+    def __init__(self, taxonomy: dict):
+        # identifies the taxonomy contents, e.g. for cache keys
+        self.fingerprint = hashlib.sha256(json.dumps(taxonomy, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        self.categories = {}
+        self.category_of = {}
+        # trie nodes: outgoing edges, failure link, and (length, skill) outputs
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+        for category, skills in taxonomy.items():
+            self.categories[category] = set()
+            for skill, aliases in skills.items():
+                skill = skill.lower()
+                self.categories[category].add(skill)
+                self.category_of[skill] = category
+                for pattern in {skill, *(a.lower() for a in aliases or ())}:
+                    self._add_pattern(pattern, skill)
+        self._build_links()
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_TAXONOMY_PATH):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @property
+    def skills(self):
+        return set(self.category_of)
+
+    def _add_pattern(self, pattern, skill):
+        tokens = _TOKEN_RE.findall(pattern)
+        if not tokens:
+            return
+        node = 0
+        for ch in tokens:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(tokens), skill))
+
+    def _build_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def _scan(self, tokens):
+        """Yields (end, length, skill) for every match, in token positions."""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, token in enumerate(tokens):
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            for length, skill in out[node]:
+                yield i + 1, length, skill
+
+    def _matches(self, tokens):
+        """(start, end, skill) token spans of the matches not contained in a longer match."""
+        matches = sorted(
+            ((end - length, end, skill) for end, length, skill in self._scan(tokens)),
+            key=lambda match: (match[0], -match[1])
+        )
+        kept = []
+        reach = (0, 0)  # span of the match reaching furthest so far
+        for start, end, skill in matches:
+            # earlier matches start no later; one ending at or after this one covers it
+            if end < reach[1] or (end == reach[1] and start > reach[0]):
+                continue
+            kept.append((start, end, skill))
+            if end > reach[1]:
+                reach = (start, end)
+        return kept
+
+    def iter_matches(self, text):
+        """Yields (start, end, skill) character spans for every skill mention in ``text``."""
+        lower = (text or "").lower()
+        spans = [m.span() for m in _TOKEN_RE.finditer(lower)]
+        for start, end, skill in self._matches([lower[a:b] for a, b in spans]):
+            yield spans[start][0], spans[end - 1][1], skill
+
+    def find(self, text):
+        """Set of canonical skills mentioned in ``text``."""
+        return {skill for _, _, skill in self._matches(_TOKEN_RE.findall((text or "").lower()))}
+
+    def find_by_category(self, text):
+        """Returns {category: set of skills} found in ``text``, with every category present."""
+        found = {category: set() for category in self.categories}
+        for skill in self.find(text):
+            found[self.category_of[skill]].add(skill)
+        return found
+
+
+@lru_cache(maxsize=None)
+def get_taxonomy(path: str = DEFAULT_TAXONOMY_PATH) -> SkillTaxonomy:
+    """Process-wide compiled taxonomy; built once per path."""
+    taxonomy = SkillTaxonomy.from_file(path)
+    logger.info("Compiled %d skills into %d automaton states", len(taxonomy.category_of), len(taxonomy._goto))
+    return taxonomy
@@ -0,0 +1,217 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.getenv("SMARTHIRE_CACHE_DIR", ".cache")
+# Bump whenever extraction output changes so stale entries stop matching
+EXTRACTOR_VERSION = 2
+
+MEMORY_LIMIT_BYTES = 64 * 1024 * 1024
+DISK_LIMIT_BYTES = 512 * 1024 * 1024
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def read_upload_bytes(uploaded_file) -> bytes:
+    """Raw bytes of a Streamlit UploadedFile or any seekable file-like object."""
+    if hasattr(uploaded_file, "getvalue"):
+        return uploaded_file.getvalue()
+    position = uploaded_file.tell()
+    try:
+        return uploaded_file.read()
+    finally:
+        uploaded_file.seek(position)
+
+
+class LRUCache:
+    """
+    Thread-safe LRU mapping bounded by entry count and/or total size.
+    ``sizeof`` gives the size charged for each value (1 by default).
+    """
+
+    def __init__(self, max_entries: int = None, max_bytes: int = None, sizeof=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof or (lambda value: 1)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value, _ = self._data[key]
+            except KeyError:
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        size = self._sizeof(value)
+        with self._lock:
+            if key in self._data:
+                self.current_bytes -= self._data.pop(key)[1]
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._data[key] = (value, size)
+            self.current_bytes += size
+            while self._data and (
+                (self.max_entries is not None and len(self._data) > self.max_entries)
+                or (self.max_bytes is not None and self.current_bytes > self.max_bytes)
+            ):
+                _, (_, evicted_size) = self._data.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.current_bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+
+class TextCache:
+    """
+    Extracted resume text keyed by the SHA-256 of the uploaded bytes.
+
+    Lookups try an in-memory LRU first, then zlib-compressed files under
+    ``directory``. The disk tier evicts least recently used files once it
+    grows past ``disk_limit``.
+    """
+
+    def __init__(self, directory: str = os.path.join(CACHE_DIR, "extracted_text"),
+                 memory_limit: int = MEMORY_LIMIT_BYTES, disk_limit: int = DISK_LIMIT_BYTES):
+        self.directory = directory
+        self.disk_limit = disk_limit
+        self._memory = LRUCache(max_bytes=memory_limit, sizeof=lambda text: len(text) * 2)
+        self._lock = threading.Lock()
+        self._disk_bytes = None
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "bytes_read": 0,
+            "bytes_written": 0,
+            "disk_evictions": 0
+        }
+
+    def _key(self, digest):
+        return f"v{EXTRACTOR_VERSION}-{digest}"
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.txt.z")
+
+    def get(self, digest):
+        key = self._key(digest)
+        text = self._memory.get(key)
+        if text is not None:
+            self._count("memory_hits")
+            return text
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                compressed = f.read()
+            text = zlib.decompress(compressed).decode("utf-8")
+            os.utime(path)  # mtime doubles as the disk tier's LRU clock
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+        except (OSError, zlib.error, UnicodeDecodeError):
+            logger.warning("Discarding unreadable cache entry %s", path)
+            self._remove(path)
+            self._count("misses")
+            return None
+
+        self._count("disk_hits")
+        self._count("bytes_read", len(compressed))
+        self._memory.put(key, text)
+        return text
+
+    def put(self, digest, text):
+        key = self._key(digest)
+        self._memory.put(key, text)
+        compressed = zlib.compress(text.encode("utf-8"), 6)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(compressed)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            logger.exception("Failed to write text cache entry")
+            return
+        self._count("bytes_written", len(compressed))
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += len(compressed)
+        self._enforce_disk_limit()
+
+    def _entries(self):
+        try:
+            return [e for e in os.scandir(self.directory) if e.name.endswith(".txt.z")]
+        except FileNotFoundError:
+            return []
+
+    def _enforce_disk_limit(self):
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(e.stat().st_size for e in self._entries())
+            if self._disk_bytes <= self.disk_limit:
+                return
+            entries = sorted(self._entries(), key=lambda e: e.stat().st_mtime)
+            self._disk_bytes = sum(e.stat().st_size for e in entries)
+            for entry in entries:
+                if self._disk_bytes <= self.disk_limit:
+                    break
+                size = entry.stat().st_size
+                if self._remove(entry.path):
+                    self._disk_bytes -= size
+                    self.stats["disk_evictions"] += 1
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        stats["memory_entries"] = len(self._memory)
+        stats["memory_bytes"] = self._memory.current_bytes
+        stats["disk_bytes"] = self._disk_bytes
+        return stats
+
+
+_text_cache = None
+_text_cache_lock = threading.Lock()
+
+
+def get_text_cache() -> TextCache:
+    global _text_cache
+    with _text_cache_lock:
+        if _text_cache is None:
+            _text_cache = TextCache()
+        return _text_cache
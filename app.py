@@ -11,6 +11,7 @@ st.set_page_config(
 # Rest of the imports
 from streamlit_option_menu import option_menu
 import os
+import uuid
 from pathlib import Path
 
 # Import modules
@@ -26,6 +27,14 @@ from modules.admin import (
     verify_admin,
     logout
 )
+from ai_modules.nlp_model import start_warmup
+from dashboard_module.cache_warmer import start_cache_warmer
+from storage_module.events import log_event
+
+# Load the shared NLP model in the background as soon as the server starts
+start_warmup()
+# Keep the job market dashboard's searches cached ahead of users
+start_cache_warmer()
 
 # Initialize session state
 def init_session_state():
@@ -37,6 +46,9 @@ def init_session_state():
         st.session_state.user_type = "User"
     if 'current_page' not in st.session_state:
         st.session_state.current_page = "Home"
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+        log_event("session_start", session=st.session_state.session_id)
 
 # Load external CSS
 def load_css():
@@ -106,6 +118,11 @@ def main():
     # Show sidebar and get selected option
     selected = show_sidebar()
     
+    # Count a page view when the selection changes, not on every rerun
+    if selected and selected != st.session_state.get("last_viewed_page"):
+        st.session_state.last_viewed_page = selected
+        log_event("page_view", selected, session=st.session_state.session_id)
+    
     # Handle page routing
     try:
         if selected:  # Only process if sidebar selection was successful
@@ -0,0 +1,157 @@
+"""
+Resume analysis stages (ATS score, format, skills) as originally written,
+each normalizing the raw text on its own, against the current stages with
+the resume parsed once into a ParsedResume. The current stages are also
+timed on raw text, so the gain of parsing once is shown apart from the
+gains of the hashed scorer and the skill taxonomy.
+
+    python -m benchmarks.analysis_stages
+"""
+import re
+import sys
+import time
+
+from ai_modules.ai_analyzer import ResumeAnalyzer
+from benchmarks.ats_scoring import REGRESSION_CORPUS, legacy_ats_score, synthetic_corpus
+
+RESUME_TEMPLATE = """JANE DOE
+jane.doe@example.com | 555-123-4567
+
+EXPERIENCE
+{body}
+
+EDUCATION
+B.Sc. Computer Science
+
+SKILLS
+Python, SQL, Docker, Kubernetes, AWS, React, machine learning, leadership
+
+PROJECTS
+{body}
+"""
+
+# the original stages of ResumeAnalyzer
+
+LEGACY_SKILLS = {
+    "programming": {
+        "python", "java", "javascript", "typescript", "c++", "c#", "ruby", "php",
+        "swift", "kotlin", "rust", "golang", "scala", "perl"
+    },
+    "web": {
+        "html", "css", "react", "angular", "vue", "node.js", "django", "flask",
+        "spring", "express.js", "jquery", "bootstrap", "sass", "webpack"
+    },
+    "database": {
+        "sql", "mysql", "postgresql", "mongodb", "oracle", "redis", "elasticsearch",
+        "dynamodb", "cassandra", "sqlite", "neo4j"
+    },
+    "cloud": {
+        "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "jenkins",
+        "circleci", "ansible", "puppet", "chef"
+    },
+    "ai_ml": {
+        "machine learning", "deep learning", "tensorflow", "pytorch", "keras",
+        "scikit-learn", "pandas", "numpy", "opencv", "nlp"
+    },
+    "soft_skills": {
+        "leadership", "communication", "teamwork", "problem solving",
+        "critical thinking", "time management", "project management"
+    }
+}
+
+
+def legacy_format(text):
+    text_lower = (text or "").lower()
+    sections = ["experience", "education", "skills", "projects"]
+    section_score = sum(1 for s in sections if s in text_lower) / len(sections)
+    contact_patterns = [
+        r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
+        r"\b\d{3}[-.]?\d{3}[-.]?\d{4}\b"
+    ]
+    contact_score = sum(1 for p in contact_patterns if re.search(p, text, flags=re.IGNORECASE)) / len(contact_patterns)
+    return round(((section_score + contact_score) / 2.0) * 100.0)
+
+
+def legacy_skills(text, job_desc):
+    resume_text = (text or "").lower()
+    job_text = (job_desc or "").lower()
+    matched, missing, additional, categories = set(), set(), set(), {}
+    for category, skills in LEGACY_SKILLS.items():
+        resume_skills = {s for s in skills if s in resume_text}
+        job_skills = {s for s in skills if s in job_text} if job_desc else set()
+        matched.update(resume_skills & job_skills)
+        missing.update(job_skills - resume_skills)
+        additional.update(resume_skills - job_skills)
+        score = 100 if not job_skills else int(round((len(resume_skills & job_skills) / len(job_skills)) * 100))
+        categories[category] = {
+            "matched": sorted(resume_skills & job_skills),
+            "missing": sorted(job_skills - resume_skills),
+            "additional": sorted(resume_skills - job_skills),
+            "score": score
+        }
+    return {
+        "Matched": len(matched), "Missing": len(missing), "Additional": len(additional),
+        "MatchedSkills": sorted(matched), "MissingSkills": sorted(missing), "AdditionalSkills": sorted(additional),
+        "Categories": categories
+    }
+
+
+def legacy_pipeline(text, job_desc):
+    return legacy_ats_score(text, job_desc), legacy_format(text), legacy_skills(text, job_desc)
+
+
+def per_stage_pipeline(analyzer, text, job_desc):
+    """Current stages, each handed the raw text (every stage parses it again)."""
+    return (analyzer.calculate_ats_score(text, job_desc), analyzer.analyze_format(text),
+            analyzer.extract_skills(text, job_desc))
+
+
+def shared_pipeline(analyzer, text, job_desc):
+    resume = analyzer.parse(text)
+    return (analyzer.calculate_ats_score(resume, job_desc), analyzer.analyze_format(resume),
+            analyzer.extract_skills(resume, job_desc))
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000.0, result
+
+
+def main(repeat=5):
+    analyzer = ResumeAnalyzer()
+    job_desc = REGRESSION_CORPUS[0][1]
+    mismatches = 0
+
+    for words in (300, 3000):
+        body = synthetic_corpus(1, words, seed=words)[0][0]
+        text = RESUME_TEMPLATE.format(body=body)
+
+        legacy_ms, (legacy_ats, legacy_fmt, legacy_skill) = timed(lambda: legacy_pipeline(text, job_desc), repeat)
+        per_stage_ms, per_stage = timed(lambda: per_stage_pipeline(analyzer, text, job_desc), repeat)
+        # a fresh ParsedResume per run, so its cached views are recomputed each time
+        shared_ms, (ats, fmt, skills) = timed(lambda: shared_pipeline(analyzer, text, job_desc), repeat)
+
+        # ATS and format scores must not change; skills come from the taxonomy now
+        # (word-boundary matches, e.g. "java" is no longer found in "javascript")
+        mismatches += (ats, fmt) != (legacy_ats, legacy_fmt) or per_stage != (ats, fmt, skills)
+        skill_changes = set(skills["MatchedSkills"] + skills["AdditionalSkills"]) ^ set(
+            legacy_skill["MatchedSkills"] + legacy_skill["AdditionalSkills"]
+        )
+
+        print(f"resume with {words * 2} body words:")
+        print(f"  original stages, each normalizing the text {legacy_ms:8.2f} ms")
+        print(f"  current stages, each parsing the text      {per_stage_ms:8.2f} ms ({legacy_ms / per_stage_ms:.1f}x)")
+        print(f"  current stages, parsed once                {shared_ms:8.2f} ms ({legacy_ms / shared_ms:.1f}x, "
+              f"{per_stage_ms / shared_ms:.2f}x from parsing once)")
+        print(f"  skills found differently by the taxonomy: {sorted(skill_changes) or 'none'}")
+
+    print(f"result mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
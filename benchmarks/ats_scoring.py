@@ -0,0 +1,159 @@
+"""
+Regression check and benchmark for ai_modules.ats_scoring against the
+original per-call CountVectorizer implementation.
+
+    python -m benchmarks.ats_scoring
+"""
+import random
+import re
+import sys
+import time
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+
+from ai_modules.ats_scoring import ATSScorer
+
+REGRESSION_CORPUS = [
+    (
+        "Senior Python developer with 6 years of experience building Django and Flask APIs. "
+        "Skilled in PostgreSQL, Redis, Docker and Kubernetes on AWS. Led a team of 5 engineers.",
+        "We are hiring a Python developer to build REST APIs with Django. Experience with AWS, "
+        "Docker and PostgreSQL required. Kubernetes is a plus."
+    ),
+    (
+        "Data scientist: machine learning, deep learning, TensorFlow, PyTorch, pandas, NumPy. "
+        "Built NLP models for customer support ticket routing.",
+        "Machine Learning Engineer. Must know PyTorch or TensorFlow, scikit-learn and SQL. "
+        "NLP experience preferred; deploy models on GCP."
+    ),
+    (
+        "Marketing coordinator with strong communication and project management skills. "
+        "Managed social media campaigns and vendor relationships.",
+        "Software Engineer, backend. Java, Spring Boot, microservices, Kafka."
+    ),
+    (
+        "Full stack developer - React, Node.js, Express.js, MongoDB, TypeScript, CSS, HTML5. "
+        "Contact: jane.doe@example.com, 555-123-4567",
+        "Full Stack Developer (React/Node.js). TypeScript, MongoDB, CI/CD, Jest, Webpack."
+    ),
+    (
+        "DevOps engineer: Terraform, Ansible, Jenkins, CircleCI, AWS, Azure. "
+        "Automated blue-green deployments and monitoring with Prometheus.",
+        "DevOps Engineer. Terraform and Ansible on AWS, Jenkins pipelines, Prometheus/Grafana monitoring, "
+        "on-call rotation."
+    ),
+    (
+        "",
+        "Python developer with SQL experience."
+    ),
+    (
+        "Python Python Python SQL SQL",
+        "Python developer with SQL experience. Python and SQL."
+    ),
+    (
+        "C++ and C# game developer; Unity, Unreal Engine, shaders.",
+        "Looking for a C++ engineer with Unreal Engine experience."
+    ),
+]
+
+
+def legacy_ats_score(resume_text, job_desc):
+    """The CountVectorizer implementation ResumeAnalyzer used before ATSScorer."""
+    if not job_desc:
+        return None
+
+    def preprocess_text(text):
+        text = re.sub(r"[^\w\s]", " ", (text or "").lower())
+        text = " ".join(text.split())
+        return text
+
+    resume_processed = preprocess_text(resume_text)
+    job_processed = preprocess_text(job_desc)
+
+    vectorizer = CountVectorizer(stop_words="english", ngram_range=(1, 2), min_df=1, binary=True)
+    matrix = vectorizer.fit_transform([resume_processed, job_processed]).toarray()
+    feature_names = vectorizer.get_feature_names_out()
+
+    resume_vector = np.asarray(matrix[0], dtype=int)
+    job_vector = np.asarray(matrix[1], dtype=int)
+
+    matches = (resume_vector > 0) & (job_vector > 0)
+    match_terms = [term for term, match in zip(feature_names, matches) if match]
+
+    total_weight = 0.0
+    matched_weight = 0.0
+    for term, idx in vectorizer.vocabulary_.items():
+        if job_vector[idx] > 0:
+            weight = 2.0 if len(term.split()) > 1 else 1.0
+            total_weight += weight
+            if resume_vector[idx] > 0:
+                matched_weight += weight
+
+    score = 0.0
+    if total_weight > 0:
+        score = (matched_weight / total_weight) * 100.0
+        if len(feature_names) > 0:
+            coverage_bonus = min(10.0, (len(match_terms) / len(feature_names)) * 20.0)
+            score = min(100.0, score + coverage_bonus)
+    return int(round(score))
+
+
+def synthetic_corpus(n, words_per_doc, seed=7):
+    rng = random.Random(seed)
+    words = []
+    for resume, job in REGRESSION_CORPUS:
+        words.extend(re.findall(r"\w\w+", (resume + " " + job).lower()))
+    vocab = sorted(set(words)) + [f"term{i}" for i in range(2000)]
+    docs = []
+    for _ in range(n):
+        resume = " ".join(rng.choice(vocab) for _ in range(words_per_doc))
+        job = " ".join(rng.choice(vocab) for _ in range(words_per_doc // 3))
+        docs.append((resume, job))
+    return docs
+
+
+def check_regression(scorer):
+    corpus = REGRESSION_CORPUS + synthetic_corpus(200, 300)
+    mismatches = []
+    for resume, job in corpus:
+        try:
+            expected = legacy_ats_score(resume, job)
+        except ValueError:
+            # CountVectorizer rejects an all-stop-word vocabulary; not comparable
+            continue
+        actual = scorer.score(resume, job)
+        if expected != actual:
+            mismatches.append((expected, actual, resume[:60], job[:60]))
+    return len(corpus), mismatches
+
+
+def bench(fn, pairs, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for resume, job in pairs:
+            fn(resume, job)
+        best = min(best, time.perf_counter() - started)
+    return best / len(pairs) * 1000.0
+
+
+def main():
+    scorer = ATSScorer()
+    checked, mismatches = check_regression(scorer)
+    print(f"regression: {checked} pairs, {len(mismatches)} mismatches")
+    for mismatch in mismatches[:10]:
+        print("  legacy=%s new=%s | %r | %r" % mismatch)
+
+    for words in (200, 1000, 5000):
+        pairs = synthetic_corpus(30, words, seed=words)
+        legacy_ms = bench(legacy_ats_score, pairs)
+        new_ms = bench(scorer.score, pairs)
+        print(f"{words:>5} words/resume: legacy {legacy_ms:7.2f} ms  hashed {new_ms:7.2f} ms  "
+              f"({legacy_ms / new_ms:.1f}x)")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
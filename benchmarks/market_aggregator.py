@@ -0,0 +1,160 @@
+"""
+Regression check and benchmark for dashboard_module.market_aggregator
+against the original four-pass analysis of JobDataAPI.analyze_market.
+
+    python -m benchmarks.market_aggregator [n_postings]
+"""
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from ai_modules.skill_taxonomy import get_taxonomy
+from dashboard_module.market_aggregator import MarketAggregator
+from dashboard_module.salary_sketch import QUANTILES
+
+SKILL_WORDS = ["python", "java", "sql", "aws", "docker", "react", "kubernetes", "git",
+               "machine learning", "communication", "leadership", "excel", "tableau", "spark"]
+FILLER = "we are looking for a motivated engineer to join our growing team and ship great products".split()
+# relative error allowed for the sketched employer count (about 3 standard errors)
+HIRING_TOLERANCE = 0.05
+EMPLOYMENT_TYPES = ["FULLTIME", "PARTTIME", "CONTRACTOR", "INTERN", "TEMPORARY", "PERMANENT", "FREELANCE", ""]
+
+
+def synthetic_postings(n, seed=7, now=None):
+    rng = random.Random(seed)
+    now = now or datetime.now()
+    for i in range(n):
+        words = rng.choices(FILLER, k=150) + rng.sample(SKILL_WORDS, rng.randint(0, 6))
+        rng.shuffle(words)
+        if rng.random() < 0.3:
+            words.append(rng.choice(["remote", "hybrid"]))
+        low = rng.choice([None, 0, rng.randint(40, 150) * 1000])
+        yield {
+            "job_id": f"job-{i}",
+            "employer_name": rng.choice(["", f"Employer {rng.randint(0, n // 20)}"]),
+            "job_title": "Software Engineer",
+            "job_description": " ".join(words),
+            "job_employment_type": rng.choice(EMPLOYMENT_TYPES),
+            "remote_jobs_url": rng.choice([None, "", "https://example.com/remote"]),
+            "job_posted_at_datetime_utc": rng.choice([
+                None, "", "not a date",
+                (now - timedelta(days=rng.randint(0, 40), hours=rng.randint(0, 23))).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+            ]),
+            "job_min_salary": low,
+            "job_max_salary": rng.choice([None, low and low + rng.randint(0, 60) * 1000])
+        }
+
+
+# the original implementation, one pass per section
+
+def _is_recent(date_str):
+    if not date_str:
+        return False
+    try:
+        posted_date = datetime.strptime(date_str[:10], '%Y-%m-%d')
+        return (datetime.now() - posted_date).days <= 7
+    except ValueError:
+        return False
+
+
+def legacy_analysis(jobs):
+    overview = {
+        "total_jobs": len(jobs),
+        "recent_jobs": len([j for j in jobs if _is_recent(j.get('job_posted_at_datetime_utc', ''))]),
+        "remote_jobs": len([j for j in jobs if j.get('remote_jobs_url')]),
+        "hiring_companies": len(set(j.get('employer_name', '') for j in jobs))
+    }
+
+    skills_count = {}
+    for job in jobs:
+        for skill in sorted(get_taxonomy().find(job.get('job_description', '').lower())):
+            skills_count[skill] = skills_count.get(skill, 0) + 1
+    skills = dict(sorted(skills_count.items(), key=lambda x: x[1], reverse=True)[:10])
+
+    salaries = []
+    for job in jobs:
+        if job.get('job_max_salary') and job.get('job_min_salary'):
+            salaries.append((float(job['job_max_salary']) + float(job['job_min_salary'])) / 2)
+        elif job.get('job_max_salary'):
+            salaries.append(float(job['job_max_salary']))
+        elif job.get('job_min_salary'):
+            salaries.append(float(job['job_min_salary']))
+    if salaries:
+        salary = {"average": sum(salaries) / len(salaries), "range": {"min": min(salaries), "max": max(salaries)}}
+    else:
+        salary = {"average": 0, "range": {"min": 0, "max": 0}}
+
+    types = dict.fromkeys(['Full-time', 'Part-time', 'Contract', 'Internship', 'Permanent', 'Freelance', 'Other'], 0)
+    work_location = {'remote': 0, 'hybrid': 0, 'onsite': 0}
+    for job in jobs:
+        job_type = job.get('job_employment_type', '').upper()
+        job_desc = job.get('job_description', '').lower()
+        if 'FULL' in job_type or 'FT' in job_type:
+            types['Full-time'] += 1
+        elif 'PART' in job_type or 'PT' in job_type:
+            types['Part-time'] += 1
+        elif 'CONTRACT' in job_type or 'TEMP' in job_type:
+            types['Contract'] += 1
+        elif 'INTERN' in job_type:
+            types['Internship'] += 1
+        elif 'PERMANENT' in job_type:
+            types['Permanent'] += 1
+        elif 'FREELANCE' in job_type:
+            types['Freelance'] += 1
+        else:
+            types['Other'] += 1
+        if 'remote' in job_desc or job.get('remote_jobs_url'):
+            work_location['remote'] += 1
+        elif 'hybrid' in job_desc:
+            work_location['hybrid'] += 1
+        else:
+            work_location['onsite'] += 1
+
+    return {
+        "market_overview": overview,
+        "skills_demand": skills,
+        "salary_insights": salary,
+        "job_types": {
+            'employment_types': {k: v for k, v in types.items() if v > 0},
+            'work_location': {k: v for k, v in work_location.items() if v > 0},
+            'total_jobs': len(jobs),
+            'analysis_date': datetime.now().strftime('%Y-%m-%d')
+        }
+    }
+
+
+def fused_analysis(jobs):
+    result = MarketAggregator().update(jobs).result()
+    # the original reported no quantiles
+    for key in [*QUANTILES, "mean", "currency", "by_currency"]:
+        del result["salary_insights"][key]
+    return result
+
+
+def main(n_postings=20000):
+    mismatches = 0
+    for seed in range(50):
+        jobs = list(synthetic_postings(random.Random(seed).randint(1, 300), seed=seed))
+        if fused_analysis(iter(jobs)) != legacy_analysis(jobs):
+            mismatches += 1
+    print(f"regression: {mismatches} mismatches in 50 searches")
+
+    jobs = list(synthetic_postings(n_postings))
+    started = time.perf_counter()
+    expected = legacy_analysis(jobs)
+    legacy = time.perf_counter() - started
+    started = time.perf_counter()
+    result = fused_analysis(jobs)
+    fused = time.perf_counter() - started
+    print(f"{n_postings} postings: four passes {legacy * 1000.0:.0f} ms  single pass {fused * 1000.0:.0f} ms "
+          f"({legacy / fused:.2f}x)")
+    # past EXACT_LIMIT employers the aggregator estimates them with a HyperLogLog
+    exact = expected["market_overview"].pop("hiring_companies")
+    estimate = result["market_overview"].pop("hiring_companies")
+    print(f"hiring companies: exact {exact}  sketch {estimate} ({estimate / exact - 1:+.1%})")
+    return 1 if mismatches or result != expected or abs(estimate / exact - 1) > HIRING_TOLERANCE else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(arg) for arg in sys.argv[1:2])))
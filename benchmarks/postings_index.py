@@ -0,0 +1,44 @@
+"""
+Query latency of the local job postings index at a given size.
+
+    python -m benchmarks.postings_index [n_postings]
+"""
+import sys
+import time
+
+from ai_modules.document import ParsedResume
+from benchmarks.ats_scoring import synthetic_corpus
+from dashboard_module.postings_index import PostingsIndex
+
+BATCH_SIZE = 5000
+
+
+def main(n_postings=100000, words=200, queries=20):
+    index = PostingsIndex(directory=None)
+    started = time.perf_counter()
+    for batch_start in range(0, n_postings, BATCH_SIZE):
+        docs = synthetic_corpus(min(BATCH_SIZE, n_postings - batch_start), words, seed=batch_start)
+        index.add(
+            {"job_id": f"job-{batch_start + i}", "job_title": f"Job {batch_start + i}", "job_description": text}
+            for i, (text, _) in enumerate(docs)
+        )
+    print(f"indexed {len(index)} postings in {time.perf_counter() - started:.1f}s {index.get_stats()}")
+
+    resumes = [ParsedResume(text) for text, _ in synthetic_corpus(queries, 600, seed=1)]
+    started = time.perf_counter()
+    index.search(resumes[0], top_k=10)
+    print(f"first query (row norms) {(time.perf_counter() - started) * 1000.0:.1f} ms")
+
+    timings = []
+    for resume in resumes:
+        started = time.perf_counter()
+        results = index.search(resume, top_k=10)
+        timings.append((time.perf_counter() - started) * 1000.0)
+    timings.sort()
+    print(f"query top-10: median {timings[len(timings) // 2]:.1f} ms  max {timings[-1]:.1f} ms")
+    print(f"best match: {results[0]['job_id']} score {results[0]['score']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(arg) for arg in sys.argv[1:2])))
@@ -0,0 +1,103 @@
+"""
+Market analytics over the Parquet postings store against the
+single-pass MarketAggregator over the raw postings.
+
+    python -m benchmarks.postings_store [n_postings]
+"""
+import math
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from dashboard_module.market_aggregator import MarketAggregator
+from dashboard_module.postings_store import PostingsStore
+from dashboard_module.salary_sketch import QUANTILES
+
+SKILL_WORDS = ["python", "java", "sql", "aws", "docker", "react", "kubernetes", "git",
+               "machine learning", "communication", "leadership", "excel", "tableau", "spark"]
+FILLER = "we are looking for a motivated engineer to join our growing team and ship great products".split()
+EMPLOYMENT_TYPES = ["FULLTIME", "PARTTIME", "CONTRACTOR", "INTERN", "TEMPORARY", ""]
+DAYS = 30
+BATCH_SIZE = 500
+# relative error allowed for the sketched employer count (about 3 standard errors)
+HIRING_TOLERANCE = 0.05
+
+
+def synthetic_postings(n, rng, now):
+    for i in range(n):
+        words = rng.choices(FILLER, k=150) + rng.sample(SKILL_WORDS, rng.randint(0, 6))
+        rng.shuffle(words)
+        if rng.random() < 0.3:
+            words.append(rng.choice(["remote", "hybrid"]))
+        low = rng.choice([None, rng.randint(40, 150) * 1000])
+        yield {
+            "job_id": f"job-{i}",
+            "employer_name": f"Employer {rng.randint(0, n // 20)}",
+            "job_title": "Software Engineer",
+            "job_description": " ".join(words),
+            "job_employment_type": rng.choice(EMPLOYMENT_TYPES),
+            "remote_jobs_url": rng.choice([None, "https://example.com/remote"]),
+            "job_posted_at_datetime_utc": (now - timedelta(days=rng.randint(0, 40))).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "job_min_salary": low,
+            "job_max_salary": low and low + rng.randint(0, 60) * 1000
+        }
+
+
+def main(n_postings=300000):
+    rng = random.Random(7)
+    now = datetime.now().replace(microsecond=0)
+    store = PostingsStore(tempfile.mkdtemp())
+    jobs = list(synthetic_postings(n_postings, rng, now))
+
+    started = time.perf_counter()
+    for batch_start in range(0, n_postings, BATCH_SIZE):
+        # one batch per fetch, spread over the last DAYS days
+        fetched_at = now - timedelta(days=DAYS - 1) + timedelta(days=DAYS - 1) * batch_start / n_postings
+        store.append(jobs[batch_start:batch_start + BATCH_SIZE], "software-engineer", "remote", fetched_at)
+    print(f"stored {n_postings} postings in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    store.compact()
+    print(f"compacted in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    result = store.analyze("software-engineer", "remote", days=DAYS, now=now)
+    columnar = time.perf_counter() - started
+    print(f"store.analyze: {columnar * 1000.0:.0f} ms")
+
+    started = time.perf_counter()
+    expected = MarketAggregator(now).update(jobs).result()
+    raw = time.perf_counter() - started
+    print(f"raw postings:  {raw * 1000.0:.0f} ms  ({raw / columnar:.1f}x)")
+
+    # the store computes exact salary quantiles, the aggregator sketches them
+    for key in QUANTILES:
+        print(f"  {key}: exact {result['salary_insights'].pop(key):,.0f}  sketch {expected['salary_insights'].pop(key):,.0f}")
+    # both means are exact; only the summation order differs
+    if not math.isclose(result["salary_insights"].pop("mean"), expected["salary_insights"].pop("mean")):
+        print("MISMATCH in mean salary")
+        return 1
+    # the store counts employers exactly, the aggregator sketches them
+    exact = result["market_overview"].pop("hiring_companies")
+    estimate = expected["market_overview"].pop("hiring_companies")
+    print(f"  hiring companies: exact {exact}  sketch {estimate} ({estimate / exact - 1:+.1%})")
+    if abs(estimate / exact - 1) > HIRING_TOLERANCE:
+        print("MISMATCH in hiring companies")
+        return 1
+    for insights in (result["salary_insights"], expected["salary_insights"]):
+        insights["by_currency"] = {currency: q["count"] for currency, q in insights["by_currency"].items()}
+
+    if result != expected:
+        print("MISMATCH")
+        for key in expected:
+            if result[key] != expected[key]:
+                print(f"  {key}: {result[key]} != {expected[key]}")
+        return 1
+    print("results identical apart from salary quantiles and the employer count")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(arg) for arg in sys.argv[1:2])))
@@ -0,0 +1,62 @@
+"""
+Accuracy, size and speed of the KLL salary sketch against exact quantiles,
+for one stream and for many merged partial sketches (e.g. daily summaries).
+
+    python -m benchmarks.salary_sketch [n_values]
+"""
+import json
+import sys
+import time
+
+import numpy as np
+
+from dashboard_module.salary_sketch import KLLSketch
+
+CHECK_RANKS = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+PARTS = 365
+
+
+def rank_error(sketch, exact):
+    """Largest distance between a requested rank and the true rank of the sketch's answer."""
+    return max(
+        abs(np.searchsorted(exact, sketch.quantile(q), side="right") / len(exact) - q)
+        for q in CHECK_RANKS
+    )
+
+
+def report(label, sketch, exact, elapsed):
+    items = sum(len(items) for items in sketch.levels)
+    size = len(json.dumps(sketch.to_state()))
+    print(f"{label}: {elapsed * 1000.0:.0f} ms  max rank error {rank_error(sketch, exact):.4f}  "
+          f"{items} items kept ({size / 1024:.1f} KiB as JSON)")
+
+
+def main(n_values=1000000):
+    rng = np.random.default_rng(7)
+    # long right tail, like salaries
+    values = rng.lognormal(mean=11.4, sigma=0.45, size=n_values).round(-2).tolist()
+    exact = np.sort(values)
+
+    sketch = KLLSketch()
+    started = time.perf_counter()
+    for value in values:
+        sketch.update(value)
+    report(f"stream of {n_values}", sketch, exact, time.perf_counter() - started)
+
+    parts = [KLLSketch() for _ in range(PARTS)]
+    for i, value in enumerate(values):
+        parts[i % PARTS].update(value)
+    states = [json.dumps(part.to_state()) for part in parts]
+    started = time.perf_counter()
+    merged = KLLSketch()
+    for state in states:
+        merged.merge(KLLSketch.from_state(json.loads(state)))
+    report(f"merge of {PARTS} stored parts", merged, exact, time.perf_counter() - started)
+
+    print(f"exact median {np.quantile(exact, 0.5, method='inverted_cdf'):,.0f}  "
+          f"stream {sketch.quantile(0.5):,.0f}  merged {merged.quantile(0.5):,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(arg) for arg in sys.argv[1:2])))
@@ -0,0 +1,61 @@
+"""
+Latency of the admin submissions queries against a large SQLite store.
+
+    python -m benchmarks.submissions_store [n_rows]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from storage_module.submissions import STATUSES, SubmissionStore
+
+TYPES = ("Tech", "Marketing", "Sales", "General")
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000.0, result
+
+
+def main(n_rows=1000000):
+    rng = random.Random(7)
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    store = SubmissionStore(path)
+    now = datetime.now()
+    started = time.perf_counter()
+    with store.conn as conn:
+        conn.executemany(
+            "INSERT INTO submissions (name, submitted_at, status, score, type) VALUES (?, ?, ?, ?, ?)",
+            (
+                (f"Candidate {i}", (now - timedelta(seconds=rng.randrange(365 * 86400))).isoformat(sep=" ", timespec="seconds"),
+                 rng.choice(STATUSES), rng.randrange(101), rng.choice(TYPES))
+                for i in range(n_rows)
+            )
+        )
+    print(f"inserted {n_rows} rows in {time.perf_counter() - started:.1f}s")
+
+    today = date.today()
+    week, year = (today - timedelta(days=7), today), (today - timedelta(days=365), today)
+    first_ms, first = timed(lambda: store.page("All", *year))
+    cursor = None
+    for _ in range(200):  # walk 200 pages deep
+        rows = store.page("All", *year, after=cursor)
+        cursor = (rows[-1]["submitted_at"], rows[-1]["id"])
+    deep_ms, _ = timed(lambda: store.page("All", *year, after=cursor))
+    status_ms, _ = timed(lambda: store.page("Flagged", *week))
+    week_stats_ms, _ = timed(lambda: store.stats(*week))
+    year_stats_ms, stats = timed(lambda: store.stats(*year))
+    print(f"first page {first_ms:.2f} ms, page 201 {deep_ms:.2f} ms, status+week page {status_ms:.2f} ms")
+    print(f"stats last 7 days {week_stats_ms:.2f} ms, stats last year {year_stats_ms:.2f} ms {stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(arg) for arg in sys.argv[1:2])))
@@ -0,0 +1,211 @@
+import logging
+import os
+import random
+import threading
+import time
+
+from dotenv import load_dotenv
+
+from dashboard_module.data_fetcher import JobDataAPI
+from dashboard_module.http_client import JobDataError
+from dashboard_module.quota import BACKGROUND, BACKGROUND_MONTHLY_SHARE, MONTHLY_QUOTA, QuotaExceeded
+from dashboard_module.response_cache import FRESH_SECONDS, STALE_SECONDS
+from storage_module.database import DB_PATH, get_connection
+
+logger = logging.getLogger(__name__)
+
+# the dashboard's fixed search grid
+DASHBOARD_ROLES = ["Software Engineer", "Data Scientist", "DevOps Engineer",
+                   "Full Stack Developer", "Machine Learning Engineer"]
+DASHBOARD_LOCATIONS = ["United States", "Remote", "Europe", "Asia"]
+
+ENABLED = os.getenv("SMARTHIRE_WARM_ENABLED", "1") == "1"
+# every search is refreshed about this often, unless the quota only allows less
+INTERVAL = float(os.getenv("SMARTHIRE_WARM_INTERVAL", str(FRESH_SECONDS * 0.8)))
+# +/- fraction applied to each pause, so processes and restarts don't line up
+JITTER = float(os.getenv("SMARTHIRE_WARM_JITTER", "0.2"))
+PAGES = int(os.getenv("SMARTHIRE_WARM_PAGES", "1"))
+STARTUP_DELAY = float(os.getenv("SMARTHIRE_WARM_STARTUP_DELAY", "10"))
+MONTH_SECONDS = 30 * 24 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS warm_searches (
+    query TEXT NOT NULL,
+    location TEXT NOT NULL,
+    added_at REAL NOT NULL,
+    PRIMARY KEY (query, location)
+);
+"""
+
+
+def search_terms(role: str, location: str):
+    """(query, location) as the dashboard sends them to JobDataAPI.analyze_market."""
+    query = role.strip().lower().replace(" ", "-")
+    location = location.strip()
+    return query, "remote" if location.lower() == "remote" else location
+
+
+class CacheWarmer:
+    """
+    Keeps the job API cache warm for the dashboard grid and for extra
+    searches added by admins, so interactive loads are answered from the
+    cache. One background thread walks the searches, spacing the refreshes
+    evenly over a cycle of INTERVAL seconds (with jitter). The cycle is
+    stretched when the background share of the monthly quota could not pay
+    for it. Requests go out at background priority, so they never take
+    budget an interactive user is waiting for, and a search whose cached
+    pages are still young (e.g. a user just loaded it) costs nothing.
+    """
+
+    def __init__(self, path: str = DB_PATH, interval: float = INTERVAL, pages: int = PAGES,
+                 jitter: float = JITTER, monthly_quota: int = MONTHLY_QUOTA):
+        self.path = path
+        self.interval = interval
+        self.pages = pages
+        self.jitter = jitter
+        self.monthly_quota = monthly_quota
+        self._schema_ready = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = {"refreshed": 0, "cached": 0, "api_calls": 0, "quota_skips": 0, "errors": 0,
+                       "cycles": 0, "last_refresh": None}
+
+    @property
+    def conn(self):
+        conn = get_connection(self.path)
+        if not self._schema_ready:
+            with self._lock:
+                if not self._schema_ready:
+                    conn.executescript(SCHEMA)
+                    self._schema_ready = True
+        return conn
+
+    def add_search(self, role: str, location: str):
+        query, location = search_terms(role, location)
+        with self.conn as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO warm_searches (query, location, added_at) VALUES (?, ?, ?)",
+                (query, location, time.time())
+            )
+
+    def remove_search(self, query: str, location: str):
+        with self.conn as conn:
+            conn.execute("DELETE FROM warm_searches WHERE query = ? AND location = ?", (query, location))
+
+    def extra_searches(self) -> list:
+        rows = self.conn.execute("SELECT query, location FROM warm_searches ORDER BY added_at").fetchall()
+        return [(query, location) for query, location in rows]
+
+    def searches(self) -> list:
+        """The dashboard grid followed by the admin-added searches, without duplicates."""
+        grid = [search_terms(role, location) for role in DASHBOARD_ROLES for location in DASHBOARD_LOCATIONS]
+        return list(dict.fromkeys(grid + self.extra_searches()))
+
+    def cycle_seconds(self, n_searches: int) -> float:
+        """Time to refresh every search once, at least as long as the background quota allows."""
+        budget = self.monthly_quota * BACKGROUND_MONTHLY_SHARE
+        quota_cycle = MONTH_SECONDS * n_searches * self.pages / budget if budget else float("inf")
+        return max(self.interval, quota_cycle)
+
+    def refresh(self, query: str, location: str, max_age: float) -> bool:
+        """
+        Refetches one search if its cached pages are older than ``max_age``.
+        Postings that came from the API also feed the index, store and history.
+        Returns whether the API was called.
+        """
+        api = JobDataAPI(priority=BACKGROUND, max_cache_age=max_age)
+        jobs = api.fetch_jobs([(query, location)], pages=self.pages)
+        if api.api_calls:
+            api.record_postings(jobs, query, location)
+        with self._lock:
+            self._stats["refreshed" if api.api_calls else "cached"] += 1
+            self._stats["api_calls"] += api.api_calls
+            self._stats["last_refresh"] = time.time()
+        return bool(api.api_calls)
+
+    def run_cycle(self):
+        searches = self.searches()
+        cycle = self.cycle_seconds(len(searches))
+        if cycle > STALE_SECONDS:
+            logger.warning(
+                "Refreshing %d searches takes %.1fh within the quota, longer than the %.1fh the cache serves "
+                "stale data; some dashboard loads will wait on the API",
+                len(searches), cycle / 3600, STALE_SECONDS / 3600
+            )
+        pause = cycle / len(searches)
+        for query, location in searches:
+            if self._stop.is_set():
+                return
+            try:
+                # refresh once a page has used up most of a cycle, so it never expires between visits
+                self.refresh(query, location, max_age=cycle * 0.9)
+            except JobDataError as e:
+                if isinstance(e.__cause__, QuotaExceeded):
+                    # background requests only get what interactive use leaves over
+                    logger.info(f"Skipped warming {query} / {location}: {e.__cause__}")
+                    self._count("quota_skips")
+                else:
+                    logger.warning(f"Warming {query} / {location} failed: {e}")
+                    self._count("errors")
+            except Exception:
+                logger.exception(f"Warming {query} / {location} failed")
+                self._count("errors")
+            self._stop.wait(pause * random.uniform(1 - self.jitter, 1 + self.jitter))
+        self._count("cycles")
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _run(self):
+        self._stop.wait(STARTUP_DELAY * random.uniform(1, 1 + self.jitter))
+        while not self._stop.is_set():
+            self.run_cycle()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="cache-warmer", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        n_searches = len(self.searches())
+        stats.update(
+            running=self._thread is not None and self._thread.is_alive(),
+            searches=n_searches,
+            cycle_seconds=self.cycle_seconds(n_searches)
+        )
+        return stats
+
+
+_warmer = None
+_warmer_lock = threading.Lock()
+
+
+def get_cache_warmer() -> CacheWarmer:
+    global _warmer
+    if _warmer is None:
+        with _warmer_lock:
+            if _warmer is None:
+                _warmer = CacheWarmer()
+    return _warmer
+
+
+def start_cache_warmer():
+    """
+    Starts the process-wide warmer unless SMARTHIRE_WARM_ENABLED=0 or no API
+    key is configured. Calling it again (e.g. on every Streamlit rerun) is a no-op.
+    """
+    load_dotenv()
+    if not ENABLED or not os.getenv("JSEARCH_API_KEY"):
+        return None
+    return get_cache_warmer().start()
@@ -1,16 +1,47 @@
-import requests
 import pandas as pd
-from datetime import datetime
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from dotenv import load_dotenv
 import logging
 
+from dashboard_module.http_client import JobDataError, get_json
+from dashboard_module.market_aggregator import MarketAggregator, default_analysis
+from dashboard_module.market_history import get_market_history
+from dashboard_module.postings_index import get_postings_index
+from dashboard_module.postings_store import get_postings_store
+from dashboard_module.quota import BACKGROUND, INTERACTIVE, get_quota_manager
+from dashboard_module.response_cache import get_response_cache
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# page requests run on a shared pool; per-host limits live in http_client
+FETCH_WORKERS = int(os.getenv('SMARTHIRE_FETCH_WORKERS', '8'))
+# overall budget for a multi-page fetch; pages still in flight are left out
+FETCH_TIMEOUT = float(os.getenv('SMARTHIRE_FETCH_TIMEOUT', '20'))
+
+_fetch_pool = None
+_fetch_pool_lock = threading.Lock()
+
+def _get_fetch_pool():
+    global _fetch_pool
+    with _fetch_pool_lock:
+        if _fetch_pool is None:
+            _fetch_pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="job-fetch")
+        return _fetch_pool
+
 class JobDataAPI:
-    def __init__(self):
+    def __init__(self, priority: str = INTERACTIVE, max_cache_age: float = None):
         load_dotenv()
+        # quota priority of this client's requests (interactive or background)
+        self.priority = priority
+        # cached pages older than this many seconds are refetched, not served stale
+        self.max_cache_age = max_cache_age
+        # requests that actually reached the API (not answered from the cache)
+        self.api_calls = 0
+        self._api_calls_lock = threading.Lock()
         self.api_key = os.getenv('JSEARCH_API_KEY')
         if not self.api_key:
             raise ValueError("JSEARCH_API_KEY not found in .env file")
@@ -19,215 +50,162 @@ class JobDataAPI:
             "X-RapidAPI-Key": self.api_key,
             "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
         }
-        self.base_url = "https://jsearch.p.rapidapi.com"
+        self.base_url = os.getenv('JSEARCH_BASE_URL', "https://jsearch.p.rapidapi.com").rstrip("/")
+        self.last_fetch_report = None
     
-    def analyze_market(self, query: str, location: str = None) -> dict:
+    def analyze_market(self, query: str, location: str = None, pages: int = 1) -> dict:
         try:
-            jobs_data = self._fetch_jobs(query, location)
+            # postings are aggregated as pages arrive, in one pass
+            jobs_data = []
+            aggregator = MarketAggregator()
+            calls_before = self.api_calls
+            for job in self.iter_jobs([(query, location)], pages=pages):
+                jobs_data.append(job)
+                aggregator.add(job)
             if not jobs_data:
                 return self._default_analysis()
+            if self.api_calls > calls_before:
+                # cached pages were recorded when they were first fetched
+                self.record_postings(jobs_data, query, location)
             
-            job_types_analysis = self._analyze_job_types(jobs_data)
-            
-            return {
-                "market_overview": self._analyze_market_overview(jobs_data),
-                "skills_demand": self._analyze_skills_demand(jobs_data),
-                "salary_insights": self._analyze_salary_data(jobs_data),
-                "job_types": job_types_analysis  # This contains employment_types and work_location
-            }
+            return aggregator.result()
+        except JobDataError:
+            # an outage is not "no jobs"; let the page say so
+            raise
         except Exception as e:
             logger.error(f"Analysis failed: {e}")
             return self._default_analysis()
     
-    def _fetch_jobs(self, query: str, location: str) -> list:
-        try:
-            search_query = f"{query}"
-            if location.lower() != "remote":
-                search_query += f" in {location}"
-            
-            params = {
-                "query": search_query,
-                "page": "1",
-                "num_pages": "1",
-                "date_posted": "today",  # Get recent postings
-                "remote_jobs_only": "true" if location.lower() == "remote" else "false"
-            }
-            
-            response = requests.get(
-                f"{self.base_url}/search",
-                headers=self.headers,
-                params=params,
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            # Debug logging
-            print(f"API Query: {search_query}")
-            print(f"Total results: {len(data.get('data', []))}")
-            
-            return data.get('data', [])
-        except Exception as e:
-            print(f"API request failed: {e}")
-            return []
-    
-    def _analyze_market_overview(self, jobs: list) -> dict:
-        total_jobs = len(jobs)
-        recent_jobs = len([j for j in jobs if self._is_recent(j.get('job_posted_at_datetime_utc', ''))])
-        remote_jobs = len([j for j in jobs if j.get('remote_jobs_url')])
-        
-        return {
-            "total_jobs": total_jobs,
-            "recent_jobs": recent_jobs,
-            "remote_jobs": remote_jobs,
-            "hiring_companies": len(set(j.get('employer_name', '') for j in jobs))
-        }
+    def fetch_jobs(self, searches, pages: int = 1, timeout: float = FETCH_TIMEOUT) -> list:
+        """Postings of ``iter_jobs`` as a list."""
+        return list(self.iter_jobs(searches, pages=pages, timeout=timeout))
     
-    def _analyze_skills_demand(self, jobs: list) -> dict:
-        skills_count = {}
-        for job in jobs:
-            description = job.get('job_description', '').lower()
-            found_skills = self._extract_skills(description)
-            for skill in found_skills:
-                skills_count[skill] = skills_count.get(skill, 0) + 1
+    def iter_jobs(self, searches, pages: int = 1, timeout: float = FETCH_TIMEOUT):
+        """
+        Postings for several (query, location) searches, ``pages`` pages each,
+        fetched concurrently and yielded de-duplicated by job id in search/page
+        order, each page as soon as it and the pages before it have arrived.
+        Pages that fail or miss the ``timeout`` are left out; JobDataError is
+        raised only if no page could be fetched. ``last_fetch_report`` records
+        how many pages came back.
+        """
+        requests_ = [(query, location, page) for query, location in searches for page in range(1, pages + 1)]
+        pool = _get_fetch_pool()
+        futures = [pool.submit(self._fetch_jobs, query, location, page) for query, location, page in requests_]
+        deadline = time.monotonic() + timeout
         
-        return dict(sorted(skills_count.items(), key=lambda x: x[1], reverse=True)[:10])
-    
-    def _analyze_salary_data(self, jobs: list) -> dict:
-        salaries = []
-        for job in jobs:
-            # Extract salary info from JSearch API response
-            if job.get('job_max_salary') and job.get('job_min_salary'):
-                avg_salary = (float(job['job_max_salary']) + float(job['job_min_salary'])) / 2
-                salaries.append(avg_salary)
-            elif job.get('job_max_salary'):
-                salaries.append(float(job['job_max_salary']))
-            elif job.get('job_min_salary'):
-                salaries.append(float(job['job_min_salary']))
+        seen, errors, timed_out, yielded = set(), [], 0, 0
+        try:
+            for future in futures:
+                try:
+                    page_jobs = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                except FutureTimeout:
+                    if future.done():
+                        errors.append(future.exception())
+                    else:
+                        future.cancel()
+                        timed_out += 1
+                    continue
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                for job in page_jobs:
+                    job_id = job.get('job_id')
+                    if job_id:
+                        if job_id in seen:
+                            continue
+                        seen.add(job_id)
+                    yielded += 1
+                    yield job
+        finally:
+            # the consumer may stop early; don't leave queued pages behind
+            for future in futures:
+                future.cancel()
         
-        if not salaries:
-            return {"average": 0, "range": {"min": 0, "max": 0}}
-            
-        return {
-            "average": sum(salaries) / len(salaries),
-            "range": {
-                "min": min(salaries),
-                "max": max(salaries)
-            }
+        self.last_fetch_report = {
+            "requested": len(futures),
+            "completed": len(futures) - len(errors) - timed_out,
+            "failed": len(errors),
+            "timed_out": timed_out,
+            "jobs": yielded
         }
+        if errors or timed_out:
+            logger.warning(f"Partial job fetch: {self.last_fetch_report}")
+        if len(errors) + timed_out == len(futures):
+            if errors:
+                raise JobDataError(f"All {len(futures)} page requests failed: {errors[0]}") from errors[0]
+            raise JobDataError(f"No page arrived within {timeout:.0f}s")
     
-    def _analyze_job_types(self, jobs: list) -> dict:
-        # Initialize counters
-        types = {
-            'Full-time': 0,
-            'Part-time': 0,
-            'Contract': 0,
-            'Internship': 0,
-            'Permanent': 0,
-            'Freelance': 0,
-            'Other': 0
-        }
+    def _fetch_jobs(self, query: str, location: str, page: int = 1) -> list:
+        """One page of postings; raises JobDataError if the API stays unreachable."""
+        search_query = f"{query}"
+        if location.lower() != "remote":
+            search_query += f" in {location}"
         
-        work_location = {
-            'remote': 0,
-            'hybrid': 0,
-            'onsite': 0
+        params = {
+            "query": search_query,
+            "page": str(page),
+            "num_pages": "1",
+            "date_posted": "today",  # Get recent postings
+            "remote_jobs_only": "true" if location.lower() == "remote" else "false"
         }
         
-        total_jobs = len(jobs)
-        
-        for job in jobs:
-            # Employment Type Analysis
-            job_type = job.get('job_employment_type', '').upper()
-            job_desc = job.get('job_description', '').lower()
-            
-            # Categorize job type
-            if 'FULL' in job_type or 'FT' in job_type:
-                types['Full-time'] += 1
-            elif 'PART' in job_type or 'PT' in job_type:
-                types['Part-time'] += 1
-            elif 'CONTRACT' in job_type or 'TEMP' in job_type:
-                types['Contract'] += 1
-            elif 'INTERN' in job_type:
-                types['Internship'] += 1
-            elif 'PERMANENT' in job_type:
-                types['Permanent'] += 1
-            elif 'FREELANCE' in job_type:
-                types['Freelance'] += 1
-            else:
-                types['Other'] += 1
-            
-            # Work Location Analysis
-            if 'remote' in job_desc or job.get('remote_jobs_url'):
-                work_location['remote'] += 1
-            elif 'hybrid' in job_desc:
-                work_location['hybrid'] += 1
-            else:
-                work_location['onsite'] += 1
+        # shared on-disk cache; stale entries are served while refreshing at background priority
+        return get_response_cache().get_or_fetch(
+            params, lambda: self._search(params), max_age=self.max_cache_age,
+            refresh=lambda: self._search(params, priority=BACKGROUND)
+        )
+    
+    def _search(self, params: dict, priority: str = None) -> list:
+        priority = priority or self.priority
         
-        # Remove empty categories
-        types = {k: v for k, v in types.items() if v > 0}
-        work_location = {k: v for k, v in work_location.items() if v > 0}
+        def charge():
+            # every attempt, retries included, counts against the RapidAPI budget;
+            # QuotaExceeded stops the retries
+            get_quota_manager().acquire(priority)
+            with self._api_calls_lock:
+                self.api_calls += 1
         
-        return {
-            'employment_types': types,
-            'work_location': work_location,
-            'total_jobs': total_jobs,
-            'analysis_date': datetime.now().strftime('%Y-%m-%d')
-        }
+        # pooled keep-alive session with retries and jittered backoff
+        data = get_json(f"{self.base_url}/search", headers=self.headers, params=params, before_attempt=charge)
+        logger.debug(f"API query {params['query']!r} page {params['page']}: {len(data.get('data', []))} results")
+        return data.get('data', [])
     
-    def _extract_skills(self, text: str) -> list:
-        skills = [
-            'python', 'java', 'javascript', 'sql', 'aws', 'azure',
-            'react', 'node.js', 'docker', 'kubernetes', 'machine learning',
-            'ai', 'data science', 'cloud', 'devops', 'git'
-        ]
-        return [skill for skill in skills if skill in text]
+    def record_postings(self, jobs: list, query: str, location: str):
+        """Feeds fetched postings to the recommendation index, postings store and market history."""
+        self._index_postings(jobs)
+        self._store_postings(jobs, query, location)
     
-    def _is_recent(self, date_str: str) -> bool:
-        if not date_str:
-            return False
+    def _index_postings(self, jobs: list):
+        # keep fetched postings for resume-to-job recommendations
         try:
-            posted_date = datetime.strptime(date_str[:10], '%Y-%m-%d')
-            return (datetime.now() - posted_date).days <= 7
-        except:
-            return False
+            added = get_postings_index().add(jobs)
+            if added:
+                logger.info(f"Indexed {added} new job postings")
+        except Exception as e:
+            logger.error(f"Indexing postings failed: {e}")
+    
+    def _store_postings(self, jobs: list, query: str, location: str):
+        # history for trend analytics over more than the latest fetch
+        try:
+            get_postings_store().append(jobs, query, location)
+        except Exception as e:
+            logger.error(f"Storing postings failed: {e}")
+        try:
+            get_market_history().record(jobs, query, location)
+        except Exception as e:
+            logger.error(f"Recording market history failed: {e}")
     
     def _default_analysis(self) -> dict:
-        return {
-            "market_overview": {
-                "total_jobs": 0,
-                "recent_jobs": 0,
-                "remote_jobs": 0,
-                "hiring_companies": 0
-            },
-            "skills_demand": {},
-            "salary_insights": {
-                "average": 0,
-                "range": {"min": 0, "max": 0}
-            },
-            "job_types": {
-                "employment_types": {"Other": 0},
-                "work_location": {
-                    "remote": 0,
-                    "hybrid": 0,
-                    "onsite": 0
-                },
-                "total_jobs": 0,
-                "analysis_date": datetime.now().strftime('%Y-%m-%d')
-            }
-        }
+        return default_analysis()
     
     def verify_api_connection(self):
         try:
-            test_response = requests.get(
+            data = get_json(
                 f"{self.base_url}/search",
                 headers=self.headers,
-                params={"query": "python developer", "page": "1", "num_pages": "1"},
-                timeout=10
+                params={"query": "python developer", "page": "1", "num_pages": "1"}
             )
-            test_response.raise_for_status()
-            data = test_response.json()
             if data.get('data'):
                 logger.info("API connection successful!")
                 logger.info(f"Sample job: {data['data'][0]}")
@@ -0,0 +1,99 @@
+import logging
+import os
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from tenacity import (
+    before_sleep_log,
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = int(os.getenv("SMARTHIRE_HTTP_MAX_ATTEMPTS", "4"))
+BACKOFF_INITIAL = float(os.getenv("SMARTHIRE_HTTP_BACKOFF_INITIAL", "0.5"))
+BACKOFF_MAX = float(os.getenv("SMARTHIRE_HTTP_BACKOFF_MAX", "8"))
+# (connect, read) seconds
+TIMEOUT = (3.05, float(os.getenv("SMARTHIRE_HTTP_READ_TIMEOUT", "10")))
+POOL_SIZE = int(os.getenv("SMARTHIRE_HTTP_POOL_SIZE", "16"))
+# requests in flight to any one host, across all threads
+PER_HOST_CONCURRENCY = int(os.getenv("SMARTHIRE_HTTP_PER_HOST", "4"))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class JobDataError(Exception):
+    """Job data could not be fetched (after retries, for transient failures)."""
+
+
+def is_transient(error: BaseException) -> bool:
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code in RETRY_STATUSES
+    return False
+
+
+_session = None
+_session_lock = threading.Lock()
+_host_slots = {}
+
+
+def get_http_session() -> requests.Session:
+    """Process-wide session; keeps TCP/TLS connections alive between requests."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def _host_slot(url) -> threading.BoundedSemaphore:
+    host = urlsplit(url).netloc
+    slot = _host_slots.get(host)
+    if slot is None:
+        with _session_lock:
+            slot = _host_slots.setdefault(host, threading.BoundedSemaphore(PER_HOST_CONCURRENCY))
+    return slot
+
+
+@retry(
+    retry=retry_if_exception(is_transient),
+    stop=stop_after_attempt(MAX_ATTEMPTS),
+    wait=wait_exponential_jitter(initial=BACKOFF_INITIAL, max=BACKOFF_MAX, jitter=BACKOFF_INITIAL),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True
+)
+def _get(url, headers=None, params=None, timeout=TIMEOUT, before_attempt=None) -> requests.Response:
+    if before_attempt is not None:
+        # e.g. charging the attempt to a quota; an exception here ends the retries
+        before_attempt()
+    # the slot is held per attempt, not across backoff sleeps
+    with _host_slot(url):
+        response = get_http_session().get(url, headers=headers, params=params, timeout=timeout)
+    response.raise_for_status()
+    return response
+
+
+def get_json(url, headers=None, params=None, timeout=TIMEOUT, before_attempt=None):
+    """
+    GET ``url`` and decode JSON, retrying connection errors, timeouts, 429
+    and 5xx with jittered exponential backoff. Raises JobDataError once the
+    attempts are used up or on a non-retryable failure. ``before_attempt``
+    is called before every attempt, retries included; whatever it raises
+    is passed on.
+    """
+    try:
+        return _get(url, headers=headers, params=params, timeout=timeout, before_attempt=before_attempt).json()
+    except (requests.RequestException, ValueError) as e:
+        raise JobDataError(f"Request to {url} failed: {e}") from e
@@ -0,0 +1,104 @@
+import base64
+import hashlib
+import math
+import zlib
+
+# 2**P registers; standard error is about 1.04 / sqrt(2**P) (1.6% at 12)
+P = 12
+# distinct values kept exactly (as hashes) before switching to registers
+EXACT_LIMIT = 256
+
+# up to this many values per register the empty-register count is used
+LINEAR_COUNTING_LIMIT = 2.5
+
+_HASH_BITS = 64
+
+
+def _hash(value) -> int:
+    """Stable 64-bit hash (Python's hash() differs between processes); None and "" differ."""
+    data = b"\0" if value is None else b"\1" + str(value).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    """
+    Distinct-count sketch. Small sets are kept exactly as 64-bit hashes;
+    past EXACT_LIMIT they are folded into 2**p registers holding the longest
+    run of leading zeros seen per hash bucket, so memory stays at 2**p bytes
+    however many values arrive. Sketches merge by union (exact) or by
+    register-wise max, so counts over any range of stored days combine.
+    """
+
+    def __init__(self, p: int = P):
+        self.p = p
+        self.exact = set()
+        self.registers = None
+
+    def __len__(self):
+        return self.count()
+
+    def add(self, value):
+        h = _hash(value)
+        if self.registers is None:
+            self.exact.add(h)
+            if len(self.exact) > EXACT_LIMIT:
+                self._densify()
+        else:
+            self._add_hash(h)
+
+    def merge(self, other: "HyperLogLog"):
+        if other.p != self.p:
+            raise ValueError(f"cannot merge sketches with p={self.p} and p={other.p}")
+        if self.registers is None and other.registers is None:
+            self.exact |= other.exact
+            if len(self.exact) > EXACT_LIMIT:
+                self._densify()
+            return self
+        if self.registers is None:
+            self._densify()
+        if other.registers is None:
+            for h in other.exact:
+                self._add_hash(h)
+        else:
+            self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def count(self) -> int:
+        if self.registers is None:
+            return len(self.exact)
+        m = len(self.registers)
+        zeros = self.registers.count(0)
+        if zeros:
+            # linear counting is more accurate while many registers are still empty
+            estimate = m * math.log(m / zeros)
+            if estimate <= LINEAR_COUNTING_LIMIT * m:
+                return int(round(estimate))
+        alpha = 0.7213 / (1 + 1.079 / m)
+        return int(round(alpha * m * m / sum(2.0 ** -r for r in self.registers)))
+
+    def _densify(self):
+        self.registers = bytearray(1 << self.p)
+        for h in self.exact:
+            self._add_hash(h)
+        self.exact = set()
+
+    def _add_hash(self, h):
+        index = h >> (_HASH_BITS - self.p)
+        rest = h & ((1 << (_HASH_BITS - self.p)) - 1)
+        rank = _HASH_BITS - self.p - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def to_state(self) -> dict:
+        if self.registers is None:
+            return {"p": self.p, "exact": sorted(self.exact)}
+        return {"p": self.p, "registers": base64.b64encode(zlib.compress(bytes(self.registers))).decode("ascii")}
+
+    @classmethod
+    def from_state(cls, state: dict) -> "HyperLogLog":
+        sketch = cls(state["p"])
+        if "registers" in state:
+            sketch.registers = bytearray(zlib.decompress(base64.b64decode(state["registers"])))
+        else:
+            sketch.exact = set(state["exact"])
+        return sketch
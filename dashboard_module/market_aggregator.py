@@ -0,0 +1,235 @@
+from datetime import datetime
+
+from ai_modules.skill_taxonomy import get_taxonomy
+from dashboard_module.hyperloglog import HyperLogLog
+from dashboard_module.salary_sketch import DEFAULT_CURRENCY, KLLSketch, annualize, salary_summary
+
+TOP_SKILLS = 10
+# checked in order; the first bucket whose key occurs in the employment type wins
+EMPLOYMENT_TYPES = [
+    ("Full-time", ("FULL", "FT")),
+    ("Part-time", ("PART", "PT")),
+    ("Contract", ("CONTRACT", "TEMP")),
+    ("Internship", ("INTERN",)),
+    ("Permanent", ("PERMANENT",)),
+    ("Freelance", ("FREELANCE",))
+]
+RECENT_DAYS = 7
+
+
+def default_analysis() -> dict:
+    """Result shape for a search with no postings."""
+    return {
+        "market_overview": {"total_jobs": 0, "recent_jobs": 0, "remote_jobs": 0, "hiring_companies": 0},
+        "skills_demand": {},
+        "salary_insights": dict({"average": 0, "range": {"min": 0, "max": 0}}, **salary_summary({})),
+        "job_types": {
+            "employment_types": {"Other": 0},
+            "work_location": {"remote": 0, "hybrid": 0, "onsite": 0},
+            "total_jobs": 0,
+            "analysis_date": datetime.now().strftime("%Y-%m-%d")
+        }
+    }
+
+
+def employment_bucket(job_type: str) -> str:
+    for name, keys in EMPLOYMENT_TYPES:
+        if any(key in job_type for key in keys):
+            return name
+    return "Other"
+
+
+class MarketAggregator:
+    """
+    Single-pass market analysis. ``add`` visits a posting once, normalizing
+    each field once, and updates every accumulator; ``update`` consumes any
+    iterable, so postings can be fed while later pages are still arriving.
+    ``result`` has the shape of JobDataAPI.analyze_market.
+
+    Aggregators are mergeable: ``merge`` adds another aggregator's counts,
+    and ``to_state``/``from_state`` round-trip the accumulators through a
+    JSON-able dict, so partial summaries can be stored and combined later.
+    Employers are counted with a HyperLogLog, so the state stays bounded.
+    ``recent`` counts postings at most RECENT_DAYS old as of each
+    aggregator's ``now``; merged summaries of stored days add up what was
+    recent on each of those days, not what is recent today.
+    """
+
+    def __init__(self, now=None):
+        self.now = now or datetime.now()
+        self.taxonomy = get_taxonomy()
+        self.total = 0
+        self.recent = 0
+        self.remote_urls = 0
+        self.employers = HyperLogLog()
+        # insertion order breaks ties between equally demanded skills
+        self.skills = {}
+        self.salary_count = 0
+        self.salary_sum = 0.0
+        self.salary_min = None
+        self.salary_max = None
+        # annualized salaries per currency, for quantiles
+        self.salary_sketches = {}
+        self.employment_types = dict.fromkeys([name for name, _ in EMPLOYMENT_TYPES] + ["Other"], 0)
+        self.work_location = {"remote": 0, "hybrid": 0, "onsite": 0}
+        # postings of one search share a handful of posting dates and types
+        self._recent_days = {}
+        self._buckets = {}
+
+    def add(self, job: dict):
+        self.total += 1
+        description = (job.get("job_description") or "").lower()
+        has_remote_url = bool(job.get("remote_jobs_url"))
+
+        if self._is_recent(job.get("job_posted_at_datetime_utc")):
+            self.recent += 1
+        if has_remote_url:
+            self.remote_urls += 1
+        self.employers.add(job.get("employer_name", ""))
+
+        for skill in sorted(self.taxonomy.find(description)):
+            self.skills[skill] = self.skills.get(skill, 0) + 1
+
+        salary = self._salary(job.get("job_min_salary"), job.get("job_max_salary"))
+        if salary is not None:
+            self.salary_count += 1
+            self.salary_sum += salary
+            self.salary_min = salary if self.salary_min is None else min(self.salary_min, salary)
+            self.salary_max = salary if self.salary_max is None else max(self.salary_max, salary)
+            currency = (job.get("job_salary_currency") or DEFAULT_CURRENCY).upper()
+            sketch = self.salary_sketches.get(currency)
+            if sketch is None:
+                sketch = self.salary_sketches[currency] = KLLSketch()
+            sketch.update(annualize(salary, job.get("job_salary_period")))
+
+        job_type = job.get("job_employment_type") or ""
+        bucket = self._buckets.get(job_type)
+        if bucket is None:
+            bucket = self._buckets[job_type] = employment_bucket(job_type.upper())
+        self.employment_types[bucket] += 1
+        if has_remote_url or "remote" in description:
+            self.work_location["remote"] += 1
+        elif "hybrid" in description:
+            self.work_location["hybrid"] += 1
+        else:
+            self.work_location["onsite"] += 1
+
+    def update(self, jobs):
+        for job in jobs:
+            self.add(job)
+        return self
+
+    def merge(self, other: "MarketAggregator"):
+        self.total += other.total
+        self.recent += other.recent
+        self.remote_urls += other.remote_urls
+        self.employers.merge(other.employers)
+        for skill, count in other.skills.items():
+            self.skills[skill] = self.skills.get(skill, 0) + count
+        if other.salary_count:
+            self.salary_count += other.salary_count
+            self.salary_sum += other.salary_sum
+            self.salary_min = other.salary_min if self.salary_min is None else min(self.salary_min, other.salary_min)
+            self.salary_max = other.salary_max if self.salary_max is None else max(self.salary_max, other.salary_max)
+        for currency, sketch in other.salary_sketches.items():
+            if currency in self.salary_sketches:
+                self.salary_sketches[currency].merge(sketch)
+            else:
+                self.salary_sketches[currency] = KLLSketch.from_state(sketch.to_state())
+        for counts, other_counts in ((self.employment_types, other.employment_types),
+                                     (self.work_location, other.work_location)):
+            for key, count in other_counts.items():
+                counts[key] = counts.get(key, 0) + count
+        return self
+
+    def to_state(self) -> dict:
+        return {
+            "total": self.total,
+            "recent": self.recent,
+            "remote_urls": self.remote_urls,
+            "employers": self.employers.to_state(),
+            "skills": self.skills,
+            "salary": [self.salary_count, self.salary_sum, self.salary_min, self.salary_max],
+            "salary_sketches": {currency: sketch.to_state() for currency, sketch in self.salary_sketches.items()},
+            "employment_types": self.employment_types,
+            "work_location": self.work_location
+        }
+
+    @classmethod
+    def from_state(cls, state: dict, now=None) -> "MarketAggregator":
+        aggregator = cls(now)
+        aggregator.total = state["total"]
+        aggregator.recent = state["recent"]
+        aggregator.remote_urls = state["remote_urls"]
+        if isinstance(state["employers"], list):
+            # summaries stored before the sketch listed the names
+            for name in state["employers"]:
+                aggregator.employers.add(name)
+        else:
+            aggregator.employers = HyperLogLog.from_state(state["employers"])
+        aggregator.skills = dict(state["skills"])
+        aggregator.salary_count, aggregator.salary_sum, aggregator.salary_min, aggregator.salary_max = state["salary"]
+        # summaries stored before quantiles were tracked have no sketches
+        aggregator.salary_sketches = {
+            currency: KLLSketch.from_state(sketch) for currency, sketch in state.get("salary_sketches", {}).items()
+        }
+        aggregator.employment_types.update(state["employment_types"])
+        aggregator.work_location.update(state["work_location"])
+        return aggregator
+
+    @staticmethod
+    def _salary(low, high):
+        # midpoint when both bounds are given, otherwise whichever one is
+        if high and low:
+            return (float(high) + float(low)) / 2
+        if high:
+            return float(high)
+        if low:
+            return float(low)
+        return None
+
+    def _is_recent(self, date_str) -> bool:
+        if not date_str:
+            return False
+        try:
+            day = date_str[:10]
+        except TypeError:
+            return False
+        recent = self._recent_days.get(day)
+        if recent is None:
+            try:
+                recent = (self.now - datetime.strptime(day, "%Y-%m-%d")).days <= RECENT_DAYS
+            except ValueError:
+                recent = False
+            self._recent_days[day] = recent
+        return recent
+
+    def result(self) -> dict:
+        if not self.total:
+            return default_analysis()
+        top_skills = sorted(self.skills.items(), key=lambda x: x[1], reverse=True)[:TOP_SKILLS]
+        if self.salary_count:
+            salary_insights = {
+                "average": self.salary_sum / self.salary_count,
+                "range": {"min": self.salary_min, "max": self.salary_max}
+            }
+        else:
+            salary_insights = {"average": 0, "range": {"min": 0, "max": 0}}
+        # quantiles are of yearly figures, per currency
+        salary_insights.update(salary_summary(self.salary_sketches))
+        return {
+            "market_overview": {
+                "total_jobs": self.total,
+                "recent_jobs": self.recent,
+                "remote_jobs": self.remote_urls,
+                "hiring_companies": self.employers.count()
+            },
+            "skills_demand": dict(top_skills),
+            "salary_insights": salary_insights,
+            "job_types": {
+                "employment_types": {k: v for k, v in self.employment_types.items() if v > 0},
+                "work_location": {k: v for k, v in self.work_location.items() if v > 0},
+                "total_jobs": self.total,
+                "analysis_date": datetime.now().strftime("%Y-%m-%d")
+            }
+        }
@@ -0,0 +1,152 @@
+import json
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from dashboard_module.market_aggregator import MarketAggregator
+from dashboard_module.postings_store import query_slug
+from storage_module.batch_writer import get_batch_writer
+from storage_module.database import DB_PATH, get_connection
+
+logger = logging.getLogger(__name__)
+
+# a posting counts once, on the day it is first seen; ids older than this are
+# forgotten, so a posting still listed after that long is counted again
+SEEN_RETENTION_DAYS = int(os.getenv("SMARTHIRE_MARKET_SEEN_DAYS", "90"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS market_summaries (
+    search TEXT NOT NULL,
+    day TEXT NOT NULL,
+    query TEXT NOT NULL,
+    location TEXT NOT NULL,
+    state TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (search, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS market_seen_jobs (
+    search TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    PRIMARY KEY (search, job_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_market_seen_day ON market_seen_jobs(day);
+"""
+
+
+class MarketHistory:
+    """
+    Daily market summaries per search. Each day's row holds the mergeable
+    MarketAggregator state of the postings first seen that day; fetched
+    pages are merged into it incrementally, and any date range is answered
+    by merging the stored days instead of reprocessing postings.
+    """
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self._schema_ready = False
+        self._lock = threading.Lock()
+        self._pruned_on = None
+
+    @property
+    def conn(self):
+        conn = get_connection(self.path)
+        if not self._schema_ready:
+            with self._lock:
+                if not self._schema_ready:
+                    conn.executescript(SCHEMA)
+                    self._schema_ready = True
+        return conn
+
+    def merge_postings(self, conn, postings, query, location, seen_at=None) -> int:
+        """
+        Merges the postings not seen before into the summary of the day they
+        were fetched, within the caller's transaction. Returns how many were new.
+        """
+        seen_at = seen_at or datetime.now()
+        search, day = query_slug(query, location), seen_at.strftime("%Y-%m-%d")
+        aggregator = MarketAggregator(seen_at)
+        for job in postings:
+            job_id = job.get("job_id")
+            if job_id:
+                # the insert takes the write lock before the summary is read
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO market_seen_jobs (search, job_id, day) VALUES (?, ?, ?)",
+                    (search, job_id, day)
+                )
+                if cursor.rowcount == 0:
+                    continue
+            aggregator.add(job)
+        if not aggregator.total:
+            return 0
+
+        row = conn.execute(
+            "SELECT state FROM market_summaries WHERE search = ? AND day = ?", (search, day)
+        ).fetchone()
+        if row is not None:
+            aggregator.merge(MarketAggregator.from_state(json.loads(row[0])))
+        conn.execute(
+            "INSERT INTO market_summaries (search, day, query, location, state, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (search, day) DO UPDATE SET "
+            "state = excluded.state, updated_at = excluded.updated_at",
+            (search, day, query or "", location or "", json.dumps(aggregator.to_state()), time.time())
+        )
+        return aggregator.total
+
+    def record(self, postings, query, location) -> bool:
+        """Queues fetched postings to be merged in by the write-behind writer."""
+        self.conn  # make sure the tables exist before the writer merges
+        postings, seen_at = list(postings), datetime.now()
+        writer = get_batch_writer(self.path)
+        if self._pruned_on != seen_at.date():
+            self._pruned_on = seen_at.date()
+            cutoff = (seen_at.date() - timedelta(days=SEEN_RETENTION_DAYS)).isoformat()
+            writer.submit("DELETE FROM market_seen_jobs WHERE day < ?", (cutoff,))
+
+        def write(conn):
+            self.merge_postings(conn, postings, query, location, seen_at)
+
+        return writer.submit(write)
+
+    def days(self, query, location, start: date, end: date) -> list:
+        """[(day, MarketAggregator)] for the stored days between ``start`` and ``end`` (inclusive)."""
+        rows = self.conn.execute(
+            "SELECT day, state FROM market_summaries WHERE search = ? AND day BETWEEN ? AND ? ORDER BY day",
+            (query_slug(query, location), start.isoformat(), end.isoformat())
+        ).fetchall()
+        return [(date.fromisoformat(day), MarketAggregator.from_state(json.loads(state))) for day, state in rows]
+
+    def summary(self, query, location, start: date, end: date) -> MarketAggregator:
+        """
+        Merged summary of the postings first seen between ``start`` and ``end``.
+        Its ``recent`` counts postings that were recent on the day they were
+        first seen, not as of ``end``.
+        """
+        merged = MarketAggregator()
+        for _, aggregator in self.days(query, location, start, end):
+            merged.merge(aggregator)
+        return merged
+
+    def weekly(self, query, location, weeks: int = 12, today: date = None) -> list:
+        """[(week start, MarketAggregator)] for the last ``weeks`` weeks (Monday-based), oldest first."""
+        today = today or date.today()
+        first = today - timedelta(days=today.weekday(), weeks=weeks - 1)
+        buckets = {first + timedelta(weeks=i): MarketAggregator() for i in range(weeks)}
+        for day, aggregator in self.days(query, location, first, today):
+            buckets[day - timedelta(days=day.weekday())].merge(aggregator)
+        return list(buckets.items())
+
+
+_history = None
+_history_lock = threading.Lock()
+
+
+def get_market_history() -> MarketHistory:
+    global _history
+    if _history is None:
+        with _history_lock:
+            if _history is None:
+                _history = MarketHistory()
+    return _history
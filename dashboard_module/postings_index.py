@@ -0,0 +1,188 @@
+import glob
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+import numpy as np
+import scipy.sparse as sp
+
+from ai_modules.ats_scoring import term_ids_from_tokens
+from ai_modules.document import ParsedResume
+from ai_modules.text_cache import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Hashed term ids are folded into this many columns; collisions only blur
+# ranking slightly and keep the idf vector small
+N_BUCKETS = 1 << 20
+INDEX_DIR = os.getenv("SMARTHIRE_POSTINGS_INDEX_DIR", os.path.join(CACHE_DIR, "postings_index"))
+# metadata kept per posting; the description itself is only indexed
+POSTING_FIELDS = (
+    "job_id", "job_title", "employer_name", "job_city", "job_state", "job_country",
+    "job_employment_type", "job_apply_link", "job_posted_at_datetime_utc"
+)
+
+
+def _posting_text(posting: dict) -> str:
+    return f"{posting.get('job_title') or ''}\n{posting.get('job_description') or ''}"
+
+
+def _term_counts(text):
+    """(bucket ids, sublinear tf) for one document."""
+    tokens = text.tokens if isinstance(text, ParsedResume) else ParsedResume(text).tokens
+    buckets, counts = np.unique(term_ids_from_tokens(tokens) % N_BUCKETS, return_counts=True)
+    return buckets.astype(np.int32), (1.0 + np.log(counts)).astype(np.float32)
+
+
+class PostingsIndex:
+    """
+    Local TF-IDF index of fetched job postings for resume-to-job matching.
+
+    Postings are stored as sublinear term-frequency rows of sparse matrix
+    segments; document frequencies are updated in place. Each add appends a
+    segment and merges it into the previous one while that is no more than
+    twice its size, so there are O(log n) segments and every row is copied
+    O(log n) times overall. IDF weighting is applied at query time, so a
+    search is one sparse matrix-vector product per segment plus a heap-based
+    top-k. Each added chunk is also written to disk as its own uniquely named
+    file, so saving never rewrites the index and server processes sharing the
+    directory never overwrite each other's chunks.
+    """
+
+    def __init__(self, directory: str = INDEX_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._chunks = []
+        self._postings = []
+        self._job_ids = set()
+        self._df = np.zeros(N_BUCKETS, dtype=np.int64)
+        self._norms = None
+        self._load()
+
+    def __len__(self):
+        return len(self._postings)
+
+    def add(self, postings) -> int:
+        """Indexes postings not seen before (by ``job_id``); returns how many were added."""
+        rows, metadata = [], []
+        with self._lock:
+            for posting in postings:
+                job_id = posting.get("job_id")
+                if not job_id or job_id in self._job_ids:
+                    continue
+                self._job_ids.add(job_id)
+                rows.append(_term_counts(_posting_text(posting)))
+                metadata.append({field: posting.get(field) for field in POSTING_FIELDS})
+            if not rows:
+                return 0
+
+            indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+            np.cumsum([len(b) for b, _ in rows], out=indptr[1:])
+            chunk = sp.csr_matrix(
+                (np.concatenate([w for _, w in rows]), np.concatenate([b for b, _ in rows]), indptr),
+                shape=(len(rows), N_BUCKETS)
+            )
+            self._append(chunk, metadata)
+            self._save_chunk(chunk, metadata)
+        return len(rows)
+
+    def search(self, text, top_k: int = 10) -> list:
+        """
+        Best-matching postings for ``text`` (or a ParsedResume) by cosine
+        similarity of idf-weighted vectors, as posting dicts with a ``score``.
+        """
+        if not self._postings:
+            return []
+        buckets, tf = _term_counts(text)
+        with self._lock:
+            segments, norms, idf = self._prepared()
+        query = np.zeros(N_BUCKETS, dtype=np.float32)
+        query[buckets] = tf * idf[buckets] ** 2
+        query_norm = np.sqrt(np.sum((tf * idf[buckets]) ** 2))
+        if query_norm == 0:
+            return []
+
+        scores = np.concatenate([segment @ query for segment in segments])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(norms > 0, scores / (norms * query_norm), 0.0)
+        candidates = np.flatnonzero(scores)
+        best = heapq.nlargest(top_k, candidates, key=scores.__getitem__)
+        return [dict(self._postings[i], score=round(float(scores[i]) * 100.0, 1)) for i in best]
+
+    def get_stats(self) -> dict:
+        return {
+            "postings": len(self._postings),
+            "chunks": len(self._chunks),
+            "nonzeros": sum(chunk.nnz for chunk in self._chunks)
+        }
+
+    def _append(self, chunk, metadata):
+        self._chunks.append(chunk)
+        while len(self._chunks) > 1 and self._chunks[-2].shape[0] <= 2 * self._chunks[-1].shape[0]:
+            last = self._chunks.pop()
+            self._chunks[-1] = sp.vstack([self._chunks[-1], last], format="csr")
+        self._postings.extend(metadata)
+        self._job_ids.update(p.get("job_id") for p in metadata)
+        self._df += np.bincount(chunk.indices, minlength=N_BUCKETS)
+        self._norms = None
+
+    def _prepared(self):
+        """Segments, idf-weighted row norms and idf; norms are recomputed after adds."""
+        n_docs = len(self._postings)
+        idf = (np.log((1.0 + n_docs) / (1.0 + self._df)) + 1.0).astype(np.float32)
+        if self._norms is None:
+            # idf changes with every add, so every row's norm does too
+            weights = idf ** 2
+            self._norms = np.concatenate([np.sqrt(segment.power(2) @ weights) for segment in self._chunks])
+        return list(self._chunks), self._norms, idf
+
+    def _save_chunk(self, chunk, metadata):
+        if not self.directory:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # time-ordered and unique across processes
+            name = os.path.join(self.directory, f"chunk-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}")
+            # metadata first: loading starts from the .npz, which must have its .json
+            with open(name + ".json", "w", encoding="utf-8") as f:
+                json.dump(metadata, f)
+            sp.save_npz(name + ".npz", chunk)
+        except OSError:
+            logger.exception("Could not persist postings index chunk")
+
+    def _load(self):
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+        for path in sorted(glob.glob(os.path.join(self.directory, "chunk-*.npz"))):
+            try:
+                chunk = sp.load_npz(path).tocsr()
+                with open(path[:-4] + ".json", encoding="utf-8") as f:
+                    metadata = json.load(f)
+            except (OSError, ValueError):
+                logger.warning("Skipping unreadable postings index chunk %s", path)
+                continue
+            # processes sharing the directory may each have indexed a posting
+            keep = [i for i, p in enumerate(metadata) if p.get("job_id") not in self._job_ids]
+            if len(keep) < len(metadata):
+                chunk, metadata = chunk[keep], [metadata[i] for i in keep]
+            if metadata:
+                self._append(chunk, metadata)
+        if self._postings:
+            logger.info("Loaded %d indexed job postings", len(self._postings))
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_postings_index() -> PostingsIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = PostingsIndex()
+    return _index
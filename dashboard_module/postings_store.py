@@ -0,0 +1,323 @@
+import logging
+import os
+import re
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from ai_modules.skill_taxonomy import get_taxonomy
+from dashboard_module.market_aggregator import EMPLOYMENT_TYPES, RECENT_DAYS, TOP_SKILLS, default_analysis, employment_bucket
+from dashboard_module.salary_sketch import DEFAULT_CURRENCY, PERIODS_PER_YEAR, QUANTILES, salary_summary
+from storage_module.database import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+STORE_DIR = os.getenv("SMARTHIRE_POSTINGS_STORE_DIR", os.path.join(DATA_DIR, "postings"))
+# a partition is merged into one file once an append leaves it with more files than this
+COMPACT_AFTER_FILES = int(os.getenv("SMARTHIRE_POSTINGS_COMPACT_FILES", "8"))
+# a load retries this many times when compaction removes a file it was reading
+LOAD_ATTEMPTS = 3
+# columns analyze_frame reads
+ANALYSIS_COLUMNS = [
+    "employer_name", "employment_type", "has_remote_url", "mentions_remote", "mentions_hybrid",
+    "posted_at", "min_salary", "max_salary", "salary_currency", "salary_period", "skills"
+]
+
+SCHEMA = pa.schema([
+    ("job_id", pa.string()),
+    ("fetched_at", pa.timestamp("s")),
+    ("location", pa.string()),
+    ("employer_name", pa.string()),
+    ("job_title", pa.string()),
+    ("employment_type", pa.string()),
+    ("has_remote_url", pa.bool_()),
+    ("mentions_remote", pa.bool_()),
+    ("mentions_hybrid", pa.bool_()),
+    ("posted_at", pa.timestamp("s")),
+    ("min_salary", pa.float64()),
+    ("max_salary", pa.float64()),
+    ("salary_currency", pa.string()),
+    ("salary_period", pa.string()),
+    ("skills", pa.list_(pa.string())),
+    # partition columns
+    ("fetch_date", pa.string()),
+    ("query", pa.string())
+])
+PARTITIONING = ds.partitioning(pa.schema([("fetch_date", pa.string()), ("query", pa.string())]), flavor="hive")
+
+
+def query_slug(query: str, location: str) -> str:
+    """Partition value for a search: lower-case words joined by dashes."""
+    return re.sub(r"[^a-z0-9]+", "-", f"{query or ''} {location or ''}".lower()).strip("-")
+
+
+def _float(value):
+    try:
+        return float(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _timestamp(value):
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value[:19], "%Y-%m-%dT%H:%M:%S")
+    except ValueError:
+        try:
+            return datetime.strptime(value[:10], "%Y-%m-%d")
+        except ValueError:
+            return None
+
+
+def normalize_postings(postings, query, location, fetched_at=None) -> pa.Table:
+    """
+    Raw JSearch postings as a typed Arrow table. Descriptions are scanned
+    once here (skills, remote/hybrid mentions) and not stored.
+    """
+    fetched_at = (fetched_at or datetime.now()).replace(microsecond=0)
+    taxonomy = get_taxonomy()
+    rows = {name: [] for name in SCHEMA.names}
+    for job in postings:
+        description = (job.get("job_description") or "").lower()
+        rows["job_id"].append(job.get("job_id"))
+        rows["fetched_at"].append(fetched_at)
+        rows["location"].append(location or "")
+        rows["employer_name"].append(job.get("employer_name", ""))
+        rows["job_title"].append(job.get("job_title") or "")
+        rows["employment_type"].append((job.get("job_employment_type") or "").upper())
+        rows["has_remote_url"].append(bool(job.get("remote_jobs_url")))
+        rows["mentions_remote"].append("remote" in description)
+        rows["mentions_hybrid"].append("hybrid" in description)
+        rows["posted_at"].append(_timestamp(job.get("job_posted_at_datetime_utc")))
+        rows["min_salary"].append(_float(job.get("job_min_salary")))
+        rows["max_salary"].append(_float(job.get("job_max_salary")))
+        rows["salary_currency"].append(job.get("job_salary_currency"))
+        rows["salary_period"].append(job.get("job_salary_period"))
+        rows["skills"].append(sorted(taxonomy.find(description)))
+        rows["fetch_date"].append(fetched_at.strftime("%Y-%m-%d"))
+        rows["query"].append(query_slug(query, location))
+    return pa.Table.from_pydict(rows, schema=SCHEMA)
+
+
+class PostingsStore:
+    """
+    Fetched postings accumulated as a Parquet dataset partitioned by fetch
+    date and query. Each append writes a new file; once a partition holds
+    more than COMPACT_AFTER_FILES files they are merged into one, so reads
+    stay cheap. Market analytics run as column operations over the selected
+    partitions.
+    """
+
+    def __init__(self, directory: str = STORE_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def append(self, postings, query, location, fetched_at=None) -> int:
+        table = normalize_postings(postings, query, location, fetched_at)
+        if table.num_rows == 0:
+            return 0
+        # every row of one append shares its fetch date and query
+        fetch_date, slug = table["fetch_date"][0].as_py(), table["query"][0].as_py()
+        partition = os.path.join(self.directory, f"fetch_date={fetch_date}", f"query={slug}")
+        with self._lock:
+            os.makedirs(partition, exist_ok=True)
+            self._write_part(partition, table.drop_columns(PARTITIONING.schema.names))
+            parts = self._parts(partition)
+            if len(parts) > COMPACT_AFTER_FILES:
+                self._compact_partition(partition, parts)
+        return table.num_rows
+
+    def load(self, query=None, location=None, start=None, end=None, columns=None) -> pd.DataFrame:
+        """
+        Postings for one search (or all) fetched between ``start`` and ``end``
+        (dates, inclusive), de-duplicated by job id keeping the latest fetch.
+        With ``columns``, only those columns are returned.
+        """
+        if not os.path.isdir(self.directory):
+            return normalize_postings([], query, location).to_pandas()
+        condition = None
+        if query is not None:
+            condition = ds.field("query") == query_slug(query, location)
+        if start is not None:
+            clause = ds.field("fetch_date") >= start.strftime("%Y-%m-%d")
+            condition = clause if condition is None else condition & clause
+        if end is not None:
+            clause = ds.field("fetch_date") <= end.strftime("%Y-%m-%d")
+            condition = clause if condition is None else condition & clause
+        read = None if columns is None else list(dict.fromkeys(list(columns) + ["job_id", "fetched_at"]))
+        for attempt in range(LOAD_ATTEMPTS):
+            # files are listed afresh each attempt; compaction writes the merged
+            # file before removing the parts, so a retry finds every row
+            dataset = ds.dataset(self.directory, schema=SCHEMA, format="parquet", partitioning=PARTITIONING)
+            try:
+                table = dataset.to_table(columns=read, filter=condition)
+                break
+            except FileNotFoundError:
+                if attempt == LOAD_ATTEMPTS - 1:
+                    raise
+                logger.debug("Postings file compacted away during load, retrying")
+        table = _latest_per_job(table)
+        if columns is not None:
+            # job ids are all distinct strings, which are slow to convert
+            table = table.select(list(columns))
+        return table.to_pandas()
+
+    def analyze(self, query=None, location=None, days: int = 30, now=None) -> dict:
+        """Market analysis over stored postings, shaped like JobDataAPI.analyze_market."""
+        now = now or datetime.now()
+        frame = self.load(
+            query, location, start=(now - timedelta(days=days - 1)).date(), end=now.date(), columns=ANALYSIS_COLUMNS
+        )
+        return analyze_frame(frame, now)
+
+    def compact(self):
+        """Rewrites every partition with more than one file as a single file."""
+        if not os.path.isdir(self.directory):
+            return
+        with self._lock:
+            for root, _, _ in os.walk(self.directory):
+                parts = self._parts(root)
+                if len(parts) > 1:
+                    self._compact_partition(root, parts)
+
+    @staticmethod
+    def _parts(partition) -> list:
+        if not os.path.isdir(partition):
+            return []
+        return sorted(f for f in os.listdir(partition) if f.endswith(".parquet"))
+
+    @staticmethod
+    def _write_part(partition, table):
+        # written under a temporary name first, so readers never see a partial
+        # file; dataset discovery skips names starting with "."
+        name = f"part-{uuid.uuid4().hex}-0.parquet"
+        temporary = os.path.join(partition, f".{name}.tmp")
+        pq.write_table(table, temporary)
+        os.replace(temporary, os.path.join(partition, name))
+
+    @staticmethod
+    def _compact_partition(partition, parts):
+        table = pa.concat_tables([pq.read_table(os.path.join(partition, f), schema=None) for f in parts])
+        PostingsStore._write_part(partition, table)
+        for f in parts:
+            os.remove(os.path.join(partition, f))
+
+
+def analyze_frame(frame: pd.DataFrame, now=None) -> dict:
+    """Vectorized equivalent of MarketAggregator over a postings frame."""
+    now = now or datetime.now()
+    total = len(frame)
+    if total == 0:
+        return default_analysis()
+
+    # posted within the last RECENT_DAYS whole days, compared by calendar date
+    posted_day = frame["posted_at"].dt.normalize()
+    recent = ((pd.Timestamp(now) - posted_day).dt.days <= RECENT_DAYS).sum()
+
+    # factorize numbers skills in order of first appearance, so a stable sort
+    # by count keeps ties in first-seen order, as the dict-based count does
+    lists = frame["skills"].to_numpy()
+    flat = np.concatenate(lists) if len(lists) else np.array([], dtype=object)
+    codes, names = pd.factorize(flat)
+    counts = np.bincount(codes, minlength=len(names))
+    top = np.argsort(-counts, kind="stable")[:TOP_SKILLS]
+    top_skills = {names[i]: int(counts[i]) for i in top}
+
+    # a zero bound counts as missing, as in MarketAggregator
+    low, high = frame["min_salary"].replace(0, np.nan), frame["max_salary"].replace(0, np.nan)
+    salary = ((low + high) / 2).where(low.notna() & high.notna(), high.fillna(low)).dropna()
+    salary_insights = {
+        "average": float(salary.mean()),
+        "range": {"min": float(salary.min()), "max": float(salary.max())}
+    } if len(salary) else {"average": 0, "range": {"min": 0, "max": 0}}
+    salary_insights.update(_salary_quantiles(frame.loc[salary.index], salary))
+
+    type_counts = _map_distinct(frame["employment_type"].fillna(""), employment_bucket).value_counts()
+    employment_types = {
+        name: int(type_counts[name])
+        for name in [n for n, _ in EMPLOYMENT_TYPES] + ["Other"] if type_counts.get(name, 0) > 0
+    }
+
+    remote = frame["mentions_remote"] | frame["has_remote_url"]
+    hybrid = ~remote & frame["mentions_hybrid"]
+    work_location = {
+        "remote": int(remote.sum()),
+        "hybrid": int(hybrid.sum()),
+        "onsite": int(total - remote.sum() - hybrid.sum())
+    }
+
+    return {
+        "market_overview": {
+            "total_jobs": total,
+            "recent_jobs": int(recent),
+            "remote_jobs": int(frame["has_remote_url"].sum()),
+            "hiring_companies": int(frame["employer_name"].nunique(dropna=False))
+        },
+        "skills_demand": top_skills,
+        "salary_insights": salary_insights,
+        "job_types": {
+            "employment_types": employment_types,
+            "work_location": {k: v for k, v in work_location.items() if v > 0},
+            "total_jobs": total,
+            "analysis_date": now.strftime("%Y-%m-%d")
+        }
+    }
+
+
+def _latest_per_job(table: pa.Table) -> pa.Table:
+    """Rows of ``table`` de-duplicated by job id, keeping the latest fetch."""
+    if table.num_rows == 0:
+        return table
+    job_ids = pc.dictionary_encode(table["job_id"].combine_chunks()).indices.to_numpy(zero_copy_only=False)
+    order = np.argsort(table["fetched_at"].to_numpy(), kind="stable")
+    # the last row of each job in fetch order is the first one in the reversed order
+    _, first = np.unique(job_ids[order][::-1], return_index=True)
+    # kept rows stay in fetch order, so skill ties break in first-fetched order
+    return table.take(order[np.sort(len(order) - 1 - first)])
+
+
+def _map_distinct(series: pd.Series, fn) -> pd.Series:
+    """``series.map(fn)``, calling ``fn`` once per distinct value (None included)."""
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    mapped = np.array([fn(None if pd.isna(value) else value) for value in uniques], dtype=object)
+    return pd.Series(mapped[codes], index=series.index)
+
+
+def _salary_quantiles(frame: pd.DataFrame, salary: pd.Series) -> dict:
+    """Exact counterpart of salary_summary: quantiles and mean of yearly salaries per currency."""
+    if not len(salary):
+        return salary_summary({})
+    periods = _map_distinct(frame["salary_period"], lambda period: PERIODS_PER_YEAR.get((period or "YEAR").upper(), 1))
+    annual = (salary * periods.astype(float)).to_numpy()
+    # currencies numbered in order of first appearance; most postings first, ties by that order
+    codes, names = pd.factorize(_map_distinct(frame["salary_currency"], lambda c: (c or DEFAULT_CURRENCY).upper()))
+    counts = np.bincount(codes, minlength=len(names))
+    by_currency = {}
+    for i in np.argsort(-counts, kind="stable"):
+        values = annual[codes == i]
+        quantiles = np.quantile(values, list(QUANTILES.values()), method="inverted_cdf")
+        by_currency[names[i]] = dict(zip(QUANTILES, map(float, quantiles)), mean=float(values.mean()),
+                                     count=int(counts[i]))
+    top = next(iter(by_currency))
+    return dict({q: by_currency[top][q] for q in [*QUANTILES, "mean"]}, currency=top, by_currency=by_currency)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_postings_store() -> PostingsStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = PostingsStore()
+    return _store
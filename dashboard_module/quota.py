@@ -0,0 +1,172 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from dashboard_module.http_client import JobDataError
+from storage_module.database import DB_PATH, get_connection
+
+logger = logging.getLogger(__name__)
+
+RATE_PER_MINUTE = int(os.getenv("JSEARCH_RATE_PER_MINUTE", "10"))
+MONTHLY_QUOTA = int(os.getenv("JSEARCH_MONTHLY_QUOTA", "200"))
+# share of each budget background traffic may use; the rest is kept for users
+BACKGROUND_MINUTE_SHARE = 0.5
+BACKGROUND_MONTHLY_SHARE = 0.8
+INTERACTIVE_WAIT = float(os.getenv("JSEARCH_QUOTA_WAIT", "5"))
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS api_quota (
+    month TEXT PRIMARY KEY,
+    used INTEGER NOT NULL
+);
+"""
+
+
+class QuotaExceeded(JobDataError):
+    """The API budget does not allow another request right now."""
+
+
+class SingleFlight:
+    """Concurrent calls with the same key share one execution of ``fn``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.shared = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {"done": threading.Event(), "result": None, "error": None}
+            else:
+                self.shared += 1
+        if not leader:
+            call["done"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"]
+
+        try:
+            call["result"] = fn()
+            return call["result"]
+        except BaseException as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call["done"].set()
+
+
+class QuotaManager:
+    """
+    Budget for the RapidAPI key: a per-minute token bucket (per process)
+    and a monthly request count shared by all processes through SQLite.
+    Interactive requests wait up to INTERACTIVE_WAIT for a token; background
+    requests never wait, may only use part of either budget, and yield to
+    any interactive request that is waiting.
+    """
+
+    def __init__(self, per_minute: int = RATE_PER_MINUTE, monthly: int = MONTHLY_QUOTA, path: str = DB_PATH):
+        self.per_minute = per_minute
+        self.monthly = monthly
+        self.path = path
+        self._tokens = float(per_minute)
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        self._interactive_waiting = 0
+        self._schema_ready = False
+        self._stats = {"granted": 0, "rejected_interactive": 0, "rejected_background": 0}
+
+    def _conn(self):
+        conn = get_connection(self.path)
+        if not self._schema_ready:
+            conn.executescript(SCHEMA)
+            self._schema_ready = True
+        return conn
+
+    @staticmethod
+    def _month():
+        return datetime.now(timezone.utc).strftime("%Y-%m")
+
+    def monthly_used(self) -> int:
+        row = self._conn().execute("SELECT used FROM api_quota WHERE month = ?", (self._month(),)).fetchone()
+        return row[0] if row else 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.per_minute, self._tokens + (now - self._updated) * self.per_minute / 60.0)
+        self._updated = now
+
+    def _take_monthly(self, limit) -> bool:
+        """Counts one request against the month if that stays within ``limit``."""
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT INTO api_quota (month, used) VALUES (?, 0) ON CONFLICT (month) DO NOTHING",
+                (self._month(),)
+            )
+            cursor = conn.execute(
+                "UPDATE api_quota SET used = used + 1 WHERE month = ? AND used < ?",
+                (self._month(), limit)
+            )
+        return cursor.rowcount == 1
+
+    def acquire(self, priority: str = INTERACTIVE, timeout: float = INTERACTIVE_WAIT):
+        """Takes one request from the budget or raises QuotaExceeded."""
+        background = priority == BACKGROUND
+        with self._cond:
+            self._refill()
+            if background:
+                reserve = self.per_minute * (1.0 - BACKGROUND_MINUTE_SHARE)
+                if self._interactive_waiting or self._tokens - 1 < reserve:
+                    self._reject(priority, "per-minute budget reserved for interactive use")
+            else:
+                deadline = time.monotonic() + timeout
+                self._interactive_waiting += 1
+                try:
+                    while self._tokens < 1:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._reject(priority, "per-minute rate limit reached")
+                        self._cond.wait(min(remaining, (1 - self._tokens) * 60.0 / self.per_minute))
+                        self._refill()
+                finally:
+                    self._interactive_waiting -= 1
+
+            limit = int(self.monthly * BACKGROUND_MONTHLY_SHARE) if background else self.monthly
+            if not self._take_monthly(limit):
+                self._reject(priority, "monthly quota used up")
+            self._tokens -= 1
+            self._stats["granted"] += 1
+
+    def _reject(self, priority, reason):
+        self._stats[f"rejected_{priority}"] += 1
+        raise QuotaExceeded(f"JSearch {reason}")
+
+    def get_stats(self) -> dict:
+        with self._cond:
+            self._refill()
+            stats = dict(self._stats, minute_tokens=round(self._tokens, 1), per_minute=self.per_minute)
+        stats["monthly_used"] = self.monthly_used()
+        stats["monthly_quota"] = self.monthly
+        return stats
+
+
+_quota = None
+_quota_lock = threading.Lock()
+
+
+def get_quota_manager() -> QuotaManager:
+    global _quota
+    if _quota is None:
+        with _quota_lock:
+            if _quota is None:
+                _quota = QuotaManager()
+    return _quota
@@ -0,0 +1,199 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+
+from ai_modules.text_cache import LRUCache
+from dashboard_module.quota import SingleFlight
+from storage_module.database import DB_PATH, get_connection
+
+logger = logging.getLogger(__name__)
+
+# served as is while younger than FRESH_SECONDS; served and refreshed in the
+# background until STALE_SECONDS; refetched synchronously after that
+FRESH_SECONDS = float(os.getenv("SMARTHIRE_JOBS_CACHE_TTL", "1800"))
+STALE_SECONDS = float(os.getenv("SMARTHIRE_JOBS_CACHE_STALE", str(24 * 3600)))
+# how long one process may hold the refresh lease for a key
+REFRESH_LEASE_SECONDS = 60
+MEMORY_ENTRIES = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS api_responses (
+    key TEXT PRIMARY KEY,
+    params TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    body BLOB NOT NULL,
+    refresh_until REAL
+);
+"""
+
+
+def cache_key(params: dict) -> str:
+    """Key of a request by its normalized parameters (case, whitespace, order)."""
+    normalized = {
+        str(k).lower(): " ".join(str(v).lower().split())
+        for k, v in params.items() if v is not None
+    }
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier cache of raw API responses with stale-while-revalidate: an
+    in-process LRU in front of a SQLite table shared by every server process.
+    A stale hit is returned at once and refreshed on a background thread;
+    a lease column ensures only one process refreshes a key at a time.
+    Concurrent misses for one key share a single fetch, and an expired
+    entry is still served if the fetch fails.
+    """
+
+    def __init__(self, path: str = DB_PATH, fresh_seconds: float = FRESH_SECONDS,
+                 stale_seconds: float = STALE_SECONDS):
+        self.path = path
+        self.fresh_seconds = fresh_seconds
+        self.stale_seconds = stale_seconds
+        self._memory = LRUCache(max_entries=MEMORY_ENTRIES)
+        self._schema_ready = False
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._flights = SingleFlight()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "refresh_errors": 0}
+
+    @property
+    def conn(self):
+        conn = get_connection(self.path)
+        if not self._schema_ready:
+            with self._lock:
+                if not self._schema_ready:
+                    conn.executescript(SCHEMA)
+                    self._schema_ready = True
+        return conn
+
+    def get_or_fetch(self, params: dict, fetch, max_age: float = None, refresh=None):
+        """
+        Cached response for ``params``, calling ``fetch()`` on a miss or once
+        the entry is too old to serve. Errors from a synchronous fetch propagate;
+        background refresh errors are logged and the stale entry kept.
+        An entry older than ``max_age`` seconds is refetched synchronously
+        instead of being served stale (used to refresh ahead of expiry).
+        ``refresh()`` replaces ``fetch()`` for background refreshes, e.g. to
+        bill them at a lower priority than the caller waiting on ``fetch``.
+        """
+        key = cache_key(params)
+        now = time.time()
+        fresh_seconds = self.fresh_seconds if max_age is None else min(max_age, self.fresh_seconds)
+
+        entry = self._memory.get(key)
+        if entry is not None and now - entry[0] < fresh_seconds:
+            self._count("memory_hits")
+            return entry[1]
+
+        entry = self._read(key)
+        if entry is not None:
+            age = now - entry[0]
+            if age < fresh_seconds:
+                self._memory.put(key, entry)
+                self._count("disk_hits")
+                return entry[1]
+            if max_age is None and age < self.stale_seconds:
+                self._count("stale_hits")
+                self._refresh_in_background(key, params, refresh or fetch)
+                return entry[1]
+
+        self._count("misses")
+        try:
+            # concurrent misses for the same request share one fetch
+            return self._flights.do(key, lambda: self._store(key, params, fetch()))
+        except Exception:
+            if entry is None:
+                raise
+            logger.warning("Fetch failed; serving an expired cached response")
+            return entry[1]
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["coalesced"] = self._flights.shared
+        stats["entries"] = self.conn.execute("SELECT COUNT(*) FROM api_responses").fetchone()[0]
+        return stats
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _read(self, key):
+        row = self.conn.execute("SELECT fetched_at, body FROM api_responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        try:
+            return row[0], json.loads(zlib.decompress(row[1]))
+        except (zlib.error, ValueError):
+            logger.warning("Discarding corrupt cached response %s", key)
+            return None
+
+    def _store(self, key, params, data):
+        fetched_at = time.time()
+        body = zlib.compress(json.dumps(data).encode("utf-8"))
+        with self.conn as conn:
+            conn.execute(
+                "INSERT INTO api_responses (key, params, fetched_at, body, refresh_until) VALUES (?, ?, ?, ?, NULL) "
+                "ON CONFLICT (key) DO UPDATE SET fetched_at = excluded.fetched_at, body = excluded.body, "
+                "refresh_until = NULL",
+                (key, json.dumps(params, sort_keys=True), fetched_at, body)
+            )
+        self._memory.put(key, (fetched_at, data))
+        return data
+
+    def _take_lease(self, key) -> bool:
+        now = time.time()
+        with self.conn as conn:
+            cursor = conn.execute(
+                "UPDATE api_responses SET refresh_until = ? "
+                "WHERE key = ? AND (refresh_until IS NULL OR refresh_until < ?)",
+                (now + REFRESH_LEASE_SECONDS, key, now)
+            )
+        return cursor.rowcount == 1
+
+    def _refresh_in_background(self, key, params, fetch):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        try:
+            if not self._take_lease(key):
+                with self._lock:
+                    self._refreshing.discard(key)
+                return
+        except Exception:
+            with self._lock:
+                self._refreshing.discard(key)
+            raise
+
+        def refresh():
+            try:
+                self._store(key, params, fetch())
+                self._count("refreshes")
+            except Exception:
+                logger.exception("Background refresh failed; serving stale data")
+                self._count("refresh_errors")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name="jobs-cache-refresh", daemon=True).start()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
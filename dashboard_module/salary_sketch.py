@@ -0,0 +1,168 @@
+import math
+
+# KLL accuracy parameter: rank error is roughly 1.7 / K (about 1% at 200)
+K = 200
+# how many items a compactor may hold relative to the one above it
+CAPACITY_DECAY = 2.0 / 3.0
+MIN_CAPACITY = 2
+
+DEFAULT_CURRENCY = "USD"
+# salaries are compared per year; JSearch's job_salary_period values
+PERIODS_PER_YEAR = {
+    "YEAR": 1,
+    "MONTH": 12,
+    "WEEK": 52,
+    "DAY": 260,
+    "HOUR": 2080
+}
+QUANTILES = {"p25": 0.25, "median": 0.5, "p75": 0.75, "p90": 0.9}
+
+
+def annualize(amount: float, period) -> float:
+    """Yearly equivalent of a salary quoted per ``period`` (unknown periods are taken as yearly)."""
+    return amount * PERIODS_PER_YEAR.get((period or "YEAR").upper(), 1)
+
+
+class KLLSketch:
+    """
+    KLL streaming quantile sketch. Values pass through a stack of compactors;
+    an item at level h stands for 2**h inputs. When the sketch outgrows its
+    budget the lowest full compactor is sorted and every other item promoted,
+    so memory stays O(K) items whatever the stream length. Sketches merge by
+    concatenating levels and compacting, so any slice of stored sketches can
+    be combined.
+
+    Deterministic: the kept half alternates per level instead of being random.
+    The exact sum is kept alongside for the mean.
+    """
+
+    def __init__(self, k: int = K):
+        self.k = k
+        self.n = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self.levels = []
+        self._offsets = []
+        self._size = 0
+        self._grow()
+
+    def __len__(self):
+        return self.n
+
+    def _grow(self):
+        """Adds a level on top; capacities shrink geometrically with depth below the top."""
+        self.levels.append([])
+        self._offsets.append(0)
+        height = len(self.levels)
+        self._capacities = [
+            max(MIN_CAPACITY, int(math.ceil(self.k * CAPACITY_DECAY ** (height - level - 1))))
+            for level in range(height)
+        ]
+        self._budget = sum(self._capacities)
+
+    def update(self, value: float):
+        value = float(value)
+        self.n += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.levels[0].append(value)
+        self._size += 1
+        if self._size > self._budget:
+            self._compress()
+
+    def merge(self, other: "KLLSketch"):
+        if not other.n:
+            return self
+        while len(self.levels) < len(other.levels):
+            self._grow()
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+            self._size += len(items)
+        self.n += other.n
+        # None once a sketch stored without its sum is merged in
+        self.sum = None if self.sum is None or other.sum is None else self.sum + other.sum
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _compress(self):
+        while self._size > self._budget:
+            # the lowest compactor at capacity; one exists while over budget
+            level = next(h for h, items in enumerate(self.levels) if len(items) >= self._capacities[h])
+            if level + 1 == len(self.levels):
+                self._grow()
+            items = sorted(self.levels[level])
+            # an odd item out stays behind at this level
+            keep = [items.pop()] if len(items) % 2 else []
+            offset = self._offsets[level]
+            self._offsets[level] ^= 1
+            promoted = items[offset::2]
+            self.levels[level + 1].extend(promoted)
+            self.levels[level] = keep
+            self._size -= len(items) - len(promoted)
+
+    def quantiles(self, qs) -> list:
+        """Values at ranks ``qs`` (0..1): the smallest value whose cumulative weight reaches q * n."""
+        if not self.n:
+            return [None for _ in qs]
+        weighted = sorted((value, 1 << level) for level, items in enumerate(self.levels) for value in items)
+        total = sum(weight for _, weight in weighted)
+        results = []
+        for q in qs:
+            if q <= 0:
+                results.append(self.min)
+                continue
+            if q >= 1:
+                results.append(self.max)
+                continue
+            target, cumulative = q * total, 0
+            for value, weight in weighted:
+                cumulative += weight
+                if cumulative >= target:
+                    results.append(value)
+                    break
+        return results
+
+    def quantile(self, q: float) -> float:
+        return self.quantiles([q])[0]
+
+    def mean(self):
+        return self.sum / self.n if self.n and self.sum is not None else None
+
+    def to_state(self) -> dict:
+        return {"k": self.k, "n": self.n, "sum": self.sum, "min": self.min, "max": self.max, "levels": self.levels}
+
+    @classmethod
+    def from_state(cls, state: dict) -> "KLLSketch":
+        sketch = cls(state["k"])
+        while len(sketch.levels) < len(state["levels"]):
+            sketch._grow()
+        for level, items in enumerate(state["levels"]):
+            sketch.levels[level].extend(items)
+            sketch._size += len(items)
+        sketch.n, sketch.min, sketch.max = state["n"], state["min"], state["max"]
+        sketch.sum = state.get("sum")
+        return sketch
+
+
+def salary_summary(sketches: dict) -> dict:
+    """
+    Quantiles and mean of annualized salaries per currency, plus the figures
+    of the currency with the most postings at the top level.
+    """
+    by_currency = {}
+    for currency, sketch in sorted(sketches.items(), key=lambda item: len(item[1]), reverse=True):
+        if not len(sketch):
+            continue
+        values = sketch.quantiles(QUANTILES.values())
+        by_currency[currency] = dict(zip(QUANTILES, values), mean=sketch.mean(), count=len(sketch))
+    if not by_currency:
+        return dict(dict.fromkeys(QUANTILES, 0), mean=0, currency=DEFAULT_CURRENCY, by_currency={})
+    currency = next(iter(by_currency))
+    top = {name: by_currency[currency][name] for name in [*QUANTILES, "mean"]}
+    return dict(top, currency=currency, by_currency=by_currency)
@@ -4,6 +4,20 @@ import plotly.express as px
 from datetime import datetime, timedelta
 import numpy as np
 import json
+import calendar
+import time
+
+from ai_modules.extraction_sandbox import get_sandbox_pool
+from ai_modules.nlp_model import model_stats
+from ai_modules.result_cache import get_analysis_cache
+from ai_modules.text_cache import get_text_cache
+from dashboard_module.cache_warmer import get_cache_warmer
+from dashboard_module.quota import get_quota_manager
+from dashboard_module.response_cache import get_response_cache
+from storage_module.batch_writer import get_batch_writer
+from storage_module.events import ROLLUP_INTERVAL, get_event_log
+from storage_module.search_index import get_search_index
+from storage_module.submissions import PAGE_SIZE, get_submission_store
 
 # Add to top of file with other exports
 __all__ = [
@@ -115,8 +129,62 @@ def show_admin_dashboard():
             st.markdown("🟢 API: Online")
             st.markdown("🟢 DB: Connected")
         with col2:
-            st.markdown("🟡 Cache: 82%")
-            st.markdown("🟢 Queue: Ready")
+            cache_stats = get_text_cache().get_stats()
+            st.markdown(f"🟢 Cache: {cache_stats['hit_rate']:.0%}")
+            sandbox_stats = get_sandbox_pool().get_stats()
+            queue_icon = "🟢" if sandbox_stats["queued"] == 0 else "🟡"
+            st.markdown(f"{queue_icon} Queue: {sandbox_stats['queued']}")
+
+        nlp_stats = model_stats()
+        if nlp_stats["loaded"]:
+            memory = nlp_stats["memory_bytes"]
+            memory_text = f", {memory / 1024 / 1024:.0f} MB" if memory else ""
+            st.caption(f"🧠 NLP model ({nlp_stats['source']}): {nlp_stats['load_seconds']}s{memory_text}")
+        else:
+            st.caption("🧠 NLP model: warming up")
+        st.caption(
+            f"📄 Text cache: {cache_stats['memory_hits']} memory / {cache_stats['disk_hits']} disk hits, "
+            f"{cache_stats['misses']} misses, {cache_stats['bytes_written'] / 1024:.0f} KB written"
+        )
+        kills = sandbox_stats["kills"]
+        st.caption(
+            f"🧰 Extraction workers: {sandbox_stats['running']}/{sandbox_stats['pool_size']} busy, "
+            f"{sandbox_stats['completed']} done, killed {kills['timeout']} timeout / {kills['cpu']} CPU / "
+            f"{kills['memory']} memory / {kills['crashed']} crashed"
+        )
+        analysis_stats = get_analysis_cache().get_stats()
+        st.caption(
+            f"📊 Analysis cache: {analysis_stats['hits']} hits, {analysis_stats['misses']} misses, "
+            f"{analysis_stats['entries']} entries"
+        )
+        jobs_cache_stats = get_response_cache().get_stats()
+        st.caption(
+            f"🌐 Job API cache: {jobs_cache_stats['memory_hits'] + jobs_cache_stats['disk_hits']} fresh / "
+            f"{jobs_cache_stats['stale_hits']} stale hits, {jobs_cache_stats['misses']} misses, "
+            f"{jobs_cache_stats['entries']} entries, {jobs_cache_stats['coalesced']} coalesced"
+        )
+        quota_stats = get_quota_manager().get_stats()
+        st.progress(
+            min(1.0, quota_stats['monthly_used'] / quota_stats['monthly_quota']) if quota_stats['monthly_quota'] else 0.0,
+            text=f"🔑 JSearch quota: {quota_stats['monthly_used']}/{quota_stats['monthly_quota']} this month"
+        )
+        st.caption(
+            f"⏱️ {quota_stats['minute_tokens']}/{quota_stats['per_minute']} requests available this minute, "
+            f"rejected {quota_stats['rejected_interactive']} interactive / {quota_stats['rejected_background']} background"
+        )
+        warm_stats = get_cache_warmer().get_stats()
+        st.caption(
+            f"♨️ Cache warmer{'' if warm_stats['running'] else ' (stopped)'}: {warm_stats['searches']} searches "
+            f"every {warm_stats['cycle_seconds'] / 3600:.1f}h, {warm_stats['refreshed']} refreshed / "
+            f"{warm_stats['cached']} still fresh, {warm_stats['quota_skips']} quota skips, {warm_stats['errors']} errors"
+        )
+        writer_stats = get_batch_writer().get_stats()
+        st.caption(
+            f"💾 DB writer: queue {writer_stats['queue_depth']}/{writer_stats['queue_capacity']}, "
+            f"flush {writer_stats['last_flush_ms']:.1f} ms last / {writer_stats['avg_flush_ms']:.1f} avg / "
+            f"{writer_stats['max_flush_ms']:.1f} max, {writer_stats['written']} written, "
+            f"{writer_stats['dropped']} dropped, {writer_stats['failed']} failed"
+        )
         
         # Logout button
         st.markdown("---")
@@ -164,17 +232,31 @@ def show_enhanced_overview():
     </style>
     """, unsafe_allow_html=True)
     
-    # Key Metrics
+    # Key Metrics from the pre-aggregated event rollups; the rollup thread
+    # started by get_event_log keeps them current, pages only read them
+    events = get_event_log()
+    today_start, today_end = period_bounds(1)
+    month_start, month_end = period_bounds(30)
+    sessions = events.total("session_start", start=month_start, end=month_end)
+    active_today = events.total("session_start", start=today_start, end=today_end)
+    analyses = events.total("analysis_completed", start=month_start, end=month_end)
+    sandbox_stats = get_sandbox_pool().get_stats()
+    extractions = sandbox_stats["completed"] + sandbox_stats["failed"]
+    health = sandbox_stats["completed"] / extractions if extractions else 1.0
+    
     col1, col2, col3, col4 = st.columns(4)
     metrics = [
-        ("Total Users", "1,245", "+12%", "👥"),
-        ("Active Today", "156", "+8%", "🔵"),
-        ("Resumes Analyzed", "876", "+15%", "📄"),
-        ("System Health", "98%", "-2%", "💻")
+        ("Sessions (30d)", f"{sessions:,}",
+         format_delta(sessions, events.total("session_start", start=2 * month_start - month_end, end=month_start)), "👥"),
+        ("Active Today", f"{active_today:,}",
+         format_delta(active_today, events.total("session_start", start=2 * today_start - today_end, end=today_start)), "🔵"),
+        ("Resumes Analyzed", f"{analyses:,}",
+         format_delta(analyses, events.total("analysis_completed", start=2 * month_start - month_end, end=month_start)), "📄"),
+        ("System Health", f"{health:.0%}", f"{sandbox_stats['failed']} failed extractions", "💻")
     ]
     
     for col, (label, value, delta, emoji) in zip([col1, col2, col3, col4], metrics):
-        is_negative = '-' in delta
+        is_negative = delta.startswith('-')
         with col:
             st.markdown(f"""
             <div class="metric-card">
@@ -199,14 +281,10 @@ def show_enhanced_overview():
 
 def show_activity_graph():
     st.subheader("User Activity")
-    dates = pd.date_range(start='2024-01-01', end='2024-04-01', freq='D')
-    data = pd.DataFrame({
-        'Date': dates,
-        'Users': np.random.randint(100, 200, size=len(dates)),
-        'Analyses': np.random.randint(50, 150, size=len(dates))
-    })
+    start, end = period_bounds(90)
+    data = daily_frame(get_event_log(), {"Sessions": "session_start", "Analyses": "analysis_completed"}, start, end)
     
-    fig = px.line(data, x='Date', y=['Users', 'Analyses'],
+    fig = px.line(data, x='Date', y=['Sessions', 'Analyses'],
                   title='Platform Activity')
     fig.update_layout(height=400)
     st.plotly_chart(fig, use_container_width=True)
@@ -223,26 +301,60 @@ def show_resource_usage():
     fig.update_layout(height=400)
     st.plotly_chart(fig, use_container_width=True)
 
+EVENT_DESCRIPTIONS = {
+    "session_start": "New session started",
+    "analysis_completed": "Resume analysis completed",
+    "resume_built": "Resume generated",
+    "dashboard_viewed": "Market dashboard viewed",
+    "feedback_submitted": "Feedback submitted",
+    "page_view": "Page opened"
+}
+
 def show_activity_feed():
-    activities = [
-        {"time": "2 mins ago", "event": "New user registration", "type": "user"},
-        {"time": "5 mins ago", "event": "Resume analysis completed", "type": "analysis"},
-        {"time": "10 mins ago", "event": "System backup completed", "type": "system"},
-        {"time": "15 mins ago", "event": "API rate limit warning", "type": "warning"}
-    ]
+    activities = get_event_log().recent(limit=8)
+    if not activities:
+        st.info("No activity recorded yet.")
     
     for activity in activities:
         col1, col2 = st.columns([1, 4])
         with col1:
-            st.text(activity["time"])
+            st.text(format_ago(activity["ts"]))
         with col2:
-            if activity["type"] == "warning":
-                st.warning(activity["event"])
-            else:
-                st.info(activity["event"])
+            event = EVENT_DESCRIPTIONS.get(activity["kind"], activity["kind"])
+            if activity["label"]:
+                event += f": {activity['label']}"
+            st.info(event)
+
+def period_bounds(days, end_date=None):
+    """[start, end) epoch seconds covering ``days`` whole UTC days up to and including ``end_date``."""
+    end_date = end_date or datetime.utcnow().date()
+    end = calendar.timegm((end_date + timedelta(days=1)).timetuple())
+    return end - days * 86400, end
+
+def format_delta(current, previous):
+    if not previous:
+        return "new" if current else "+0%"
+    return f"{(current - previous) / previous:+.0%}"
+
+def format_ago(ts):
+    minutes = int((time.time() - ts) // 60)
+    if minutes < 60:
+        return f"{minutes} mins ago"
+    if minutes < 24 * 60:
+        return f"{minutes // 60} hours ago"
+    return f"{minutes // (24 * 60)} days ago"
+
+def daily_frame(events, series, start, end):
+    """One row per UTC day in [start, end) with a column per event kind in ``series``."""
+    data = pd.DataFrame({'Date': pd.to_datetime(np.arange(start, end, 86400), unit='s')})
+    for column, kind in series.items():
+        counts = events.series(kind, "day", start, end)
+        data[column] = [counts.get(bucket, 0) for bucket in range(start, end, 86400)]
+    return data
 
 def show_enhanced_submissions():
     st.title("Resume Submissions")
+    store = get_submission_store()
     
     # Filters
     col1, col2, col3 = st.columns(3)
@@ -257,26 +369,38 @@ def show_enhanced_submissions():
             value=(datetime.now() - timedelta(days=7), datetime.now())
         )
     with col3:
-        search = st.text_input("Search", placeholder="Search by name or ID...")
-
-    # Sample data
-    submissions = pd.DataFrame({
-        'ID': range(1, 10),
-        'Name': ['John Doe', 'Jane Smith', 'Bob Wilson', 'Alice Brown', 
-                'Charlie Davis', 'Eva White', 'Frank Miller', 'Grace Lee', 'Henry Ford'],
-        'Submission Date': pd.date_range(end=datetime.now(), periods=9).strftime('%Y-%m-%d').tolist(),
-        'Status': ['Analyzed', 'Pending', 'Analyzed', 'Flagged', 
-                  'Pending', 'Analyzed', 'Pending', 'Flagged', 'Analyzed'],
-        'Score': [85, None, 92, 45, None, 78, None, 35, 88],
-        'Type': ['Tech', 'Marketing', 'Tech', 'Sales', 'Tech', 
-                'Marketing', 'Sales', 'Tech', 'Marketing']
-    })
+        search = st.text_input("Search", placeholder="Search names and resume text...")
+    
+    # the picker returns a single date while the range is being chosen
+    if isinstance(date_range, (list, tuple)):
+        start_date, end_date = (date_range[0], date_range[-1]) if date_range else (None, None)
+    else:
+        start_date = end_date = date_range
+    
+    # Keyset pagination: remember where each page started, reset when filters change
+    filter_key = (status_filter, start_date, end_date, search)
+    if st.session_state.get("submissions_filter") != filter_key:
+        st.session_state.submissions_filter = filter_key
+        st.session_state.submissions_cursors = [None]
+    cursors = st.session_state.submissions_cursors
     
-    # Apply filters
-    if status_filter != "All":
-        submissions = submissions[submissions['Status'] == status_filter]
     if search:
-        submissions = submissions[submissions['Name'].str.contains(search, case=False)]
+        # BM25 over names and resume text, best match first
+        hits = get_search_index().search(search, top_k=PAGE_SIZE)
+        relevance = {int(doc_id): score for doc_id, _, score in hits if doc_id.isdigit()}
+        rows = store.get_many([doc_id for doc_id, _, _ in hits], status_filter, start_date, end_date)
+        for row in rows:
+            row["relevance"] = relevance[row["id"]]
+    else:
+        rows = store.page(status_filter, start_date, end_date, after=cursors[-1], limit=PAGE_SIZE + 1)
+    has_next = len(rows) > PAGE_SIZE
+    rows = rows[:PAGE_SIZE]
+    
+    submissions = pd.DataFrame(rows, columns=["id", "name", "submitted_at", "status", "score", "type"] + (["relevance"] if search else []))
+    submissions = submissions.rename(columns={
+        'id': 'ID', 'name': 'Name', 'submitted_at': 'Submission Date', 'status': 'Status',
+        'score': 'Score', 'type': 'Type', 'relevance': 'Relevance'
+    })
     
     # Style the dataframe
     def color_status(val):
@@ -289,50 +413,62 @@ def show_enhanced_submissions():
     styled_df = submissions.style.applymap(color_status, subset=['Status'])
     
     # Display submissions table
-    st.dataframe(styled_df, use_container_width=True)
+    if submissions.empty:
+        st.info("No submissions match these filters.")
+    else:
+        st.dataframe(styled_df, use_container_width=True, hide_index=True)
+    
+    if not search:
+        page_col1, page_col2, page_col3 = st.columns([1, 2, 1])
+        with page_col1:
+            if len(cursors) > 1 and st.button("← Previous", key="submissions_prev"):
+                cursors.pop()
+                st.rerun()
+        with page_col2:
+            st.caption(f"Page {len(cursors)}")
+        with page_col3:
+            if has_next and st.button("Next →", key="submissions_next"):
+                last = rows[-1]
+                cursors.append((last["submitted_at"], last["id"]))
+                st.rerun()
     
     # Submission Stats
     st.markdown("### Submission Statistics")
+    stats = store.stats(start_date, end_date)
     stat_col1, stat_col2, stat_col3, stat_col4 = st.columns(4)
     
     with stat_col1:
-        st.metric("Total Submissions", len(submissions))
+        st.metric("Total Submissions", stats["total"])
     with stat_col2:
-        st.metric("Pending Review", len(submissions[submissions['Status'] == 'Pending']))
+        st.metric("Pending Review", stats["Pending"])
     with stat_col3:
-        st.metric("Analyzed", len(submissions[submissions['Status'] == 'Analyzed']))
+        st.metric("Analyzed", stats["Analyzed"])
     with stat_col4:
-        st.metric("Flagged", len(submissions[submissions['Status'] == 'Flagged']))
+        st.metric("Flagged", stats["Flagged"])
+    
+    if submissions.empty:
+        return
     
     # Detailed View
     st.markdown("### Detailed Analysis")
+    names = dict(zip(submissions['ID'], submissions['Name']))
     selected_submission = st.selectbox(
         "Select Submission to Review",
         submissions['ID'].tolist(),
-        format_func=lambda x: f"ID: {x} - {submissions[submissions['ID']==x]['Name'].iloc[0]}"
+        format_func=lambda x: f"ID: {x} - {names[x]}"
     )
     
     if selected_submission:
+        submission = store.get(selected_submission)
         col1, col2 = st.columns([2, 1])
         
         with col1:
             st.markdown("#### Resume Content")
-            st.code("""
-            JOHN DOE
-            Software Engineer
-            
-            EXPERIENCE
-            Senior Developer, Tech Corp
-            - Led team of 5 developers
-            - Implemented CI/CD pipeline
-            
-            SKILLS
-            Python, JavaScript, AWS
-            """, language="text")
+            st.code(submission["text"] or "No resume text stored.", language="text")
             
         with col2:
             st.markdown("#### Analysis Results")
-            score = submissions[submissions['ID']==selected_submission]['Score'].iloc[0]
+            score = submission["score"]
             if score:
                 st.progress(score/100)
                 st.markdown(f"**Match Score**: {score}%")
@@ -340,18 +476,19 @@ def show_enhanced_submissions():
             status = st.selectbox(
                 "Update Status",
                 ["Pending", "Analyzed", "Flagged"],
-                index=["Pending", "Analyzed", "Flagged"].index(
-                    submissions[submissions['ID']==selected_submission]['Status'].iloc[0]
-                ),
+                index=["Pending", "Analyzed", "Flagged"].index(submission["status"]),
                 key=f"status_{selected_submission}"
             )
             
             if st.button("Update Status", type="primary", key=f"update_status_{selected_submission}"):
+                store.update_status(selected_submission, status)
                 st.success(f"Status updated to {status}")
                 
             with st.expander("Add Review Note"):
-                st.text_area("Note", key=f"note_{selected_submission}")
-                st.button("Save Note", key=f"save_note_{selected_submission}")
+                note = st.text_area("Note", value=submission["note"] or "", key=f"note_{selected_submission}")
+                if st.button("Save Note", key=f"save_note_{selected_submission}"):
+                    store.save_note(selected_submission, note)
+                    st.success("Note saved")
 
 def show_enhanced_users():
     st.title("User Management")
@@ -422,40 +559,56 @@ def show_enhanced_analytics():
             "Select Date Range",
             value=(datetime.now() - timedelta(days=30), datetime.now())
         )
+        if not isinstance(date_range, (list, tuple)):
+            date_range = (date_range,)
+        first, last = (date_range[0], date_range[-1]) if date_range else (datetime.now().date(),) * 2
+        start, end = period_bounds((last - first).days + 1, last)
+    else:
+        start, end = period_bounds(int(period.split()[1]))
+    # the equally long period just before, for deltas
+    previous_start = 2 * start - end
+    
+    events = get_event_log()
+    st.caption(f"Event counts are refreshed every {ROLLUP_INTERVAL:.0f} seconds.")
+    
+    def metric(label, kind):
+        current = events.total(kind, start=start, end=end)
+        previous = events.total(kind, start=previous_start, end=start)
+        st.metric(label, f"{current:,}", format_delta(current, previous) if previous else None)
     
     # Key Metrics
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Total Revenue", "$12,450", "+8.2%")
+        metric("Sessions", "session_start")
     with col2:
-        st.metric("Active Users", "1,245", "+12.3%")
+        metric("Resumes Analyzed", "analysis_completed")
     with col3:
-        st.metric("Premium Conv.", "15.2%", "+2.1%")
+        metric("Resumes Built", "resume_built")
     with col4:
-        st.metric("Avg. Usage", "25 mins", "+5.3%")
+        metric("Feedback", "feedback_submitted")
     
     # Charts
     col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown("### User Growth")
-        dates = pd.date_range(start='2024-01-01', end='2024-04-01', freq='D')
-        growth_data = pd.DataFrame({
-            'Date': dates,
-            'Total Users': np.cumsum(np.random.randint(5, 15, size=len(dates))),
-            'Premium Users': np.cumsum(np.random.randint(1, 5, size=len(dates)))
-        })
-        fig = px.line(growth_data, x='Date', y=['Total Users', 'Premium Users'])
+        st.markdown("### Daily Activity")
+        activity_data = daily_frame(events, {
+            "Sessions": "session_start",
+            "Analyses": "analysis_completed",
+            "Resumes Built": "resume_built"
+        }, start, end)
+        fig = px.line(activity_data, x='Date', y=['Sessions', 'Analyses', 'Resumes Built'])
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         st.markdown("### Usage Distribution")
-        usage_data = pd.DataFrame({
-            'Feature': ['Resume Analysis', 'Job Search', 'Skills Assessment', 'Resume Builder'],
-            'Usage': [45, 30, 15, 10]
-        })
-        fig = px.pie(usage_data, values='Usage', names='Feature')
-        st.plotly_chart(fig, use_container_width=True)
+        page_views = events.totals("page_view", start=start, end=end)
+        if page_views:
+            usage_data = pd.DataFrame(list(page_views.items()), columns=['Feature', 'Usage'])
+            fig = px.pie(usage_data, values='Usage', names='Feature')
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("No page views recorded in this period.")
 
 def show_enhanced_settings():
     st.title("Admin Settings")
@@ -488,6 +641,28 @@ def show_enhanced_settings():
         st.text_input("OpenAI API Key", type="password")
         st.selectbox("AI Model", ["GPT-4", "GPT-3.5-turbo"])
         st.number_input("Rate Limit (requests/min)", value=60)
+        
+        st.markdown("### Job Market Cache Warming")
+        st.caption(
+            "The dashboard's role × location grid is kept cached in the background. "
+            "Searches added here are warmed too, within the JSearch quota."
+        )
+        warmer = get_cache_warmer()
+        col1, col2, col3 = st.columns([2, 2, 1])
+        with col1:
+            warm_role = st.text_input("Job Role", key="warm_role")
+        with col2:
+            warm_location = st.text_input("Location", key="warm_location")
+        with col3:
+            st.write("")
+            if st.button("Add", key="warm_add", use_container_width=True) and warm_role.strip() and warm_location.strip():
+                warmer.add_search(warm_role, warm_location)
+        for query, location in warmer.extra_searches():
+            col1, col2 = st.columns([4, 1])
+            col1.write(f"{query} — {location}")
+            if col2.button("Remove", key=f"warm_remove_{query}_{location}"):
+                warmer.remove_search(query, location)
+                st.rerun()
     
     with tabs[4]:
         st.markdown("### Backup Settings")
@@ -1,5 +1,11 @@
+from pathlib import Path
+
 import streamlit as st
 from ai_modules.ai_analyzer import ResumeAnalyzer
+from ai_modules.text_cache import content_hash, read_upload_bytes
+from dashboard_module.postings_index import get_postings_index
+from storage_module.events import log_event
+from storage_module.submissions import record_submission
 
 def show_analyzer():
     st.title("Resume Analyzer")
@@ -23,19 +29,37 @@ def show_analyzer():
                 # Initialize analyzer
                 analyzer = ResumeAnalyzer()
                 
-                # Extract text from resume
-                resume_text = analyzer.extract_text(uploaded_file)
+                # Extract text and score; memoized across sessions
+                result = analyzer.analyze(uploaded_file, job_desc, job_role)
+                ats_score = result["ats_score"]
+                format_score = result["format_score"]
+                skills_data = result["skills_data"]
+                suggestions = result["suggestions"]
                 
-                # Calculate scores and analyze
-                ats_score = analyzer.calculate_ats_score(resume_text, job_desc)
-                format_score = analyzer.analyze_format(resume_text)
-                skills_data = analyzer.extract_skills(resume_text, job_desc)
-                suggestions = analyzer.get_suggestions(ats_score, format_score, skills_data)
+                if not result["text"]:
+                    # the extraction error has been shown; nothing to score
+                    return
                 
-                st.success("Analysis complete!")
+                # record the submission for the admin view and make it searchable
+                if result["complete"]:
+                    record_submission(
+                        Path(uploaded_file.name).stem,
+                        job_role.strip() or "General",
+                        ats_score,
+                        result["text"],
+                        resume_hash=content_hash(read_upload_bytes(uploaded_file))
+                    )
+                    log_event(
+                        "analysis_completed",
+                        job_role.strip() or "General",
+                        session=st.session_state.get("session_id"),
+                        ats_score=ats_score,
+                        format_score=format_score
+                    )
+                    st.success("Analysis complete!")
                 
                 # Create tabs for different analysis aspects
-                tab1, tab2, tab3, tab4 = st.tabs(["ATS Score", "Format Analysis", "Skills Match", "Suggestions"])
+                tab1, tab2, tab3, tab4, tab5 = st.tabs(["ATS Score", "Format Analysis", "Skills Match", "Suggestions", "Recommended Jobs"])
                 
                 with tab1:
                     st.subheader("ATS Compatibility Score")
@@ -54,4 +78,19 @@ def show_analyzer():
                 
                 with tab4:
                     st.subheader("Suggestions for Improvement")
-                    st.markdown("\n".join([f"- {suggestion}" for suggestion in suggestions]))
\ No newline at end of file
+                    st.markdown("\n".join([f"- {suggestion}" for suggestion in suggestions]))
+                
+                with tab5:
+                    st.subheader("Recommended Jobs")
+                    index = get_postings_index()
+                    if len(index) == 0:
+                        st.info("No job postings indexed yet. Open the Job Market Dashboard to fetch some.")
+                    else:
+                        matches = index.search(analyzer.parse(result["text"]), top_k=5)
+                        if not matches:
+                            st.info("No matching postings found.")
+                        for job in matches:
+                            place = ", ".join(p for p in (job.get("job_city"), job.get("job_country")) if p)
+                            st.markdown(f"**{job.get('job_title')}** at {job.get('employer_name')} ({place}) - match {job['score']}%")
+                            if job.get("job_apply_link"):
+                                st.markdown(f"[Apply]({job['job_apply_link']})")
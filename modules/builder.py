@@ -4,6 +4,8 @@ from ai_modules.resume_generator import EnhancedResumeGenerator
 import tempfile
 import os
 
+from storage_module.events import log_event
+
 def convert_to_pdf(docx_path, pdf_path):
     try:
         convert(docx_path, pdf_path)
@@ -162,6 +164,7 @@ def show_builder():
                             pdf_bytes = pdf_file.read()
                 
                 st.success("✅ Resume generated successfully!")
+                log_event("resume_built", template, session=st.session_state.get("session_id"))
                 
                 # Download buttons
                 col1, col2 = st.columns(2)
@@ -1,51 +1,104 @@
 import streamlit as st
+from dashboard_module.cache_warmer import DASHBOARD_LOCATIONS, DASHBOARD_ROLES, search_terms
 from dashboard_module.data_fetcher import JobDataAPI
+from dashboard_module.http_client import JobDataError
+from dashboard_module.market_history import get_market_history
+from dashboard_module.postings_store import get_postings_store
+from dashboard_module.salary_sketch import salary_summary
+from storage_module.events import log_event
 import plotly.express as px
 import pandas as pd
 
 @st.cache_data(ttl=1800)
-def fetch_market_data(query: str, location: str) -> dict:
+def fetch_market_data(query: str, location: str, pages: int = 1) -> dict:
     api = JobDataAPI()
-    # Format query to match JSearch API expectations
-    formatted_query = query.lower().replace(" ", "-")
-    if location.lower() == "remote":
-        formatted_location = "remote"
-    else:
-        formatted_location = location
+    # same terms as the cache warmer, so grid searches are answered from its cache
+    formatted_query, formatted_location = search_terms(query, location)
+    data = api.analyze_market(formatted_query, formatted_location, pages=pages)
     
-    # Add debug logging
-    st.write(f"Fetching data for: {formatted_query} in {formatted_location}")
-    
-    data = api.analyze_market(formatted_query, formatted_location)
-    
-    # Debug API response
     if data["market_overview"]["total_jobs"] == 0:
-        st.warning("No jobs found. Checking API response...")
-        raw_data = api._fetch_jobs(formatted_query, formatted_location)
-        st.write("API Response Sample:", raw_data[:2] if raw_data else "No data")
+        st.warning("No jobs found for this search.")
     
     return data
 
+@st.cache_data(ttl=300)
+def load_stored_market_data(query: str, location: str, days: int = 30) -> dict:
+    # same search key as fetch_market_data, answered from the local postings dataset
+    formatted_query, formatted_location = search_terms(query, location)
+    return get_postings_store().analyze(formatted_query, formatted_location, days=days)
+
+@st.cache_data(ttl=300)
+def load_market_trends(query: str, location: str, weeks: int = 12) -> pd.DataFrame:
+    # one row per week and skill, merged from the stored daily summaries
+    formatted_query, formatted_location = search_terms(query, location)
+    weekly = get_market_history().weekly(formatted_query, formatted_location, weeks=weeks)
+    overall = {}
+    for _, summary in weekly:
+        for skill, count in summary.skills.items():
+            overall[skill] = overall.get(skill, 0) + count
+    top_skills = sorted(overall, key=overall.get, reverse=True)[:5]
+    rows = []
+    for week, summary in weekly:
+        base = {
+            "Week": pd.Timestamp(week),
+            "New Postings": summary.total,
+            "Remote Share": summary.work_location.get("remote", 0) / summary.total if summary.total else None,
+            "Median Salary": salary_summary(summary.salary_sketches)["median"] if summary.salary_sketches else None
+        }
+        for skill in top_skills or [None]:
+            share = summary.skills.get(skill, 0) / summary.total if skill and summary.total else None
+            rows.append(dict(base, Skill=skill, Share=share))
+    return pd.DataFrame(rows)
+
+def show_market_trends(job_role: str, location: str):
+    st.header("Market Trends")
+    weeks = st.select_slider("Weeks", options=[4, 8, 12, 26, 52], value=12)
+    trends = load_market_trends(job_role, location, weeks)
+    weekly = trends.drop_duplicates("Week")
+    if weekly["New Postings"].sum() == 0:
+        st.info("No history for this search yet. Trends build up as the market is analyzed over time.")
+        return
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(px.bar(weekly, x="Week", y="New Postings", title="New Postings per Week"))
+    with col2:
+        salaries = weekly.dropna(subset=["Median Salary"])
+        if not salaries.empty:
+            st.plotly_chart(px.line(salaries, x="Week", y="Median Salary", markers=True,
+                                    title="Median Yearly Salary"))
+        else:
+            st.info("No salary data in this period")
+    skills = trends.dropna(subset=["Skill", "Share"])
+    if not skills.empty:
+        fig = px.line(skills, x="Week", y="Share", color="Skill", markers=True,
+                      title="Share of New Postings Mentioning Top Skills")
+        fig.update_yaxes(tickformat=".0%")
+        st.plotly_chart(fig)
+
 def show_dashboard():
     st.title("Job Market Insights Dashboard")
     
     # Filters
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns([2, 2, 1])
     with col1:
-        job_role = st.selectbox(
-            "Job Role",
-            ["Software Engineer", "Data Scientist", "DevOps Engineer", 
-             "Full Stack Developer", "Machine Learning Engineer"]
-        )
+        job_role = st.selectbox("Job Role", DASHBOARD_ROLES)
     with col2:
-        location = st.selectbox(
-            "Location",
-            ["United States", "Remote", "Europe", "Asia"]
-        )
+        location = st.selectbox("Location", DASHBOARD_LOCATIONS)
+    with col3:
+        # pages are fetched concurrently, so more depth costs little extra time
+        pages = st.selectbox("Result Pages", [1, 3, 5], help="JSearch result pages to analyze")
+    source = st.radio("Data", ["Latest fetch", "Last 30 days (stored)"], horizontal=True)
     
     try:
         with st.spinner("Analyzing job market..."):
-            market_data = fetch_market_data(job_role, location)
+            if source == "Latest fetch":
+                market_data = fetch_market_data(job_role, location, pages)
+            else:
+                market_data = load_stored_market_data(job_role, location)
+                if market_data["market_overview"]["total_jobs"] == 0:
+                    st.info("No stored postings for this search yet.")
+        log_event("dashboard_viewed", f"{job_role} / {location}", session=st.session_state.get("session_id"))
         
         # Market Overview
         st.header("Market Overview")
@@ -77,12 +130,26 @@ def show_dashboard():
         # Salary Insights
         st.header("Salary Insights")
         salary_data = market_data["salary_insights"]
-        col1, col2 = st.columns(2)
+        currency = salary_data.get("currency", "USD")
+        col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Average Salary", f"${salary_data['average']:,.0f}")
+            st.metric(f"Median Salary ({currency})", f"{salary_data.get('median', 0):,.0f}")
         with col2:
-            st.metric("Salary Range", 
-                     f"${salary_data['range']['min']:,.0f} - ${salary_data['range']['max']:,.0f}")
+            st.metric(f"Middle 50% ({currency})", f"{salary_data.get('p25', 0):,.0f} - {salary_data.get('p75', 0):,.0f}")
+        with col3:
+            st.metric(f"Top 10% From ({currency})", f"{salary_data.get('p90', 0):,.0f}")
+        with col4:
+            mean = salary_data.get("mean")
+            st.metric(f"Average Salary ({currency})", f"{mean:,.0f}" if mean is not None else "n/a")
+        st.caption(f"All figures are yearly equivalents of hourly, daily, weekly and monthly pay, for postings in "
+                   f"{currency}.")
+        if len(salary_data.get("by_currency", {})) > 1:
+            st.dataframe(
+                pd.DataFrame.from_dict(salary_data["by_currency"], orient="index")
+                .rename(columns={"p25": "25th", "median": "Median", "p75": "75th", "p90": "90th", "mean": "Average",
+                                 "count": "Postings"}),
+                width="stretch"
+            )
         
         # Employment Analysis
         st.header("Employment Analysis")
@@ -139,11 +206,17 @@ def show_dashboard():
             else:
                 st.info("No work location data available")
                 
+    except JobDataError as e:
+        st.error("Job market data is temporarily unavailable. Please try again in a few minutes.")
+        st.caption(str(e))
     except Exception as e:
         st.error(f"Error loading dashboard: {str(e)}")
         st.info("Please check your API credentials and try again.")
         # Add debug information
         st.write("Debug Info:", str(e.__class__.__name__))
+    
+    # history is stored locally, so trends show even while the API is down
+    show_market_trends(job_role, location)
 
 if __name__ == "__main__":
     show_dashboard()
\ No newline at end of file
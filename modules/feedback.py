@@ -1,5 +1,8 @@
 import streamlit as st
 
+from storage_module.events import log_event
+from storage_module.feedback import record_feedback
+
 def show_feedback():
     st.title("Feedback")
     
@@ -25,4 +28,6 @@ def show_feedback():
     
     # Remove columns and use centered button
     if st.button("Submit Feedback"):
+        record_feedback(feedback_type, rating, feedback_text, session=st.session_state.get("session_id"))
+        log_event("feedback_submitted", feedback_type, session=st.session_state.get("session_id"), rating=rating)
         st.success("Thank you for your feedback! We appreciate your input.")
\ No newline at end of file
@@ -0,0 +1,203 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from storage_module.database import DB_PATH, get_connection
+
+logger = logging.getLogger(__name__)
+
+MAX_QUEUE = int(os.getenv("SMARTHIRE_WRITER_MAX_QUEUE", "10000"))
+BATCH_SIZE = int(os.getenv("SMARTHIRE_WRITER_BATCH_SIZE", "500"))
+FLUSH_INTERVAL = float(os.getenv("SMARTHIRE_WRITER_FLUSH_SECONDS", "1.0"))
+# how long a producer waits on a full queue before the write is dropped
+PUT_TIMEOUT = float(os.getenv("SMARTHIRE_WRITER_PUT_TIMEOUT", "2.0"))
+
+_STOP = object()
+
+
+class BatchWriter:
+    """
+    Write-behind queue for SQLite. Callers enqueue writes and return at
+    once; a background thread drains the queue and commits up to
+    BATCH_SIZE writes per transaction, flushing early once FLUSH_INTERVAL
+    has passed since the first queued write. A full queue blocks producers
+    for up to PUT_TIMEOUT (backpressure) before the write is dropped.
+
+    A write is either ``(sql, params)`` - consecutive writes with the same
+    SQL are batched with executemany - or a callable taking the connection.
+    Each write runs in its own savepoint, so a failing one is rolled back
+    and counted without losing the rest of the batch. A callable may return
+    another callable, which is called once the batch has committed (e.g. to
+    update an index that must not get ahead of the database).
+    """
+
+    def __init__(self, path: str = DB_PATH, max_queue: int = MAX_QUEUE, batch_size: int = BATCH_SIZE,
+                 flush_interval: float = FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "written": 0,
+            "failed": 0,
+            "dropped": 0,
+            "batches": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0
+        }
+        self._thread = threading.Thread(target=self._run, name="batch-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, sql_or_fn, params=(), timeout: float = PUT_TIMEOUT) -> bool:
+        """Queues a write; returns False if it was dropped because the queue stayed full."""
+        item = sql_or_fn if callable(sql_or_fn) else (sql_or_fn, params)
+        try:
+            self._queue.put(item, timeout=timeout)
+            return True
+        except queue.Full:
+            with self._stats_lock:
+                self._stats["dropped"] += 1
+            logger.warning("Write queue full; dropped a write")
+            return False
+
+    def flush(self, timeout: float = None) -> bool:
+        """Blocks until every write queued so far is committed (or ``timeout`` passes)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float = 10.0):
+        """Flushes outstanding writes and stops the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def get_stats(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["queue_depth"] = self._queue.qsize()
+        stats["queue_capacity"] = self._queue.maxsize
+        stats["avg_flush_ms"] = stats.pop("total_flush_ms") / stats["batches"] if stats["batches"] else 0.0
+        return stats
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while item is not _STOP and len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+
+            stop = batch[-1] is _STOP
+            writes = batch[:-1] if stop else batch
+            if writes:
+                self._write(writes)
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, writes):
+        started = time.perf_counter()
+        failed, after_commit = 0, []
+        try:
+            with get_connection(self.path) as conn:
+                conn.execute("BEGIN")
+                i = 0
+                while i < len(writes):
+                    item = writes[i]
+                    if callable(item):
+                        try:
+                            hook = self._isolated(conn, item)
+                        except Exception:
+                            logger.exception("Queued write failed")
+                            failed += 1
+                        else:
+                            if callable(hook):
+                                after_commit.append(hook)
+                        i += 1
+                        continue
+                    # batch the run of writes sharing this statement
+                    j = i
+                    while j < len(writes) and not callable(writes[j]) and writes[j][0] == item[0]:
+                        j += 1
+                    failed += self._write_run(conn, item[0], [params for _, params in writes[i:j]])
+                    i = j
+        except Exception:
+            logger.exception("Batched write of %d items failed", len(writes))
+            failed, after_commit = len(writes), []
+        for hook in after_commit:
+            try:
+                hook()
+            except Exception:
+                logger.exception("After-commit hook of a queued write failed")
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        with self._stats_lock:
+            self._stats["written"] += len(writes) - failed
+            self._stats["failed"] += failed
+            self._stats["batches"] += 1
+            self._stats["last_flush_ms"] = elapsed_ms
+            self._stats["max_flush_ms"] = max(self._stats["max_flush_ms"], elapsed_ms)
+            self._stats["total_flush_ms"] += elapsed_ms
+
+    def _write_run(self, conn, sql, rows) -> int:
+        """executemany, falling back to row by row to keep the good rows; returns how many failed."""
+        try:
+            self._isolated(conn, lambda c: c.executemany(sql, rows))
+            return 0
+        except Exception:
+            if len(rows) == 1:
+                logger.exception("Queued write failed")
+                return 1
+        failed = 0
+        for params in rows:
+            try:
+                self._isolated(conn, lambda c: c.execute(sql, params))
+            except Exception:
+                logger.exception("Queued write failed")
+                failed += 1
+        return failed
+
+    @staticmethod
+    def _isolated(conn, fn):
+        """``fn(conn)`` inside a savepoint; if it raises, only its own changes are undone."""
+        conn.execute("SAVEPOINT queued_write")
+        try:
+            result = fn(conn)
+        except Exception:
+            conn.execute("ROLLBACK TO queued_write")
+            conn.execute("RELEASE queued_write")
+            raise
+        conn.execute("RELEASE queued_write")
+        return result
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_batch_writer(path: str = DB_PATH) -> BatchWriter:
+    """Shared writer for the database at ``path``; pending writes are flushed at exit."""
+    writer = _writers.get(path)
+    if writer is None:
+        with _writers_lock:
+            writer = _writers.get(path)
+            if writer is None:
+                writer = _writers[path] = BatchWriter(path)
+                atexit.register(writer.close)
+    return writer
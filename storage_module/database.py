@@ -0,0 +1,31 @@
+import os
+import sqlite3
+import threading
+
+DATA_DIR = os.getenv("SMARTHIRE_DATA_DIR", "data")
+DB_PATH = os.getenv("SMARTHIRE_DB_PATH", os.path.join(DATA_DIR, "smarthire.db"))
+
+_local = threading.local()
+
+
+def get_connection(path: str = DB_PATH) -> sqlite3.Connection:
+    """
+    SQLite connection for the calling thread. Streamlit runs each session's
+    script on its own thread, so connections are cached per thread and path.
+    WAL lets readers proceed while another thread or process writes.
+    """
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(path)
+    if conn is None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        connections[path] = conn
+    return conn
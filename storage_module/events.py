@@ -0,0 +1,199 @@
+import json
+import logging
+import os
+import threading
+import time
+
+from storage_module.batch_writer import get_batch_writer
+from storage_module.database import DB_PATH, get_connection
+
+logger = logging.getLogger(__name__)
+
+# bucket width in seconds and how long buckets are kept (None = forever)
+GRANULARITIES = {
+    "minute": (60, 2 * 86400),
+    "hour": (3600, 90 * 86400),
+    "day": (86400, None)
+}
+ROLLUP_INTERVAL = float(os.getenv("SMARTHIRE_ROLLUP_INTERVAL", "60"))
+ROLLUP_BATCH = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    label TEXT NOT NULL DEFAULT '',
+    session TEXT,
+    payload TEXT
+);
+CREATE TABLE IF NOT EXISTS event_rollups (
+    granularity TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    label TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (granularity, kind, label, bucket)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_watermarks (
+    name TEXT PRIMARY KEY,
+    last_event_id INTEGER NOT NULL
+);
+"""
+
+
+class EventLog:
+    """
+    Append-only usage events with incrementally maintained rollups.
+
+    Events are only ever inserted. The rollup job folds events past its
+    watermark into per-minute, per-hour and per-day counters keyed by
+    (kind, label) and advances the watermark in the same transaction, so
+    each event is counted exactly once even with several server processes.
+    Dashboards read the counters: a date range costs one row per bucket
+    regardless of how many events it covers.
+    """
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+        self._rollup_lock = threading.Lock()
+
+    @property
+    def conn(self):
+        conn = get_connection(self.path)
+        if not self._schema_ready:
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.executescript(SCHEMA)
+                    self._schema_ready = True
+        return conn
+
+    def log(self, kind, label="", session=None, ts=None, **payload):
+        """Queues the event on the shared write-behind writer; it lands within a flush interval."""
+        self.conn  # make sure the table exists before the writer inserts into it
+        get_batch_writer(self.path).submit(
+            "INSERT INTO events (ts, kind, label, session, payload) VALUES (?, ?, ?, ?, ?)",
+            (ts or time.time(), kind, label or "", session, json.dumps(payload) if payload else None)
+        )
+
+    def rollup(self, batch_size: int = ROLLUP_BATCH) -> int:
+        """Folds all events past the watermark into the counters; returns how many."""
+        processed = 0
+        with self._rollup_lock:
+            while True:
+                count = self._rollup_batch(batch_size)
+                processed += count
+                if count < batch_size:
+                    break
+            if processed:
+                self._prune()
+        return processed
+
+    def _rollup_batch(self, batch_size):
+        conn = self.conn
+        # IMMEDIATE takes the write lock up front so concurrent rollups serialize
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT last_event_id FROM rollup_watermarks WHERE name = 'events'").fetchone()
+            watermark = row[0] if row else 0
+            events = conn.execute(
+                "SELECT id, ts, kind, label FROM events WHERE id > ? ORDER BY id LIMIT ?",
+                (watermark, batch_size)
+            ).fetchall()
+            counters = {}
+            for _, ts, kind, label in events:
+                for granularity, (width, _) in GRANULARITIES.items():
+                    key = (granularity, kind, label, int(ts // width * width))
+                    counters[key] = counters.get(key, 0) + 1
+            conn.executemany(
+                "INSERT INTO event_rollups (granularity, kind, label, bucket, count) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (granularity, kind, label, bucket) DO UPDATE SET count = count + excluded.count",
+                [key + (count,) for key, count in counters.items()]
+            )
+            if events:
+                conn.execute(
+                    "INSERT INTO rollup_watermarks (name, last_event_id) VALUES ('events', ?) "
+                    "ON CONFLICT (name) DO UPDATE SET last_event_id = excluded.last_event_id",
+                    (events[-1][0],)
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(events)
+
+    def _prune(self):
+        now = time.time()
+        with self.conn as conn:
+            for granularity, (_, retention) in GRANULARITIES.items():
+                if retention:
+                    conn.execute(
+                        "DELETE FROM event_rollups WHERE granularity = ? AND bucket < ?",
+                        (granularity, now - retention)
+                    )
+
+    def series(self, kind, granularity="day", start=None, end=None, label=None) -> dict:
+        """{bucket start (epoch seconds): count} for buckets starting in [start, end)."""
+        query = (
+            "SELECT bucket, SUM(count) FROM event_rollups WHERE granularity = ? AND kind = ? "
+            "AND bucket >= ? AND bucket < ?"
+        )
+        params = [granularity, kind, start or 0, end or time.time() + 1]
+        if label is not None:
+            query += " AND label = ?"
+            params.append(label)
+        return dict(self.conn.execute(query + " GROUP BY bucket", params).fetchall())
+
+    def totals(self, kind, granularity="day", start=None, end=None) -> dict:
+        """{label: count} over buckets starting in [start, end)."""
+        return dict(self.conn.execute(
+            "SELECT label, SUM(count) FROM event_rollups WHERE granularity = ? AND kind = ? "
+            "AND bucket >= ? AND bucket < ? GROUP BY label",
+            (granularity, kind, start or 0, end or time.time() + 1)
+        ).fetchall())
+
+    def total(self, kind, granularity="day", start=None, end=None) -> int:
+        return sum(self.totals(kind, granularity, start, end).values())
+
+    def recent(self, limit: int = 10) -> list:
+        rows = self.conn.execute(
+            "SELECT ts, kind, label, payload FROM events ORDER BY id DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [
+            {"ts": ts, "kind": kind, "label": label, "payload": json.loads(payload) if payload else {}}
+            for ts, kind, label, payload in rows
+        ]
+
+
+def _rollup_loop(event_log):
+    while True:
+        time.sleep(ROLLUP_INTERVAL)
+        try:
+            event_log.rollup()
+        except Exception:
+            logger.exception("Event rollup failed")
+
+
+_log = None
+_log_lock = threading.Lock()
+
+
+def get_event_log() -> EventLog:
+    """Shared event log; the first call also starts the periodic rollup thread."""
+    global _log
+    if _log is None:
+        with _log_lock:
+            if _log is None:
+                _log = EventLog()
+                threading.Thread(target=_rollup_loop, args=(_log,), name="event-rollup", daemon=True).start()
+    return _log
+
+
+def log_event(kind, label="", session=None, **payload):
+    """Records a usage event; failures are logged and never reach the page."""
+    try:
+        get_event_log().log(kind, label, session=session, **payload)
+    except Exception:
+        logger.exception("Could not record %s event", kind)
@@ -0,0 +1,46 @@
+import threading
+import time
+
+from storage_module.batch_writer import get_batch_writer
+from storage_module.database import DB_PATH, get_connection
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feedback (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    session TEXT,
+    feedback_type TEXT NOT NULL,
+    rating INTEGER NOT NULL,
+    text TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_feedback_ts ON feedback(ts);
+"""
+
+_schema_ready = False
+_schema_lock = threading.Lock()
+
+
+def _ensure_schema(path):
+    global _schema_ready
+    if not _schema_ready:
+        with _schema_lock:
+            if not _schema_ready:
+                get_connection(path).executescript(SCHEMA)
+                _schema_ready = True
+
+
+def record_feedback(feedback_type, rating, text, session=None, path: str = DB_PATH) -> bool:
+    """Queues user feedback on the write-behind writer; returns False if it was dropped."""
+    _ensure_schema(path)
+    return get_batch_writer(path).submit(
+        "INSERT INTO feedback (ts, session, feedback_type, rating, text) VALUES (?, ?, ?, ?, ?)",
+        (time.time(), session, feedback_type, rating, text or None)
+    )
+
+
+def recent_feedback(limit: int = 20, path: str = DB_PATH) -> list:
+    _ensure_schema(path)
+    rows = get_connection(path).execute(
+        "SELECT ts, feedback_type, rating, text FROM feedback ORDER BY id DESC LIMIT ?", (limit,)
+    ).fetchall()
+    return [dict(row) for row in rows]
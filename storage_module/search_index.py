@@ -0,0 +1,264 @@
+import heapq
+import json
+import logging
+import math
+import os
+import threading
+from array import array
+
+import numpy as np
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+from ai_modules.document import ParsedResume
+from ai_modules.text_cache import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+INDEX_DIR = os.getenv("SMARTHIRE_SEARCH_INDEX_DIR", os.path.join(CACHE_DIR, "submission_index"))
+# journal entries replayed on load before a new snapshot is written
+JOURNAL_MAX_OPS = int(os.getenv("SMARTHIRE_SEARCH_JOURNAL_MAX_OPS", "10000"))
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# name tokens count this many times, so a name hit outranks a passing mention
+NAME_BOOST = 3
+
+
+def analyze(text) -> list:
+    """Index terms of ``text``: the resume tokenizer minus English stop words."""
+    tokens = text.tokens if isinstance(text, ParsedResume) else ParsedResume(text).tokens
+    return [t for t in tokens if t not in ENGLISH_STOP_WORDS]
+
+
+class SearchIndex:
+    """
+    BM25-ranked inverted index over submission names and resume text.
+
+    Each term maps to parallel int32 arrays of internal document numbers and
+    term frequencies, so adding a document only appends. Removal marks the
+    document dead; like Lucene, dead documents stay in the collection
+    statistics until the next snapshot compacts them away. Every change is
+    appended to a journal on disk; the journal is folded into a compacted
+    snapshot once it reaches JOURNAL_MAX_OPS entries or on ``save``.
+    """
+
+    def __init__(self, directory: str = INDEX_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._reset()
+        self._journal_ops = 0
+        self._load()
+
+    def _reset(self):
+        self._terms = {}        # term -> (doc numbers, term frequencies)
+        self._doc_ids = []      # internal number -> external id
+        self._names = []
+        self._doc_len = array("i")
+        self._alive = bytearray()
+        self._number_of = {}    # external id -> internal number
+        self._total_len = 0
+
+    def __len__(self):
+        return len(self._number_of)
+
+    def __contains__(self, doc_id):
+        return str(doc_id) in self._number_of
+
+    def add(self, doc_id, name: str, text) -> None:
+        """Indexes a document, replacing any earlier version with the same id."""
+        counts = {}
+        for term in analyze(name or "") * NAME_BOOST + analyze(text):
+            counts[term] = counts.get(term, 0) + 1
+        with self._lock:
+            self._add(str(doc_id), name or "", counts)
+            self._journal({"op": "add", "id": str(doc_id), "name": name or "", "terms": counts})
+
+    def remove(self, doc_id) -> bool:
+        with self._lock:
+            removed = self._remove(str(doc_id))
+            if removed:
+                self._journal({"op": "remove", "id": str(doc_id)})
+        return removed
+
+    def search(self, query: str, top_k: int = 20) -> list:
+        """[(doc_id, name, score)] best first; documents must match at least one query term."""
+        terms = set(analyze(query))
+        with self._lock:
+            n_docs = len(self._doc_ids)
+            if not terms or not n_docs:
+                return []
+            avg_len = self._total_len / n_docs
+            doc_len = np.frombuffer(self._doc_len, dtype=np.int32)
+            scores = np.zeros(n_docs, dtype=np.float64)
+            for term in terms:
+                postings = self._terms.get(term)
+                if postings is None:
+                    continue
+                docs = np.frombuffer(postings[0], dtype=np.int32)
+                tf = np.frombuffer(postings[1], dtype=np.int32)
+                idf = math.log(1.0 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                norm = tf + K1 * (1.0 - B + B * doc_len[docs] / avg_len)
+                scores[docs] += idf * tf * (K1 + 1.0) / norm
+            scores *= np.frombuffer(self._alive, dtype=np.uint8)
+            candidates = np.flatnonzero(scores)
+            best = heapq.nlargest(top_k, candidates, key=scores.__getitem__)
+            return [(self._doc_ids[i], self._names[i], round(float(scores[i]), 3)) for i in best]
+
+    def save(self) -> None:
+        """Writes a compacted snapshot and truncates the journal."""
+        if not self.directory:
+            return
+        with self._lock:
+            self._compact()
+            self._write_snapshot()
+
+    def get_stats(self) -> dict:
+        return {
+            "documents": len(self._number_of),
+            "dead": len(self._doc_ids) - len(self._number_of),
+            "terms": len(self._terms),
+            "journal_ops": self._journal_ops
+        }
+
+    def _add(self, doc_id, name, counts):
+        self._remove(doc_id)
+        number = len(self._doc_ids)
+        self._doc_ids.append(doc_id)
+        self._names.append(name)
+        length = sum(counts.values())
+        self._doc_len.append(length)
+        self._alive.append(1)
+        self._number_of[doc_id] = number
+        self._total_len += length
+        for term, tf in counts.items():
+            postings = self._terms.get(term)
+            if postings is None:
+                postings = self._terms[term] = (array("i"), array("i"))
+            postings[0].append(number)
+            postings[1].append(tf)
+
+    def _remove(self, doc_id):
+        number = self._number_of.pop(doc_id, None)
+        if number is None:
+            return False
+        self._alive[number] = 0
+        return True
+
+    def _compact(self):
+        """Drops dead documents from the postings and renumbers the rest."""
+        if len(self._number_of) == len(self._doc_ids):
+            return
+        alive = np.frombuffer(self._alive, dtype=np.uint8).astype(bool)
+        renumber = np.cumsum(alive, dtype=np.int32) - 1
+        terms = {}
+        for term, (docs, tfs) in self._terms.items():
+            docs = np.frombuffer(docs, dtype=np.int32)
+            keep = alive[docs]
+            if keep.any():
+                terms[term] = (
+                    array("i", renumber[docs[keep]].tobytes()),
+                    array("i", np.frombuffer(tfs, dtype=np.int32)[keep].tobytes())
+                )
+        doc_len = np.frombuffer(self._doc_len, dtype=np.int32)[alive]
+        self._terms = terms
+        self._doc_ids = [d for d, a in zip(self._doc_ids, alive) if a]
+        self._names = [n for n, a in zip(self._names, alive) if a]
+        self._doc_len = array("i", doc_len.tobytes())
+        self._alive = bytearray(b"\x01" * len(self._doc_ids))
+        self._number_of = {d: i for i, d in enumerate(self._doc_ids)}
+        self._total_len = int(doc_len.sum())
+
+    def _paths(self):
+        return (
+            os.path.join(self.directory, "snapshot.npz"),
+            os.path.join(self.directory, "snapshot.json"),
+            os.path.join(self.directory, "journal.jsonl")
+        )
+
+    def _journal(self, op):
+        if not self.directory:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._paths()[2], "a", encoding="utf-8") as f:
+                f.write(json.dumps(op) + "\n")
+            self._journal_ops += 1
+            if self._journal_ops >= JOURNAL_MAX_OPS:
+                self._compact()
+                self._write_snapshot()
+        except OSError:
+            logger.exception("Could not write search index journal")
+
+    def _write_snapshot(self):
+        npz_path, json_path, journal_path = self._paths()
+        terms = list(self._terms)
+        lengths = [len(self._terms[t][0]) for t in terms]
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        empty = np.zeros(0, dtype=np.int32)
+        docs = np.concatenate([np.frombuffer(self._terms[t][0], dtype=np.int32) for t in terms] or [empty])
+        tfs = np.concatenate([np.frombuffer(self._terms[t][1], dtype=np.int32) for t in terms] or [empty])
+
+        os.makedirs(self.directory, exist_ok=True)
+        # write then rename so a crash never leaves a half-written snapshot
+        with open(npz_path + ".tmp", "wb") as f:
+            np.savez(f, offsets=offsets, docs=docs, tfs=tfs,
+                     doc_len=np.frombuffer(self._doc_len, dtype=np.int32))
+        with open(json_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"terms": terms, "doc_ids": self._doc_ids, "names": self._names}, f)
+        os.replace(npz_path + ".tmp", npz_path)
+        os.replace(json_path + ".tmp", json_path)
+        open(journal_path, "w").close()
+        self._journal_ops = 0
+
+    def _load(self):
+        if not self.directory:
+            return
+        npz_path, json_path, journal_path = self._paths()
+        try:
+            if os.path.exists(npz_path) and os.path.exists(json_path):
+                with open(json_path, encoding="utf-8") as f:
+                    meta = json.load(f)
+                with np.load(npz_path) as arrays:
+                    offsets, docs, tfs = arrays["offsets"], arrays["docs"], arrays["tfs"]
+                    doc_len = arrays["doc_len"]
+                for i, term in enumerate(meta["terms"]):
+                    start, stop = offsets[i], offsets[i + 1]
+                    self._terms[term] = (array("i", docs[start:stop].tobytes()), array("i", tfs[start:stop].tobytes()))
+                self._doc_ids = meta["doc_ids"]
+                self._names = meta["names"]
+                self._doc_len = array("i", doc_len.astype(np.int32).tobytes())
+                self._alive = bytearray(b"\x01" * len(self._doc_ids))
+                self._number_of = {d: i for i, d in enumerate(self._doc_ids)}
+                self._total_len = int(doc_len.sum())
+        except (OSError, ValueError, KeyError):
+            logger.exception("Search index snapshot unreadable; rebuilding from the journal only")
+            self._reset()
+
+        if os.path.exists(journal_path):
+            with open(journal_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        op = json.loads(line)
+                    except ValueError:
+                        break  # torn final write
+                    if op["op"] == "add":
+                        self._add(op["id"], op["name"], op["terms"])
+                    else:
+                        self._remove(op["id"])
+                    self._journal_ops += 1
+        if self._number_of:
+            logger.info("Loaded search index with %d documents", len(self._number_of))
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_search_index() -> SearchIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SearchIndex()
+    return _index
@@ -0,0 +1,192 @@
+import logging
+import threading
+from datetime import date, datetime, timedelta
+
+from storage_module.batch_writer import get_batch_writer
+from storage_module.database import DB_PATH, get_connection
+from storage_module.search_index import get_search_index
+
+logger = logging.getLogger(__name__)
+
+STATUSES = ("Pending", "Analyzed", "Flagged")
+PAGE_SIZE = 50
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    submitted_at TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'Pending',
+    score INTEGER,
+    type TEXT NOT NULL DEFAULT 'General',
+    resume_hash TEXT,
+    note TEXT
+);
+CREATE TABLE IF NOT EXISTS submission_texts (
+    submission_id INTEGER PRIMARY KEY REFERENCES submissions(id) ON DELETE CASCADE,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_submissions_submitted ON submissions(submitted_at);
+CREATE INDEX IF NOT EXISTS idx_submissions_status ON submissions(status, submitted_at);
+CREATE INDEX IF NOT EXISTS idx_submissions_type ON submissions(type, submitted_at);
+CREATE INDEX IF NOT EXISTS idx_submissions_score ON submissions(score);
+"""
+
+COLUMNS = "id, name, submitted_at, status, score, type"
+
+
+def _day_bounds(start, end):
+    """Half-open [start, end + 1 day) timestamp bounds for an inclusive date range."""
+    lower = start.isoformat() if start else "0000"
+    upper = (end + timedelta(days=1)).isoformat() if end else "9999"
+    return lower, upper
+
+
+def _filters(status, start, end):
+    lower, upper = _day_bounds(start, end)
+    clauses, params = ["submitted_at >= ?", "submitted_at < ?"], [lower, upper]
+    if status and status != "All":
+        clauses.append("status = ?")
+        params.append(status)
+    return clauses, params
+
+
+class SubmissionStore:
+    """
+    Resume submissions in SQLite. Listing uses keyset pagination over
+    (submitted_at, id), so any page costs an index seek plus PAGE_SIZE rows
+    no matter how deep it is; filters and the status counts are answered
+    from the status/date indexes. Resume text lives in its own table so
+    listing never reads it.
+    """
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    @property
+    def conn(self):
+        conn = get_connection(self.path)
+        if not self._schema_ready:
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.executescript(SCHEMA)
+                    self._schema_ready = True
+        return conn
+
+    def add(self, name, job_type="General", status="Pending", score=None, resume_hash=None,
+            text=None, submitted_at=None) -> int:
+        with self.conn as conn:
+            return self.insert(conn, name, job_type, status, score, resume_hash, text, submitted_at)
+
+    @staticmethod
+    def insert(conn, name, job_type="General", status="Pending", score=None, resume_hash=None,
+               text=None, submitted_at=None) -> int:
+        """Inserts within the caller's transaction; used directly by the batch writer."""
+        submitted_at = submitted_at or datetime.now()
+        cursor = conn.execute(
+            "INSERT INTO submissions (name, submitted_at, status, score, type, resume_hash) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (name, submitted_at.isoformat(sep=" ", timespec="seconds"), status, score,
+             job_type or "General", resume_hash)
+        )
+        if text:
+            conn.execute(
+                "INSERT INTO submission_texts (submission_id, text) VALUES (?, ?)",
+                (cursor.lastrowid, text)
+            )
+        return cursor.lastrowid
+
+    def page(self, status="All", start: date = None, end: date = None, after=None, limit: int = PAGE_SIZE) -> list:
+        """
+        Newest-first rows matching the filters. ``after`` is the
+        (submitted_at, id) of the last row of the previous page.
+        """
+        clauses, params = _filters(status, start, end)
+        if after:
+            clauses.append("(submitted_at, id) < (?, ?)")
+            params.extend(after)
+        rows = self.conn.execute(
+            f"SELECT {COLUMNS} FROM submissions WHERE {' AND '.join(clauses)} "
+            "ORDER BY submitted_at DESC, id DESC LIMIT ?",
+            params + [limit]
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_many(self, ids, status="All", start: date = None, end: date = None) -> list:
+        """Rows for ``ids`` that match the filters, in the order of ``ids``."""
+        ids = [int(x) for x in ids if str(x).isdigit()]
+        if not ids:
+            return []
+        clauses, params = _filters(status, start, end)
+        rows = {}
+        # stay under SQLite's bound-parameter limit
+        for i in range(0, len(ids), 500):
+            batch = ids[i:i + 500]
+            query = (
+                f"SELECT {COLUMNS} FROM submissions WHERE id IN ({','.join('?' * len(batch))}) "
+                f"AND {' AND '.join(clauses)}"
+            )
+            rows.update((row["id"], dict(row)) for row in self.conn.execute(query, batch + params))
+        return [rows[x] for x in ids if x in rows]
+
+    def get(self, submission_id):
+        row = self.conn.execute(
+            f"SELECT {COLUMNS}, note, text FROM submissions "
+            "LEFT JOIN submission_texts ON submission_id = id WHERE id = ?",
+            (submission_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def stats(self, start: date = None, end: date = None) -> dict:
+        """{status: count} plus ``total`` for the date range, from the status index."""
+        lower, upper = _day_bounds(start, end)
+        counts = dict.fromkeys(STATUSES, 0)
+        for status in STATUSES:
+            counts[status] = self.conn.execute(
+                "SELECT COUNT(*) FROM submissions WHERE status = ? AND submitted_at >= ? AND submitted_at < ?",
+                (status, lower, upper)
+            ).fetchone()[0]
+        counts["total"] = sum(counts.values())
+        return counts
+
+    def update_status(self, submission_id, status):
+        with self.conn as conn:
+            conn.execute("UPDATE submissions SET status = ? WHERE id = ?", (status, submission_id))
+
+    def save_note(self, submission_id, note):
+        with self.conn as conn:
+            conn.execute("UPDATE submissions SET note = ? WHERE id = ?", (note, submission_id))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_submission_store() -> SubmissionStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SubmissionStore()
+    return _store
+
+
+def record_submission(name, job_type, score, text, resume_hash=None, status="Analyzed") -> bool:
+    """
+    Queues an analyzed resume to be stored and made searchable off the
+    calling thread; returns False if the write queue was full.
+    """
+    store = get_submission_store()
+    store.conn  # make sure the tables exist before the writer inserts
+    submitted_at = datetime.now()
+
+    def write(conn):
+        submission_id = SubmissionStore.insert(
+            conn, name, job_type, status, score, resume_hash, text, submitted_at
+        )
+        # indexed once the row is committed, so search never returns a rolled-back id
+        return lambda: get_search_index().add(submission_id, name, text)
+
+    return get_batch_writer(store.path).submit(write)
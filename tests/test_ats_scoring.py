@@ -0,0 +1,43 @@
+import pytest
+
+from ai_modules.ai_analyzer import ResumeAnalyzer
+from ai_modules.ats_scoring import ATSScorer
+from benchmarks.analysis_stages import RESUME_TEMPLATE, legacy_format, legacy_pipeline, shared_pipeline
+from benchmarks.ats_scoring import REGRESSION_CORPUS, legacy_ats_score, synthetic_corpus
+
+
+@pytest.fixture(scope="module")
+def scorer():
+    return ATSScorer()
+
+
+@pytest.mark.parametrize("resume, job", REGRESSION_CORPUS)
+def test_hashed_scorer_matches_legacy_score(scorer, resume, job):
+    try:
+        expected = legacy_ats_score(resume, job)
+    except ValueError:
+        pytest.skip("CountVectorizer rejects an all-stop-word vocabulary")
+
+    assert scorer.score(resume, job) == expected
+
+
+def test_hashed_scorer_matches_legacy_score_on_synthetic_corpus(scorer):
+    for resume, job in synthetic_corpus(100, 300):
+        assert scorer.score(resume, job) == legacy_ats_score(resume, job)
+
+
+@pytest.mark.parametrize("words", [300, 3000])
+def test_parsed_once_pipeline_matches_original_stages(words):
+    text = RESUME_TEMPLATE.format(body=synthetic_corpus(1, words, seed=words)[0][0])
+    job = REGRESSION_CORPUS[0][1]
+
+    ats, fmt, _ = shared_pipeline(ResumeAnalyzer(), text, job)
+    legacy_ats, legacy_fmt, _ = legacy_pipeline(text, job)
+
+    assert (ats, fmt) == (legacy_ats, legacy_fmt)
+
+
+def test_format_score_matches_original():
+    analyzer = ResumeAnalyzer()
+    for resume, _ in REGRESSION_CORPUS:
+        assert analyzer.analyze_format(resume) == legacy_format(resume)
@@ -0,0 +1,98 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from tenacity import wait_none
+
+from dashboard_module import http_client
+from dashboard_module.http_client import MAX_ATTEMPTS, JobDataError, get_json
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers ``fail_first`` requests with ``status``, then 200 with a JSON body."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        self.server.state["connections"] += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        state = self.server.state
+        state["requests"] += 1
+        if state["requests"] <= state["fail_first"]:
+            status, body = state["status"], b"{}"
+        else:
+            status, body = 200, json.dumps({"data": [{"job_id": "job-1"}]}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.state = {"requests": 0, "connections": 0, "fail_first": 0, "status": 503}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def fresh_session(monkeypatch):
+    # a new pooled session per test, and no backoff sleeps between attempts
+    monkeypatch.setattr(http_client, "_session", None)
+    monkeypatch.setattr(http_client._get.retry, "wait", wait_none())
+    yield
+    if http_client._session is not None:
+        http_client._session.close()
+
+
+def url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/search"
+
+
+def test_retries_transient_status_over_one_connection(server):
+    server.state["fail_first"] = MAX_ATTEMPTS - 1
+
+    assert get_json(url(server)) == {"data": [{"job_id": "job-1"}]}
+    assert server.state["requests"] == MAX_ATTEMPTS
+    assert server.state["connections"] == 1
+
+
+def test_raises_job_data_error_when_retries_run_out(server):
+    server.state["fail_first"] = MAX_ATTEMPTS
+
+    with pytest.raises(JobDataError):
+        get_json(url(server))
+    assert server.state["requests"] == MAX_ATTEMPTS
+
+
+def test_does_not_retry_client_errors(server):
+    server.state.update(fail_first=1, status=404)
+
+    with pytest.raises(JobDataError):
+        get_json(url(server))
+    assert server.state["requests"] == 1
+
+
+def test_before_attempt_runs_per_attempt_and_can_stop_retries(server):
+    server.state["fail_first"] = MAX_ATTEMPTS
+    attempts = []
+
+    def charge():
+        if len(attempts) == 2:
+            raise RuntimeError("budget used up")
+        attempts.append(1)
+
+    with pytest.raises(RuntimeError):
+        get_json(url(server), before_attempt=charge)
+    assert server.state["requests"] == 2
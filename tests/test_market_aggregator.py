@@ -0,0 +1,23 @@
+import random
+from datetime import datetime
+
+import pytest
+
+from benchmarks.market_aggregator import fused_analysis, legacy_analysis, synthetic_postings
+from dashboard_module.market_aggregator import MarketAggregator
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_single_pass_matches_legacy_analysis(seed):
+    jobs = list(synthetic_postings(random.Random(seed).randint(1, 300), seed=seed))
+
+    assert fused_analysis(iter(jobs)) == legacy_analysis(jobs)
+
+
+def test_merged_aggregators_match_one_pass():
+    now = datetime.now()
+    jobs = list(synthetic_postings(400, seed=1, now=now))
+
+    merged = MarketAggregator(now).update(jobs[:150]).merge(MarketAggregator(now).update(jobs[150:]))
+
+    assert merged.result() == MarketAggregator(now).update(jobs).result()
@@ -0,0 +1,37 @@
+from dashboard_module.postings_index import PostingsIndex
+
+QUERY = "python developer with sql and docker"
+
+
+def postings(prefix, n, offset=0):
+    words = ["python", "sql", "docker", "java", "react", "excel", "sales", "design"]
+    return [
+        {"job_id": f"{prefix}-{i}", "job_title": f"Job {i}",
+         "job_description": " ".join(words[(i + j) % len(words)] for j in range(i % 5 + 1))}
+        for i in range(offset, offset + n)
+    ]
+
+
+def test_incremental_adds_rank_like_one_batch():
+    incremental, batch = PostingsIndex(directory=None), PostingsIndex(directory=None)
+    for offset in range(0, 60, 3):
+        incremental.add(postings("job", 3, offset))
+    batch.add(postings("job", 60))
+
+    assert incremental.get_stats()["chunks"] < 20
+    assert incremental.search(QUERY, top_k=10) == batch.search(QUERY, top_k=10)
+
+
+def test_indexes_sharing_a_directory_keep_each_others_chunks(tmp_path):
+    first, second = PostingsIndex(str(tmp_path)), PostingsIndex(str(tmp_path))
+    first.add(postings("first", 5))
+    second.add(postings("second", 5))
+    # both processes fetched the same posting
+    second.add(postings("first", 1))
+
+    reloaded = PostingsIndex(str(tmp_path))
+
+    assert len(reloaded) == 10
+    assert sorted(p["job_id"] for p in reloaded._postings) == sorted(
+        [f"first-{i}" for i in range(5)] + [f"second-{i}" for i in range(5)]
+    )
@@ -0,0 +1,65 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from dashboard_module import postings_store
+from dashboard_module.postings_store import PostingsStore
+
+NOW = datetime(2026, 10, 1, 12)
+
+
+def postings(ids, title=""):
+    return [{"job_id": job_id, "job_title": title, "job_description": "python and sql"} for job_id in ids]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PostingsStore(str(tmp_path))
+
+
+def test_load_keeps_the_latest_fetch_of_each_job(store):
+    store.append(postings(["a", "b"], "first"), "engineer", "remote", NOW - timedelta(days=2))
+    store.append(postings(["a", "c"], "third"), "engineer", "remote", NOW)
+    store.append(postings(["b"], "second"), "engineer", "remote", NOW - timedelta(days=1))
+
+    frame = store.load("engineer", "remote")
+
+    assert list(zip(frame["job_id"], frame["job_title"])) == [("b", "second"), ("a", "third"), ("c", "third")]
+    assert list(store.load("engineer", "remote", columns=["job_title"]).columns) == ["job_title"]
+
+
+def test_load_during_appends_and_compaction(store, monkeypatch):
+    monkeypatch.setattr(postings_store, "COMPACT_AFTER_FILES", 2)
+    store.append(postings(["job-0"]), "engineer", "remote", NOW)
+    done = threading.Event()
+    errors = []
+
+    def reader():
+        while not done.is_set():
+            try:
+                store.load("engineer", "remote")
+            except Exception as e:
+                errors.append(e)
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    try:
+        for i in range(1, 200, 5):
+            store.append(postings([f"job-{j}" for j in range(i, i + 5)]), "engineer", "remote", NOW)
+    finally:
+        done.set()
+        thread.join()
+
+    assert errors == []
+    assert len(store.load("engineer", "remote")) == 201
+
+
+def test_analyze_counts_skills_once_per_job(store):
+    store.append(postings(["a", "b"]), "engineer", "remote", NOW - timedelta(days=1))
+    store.append(postings(["a"]), "engineer", "remote", NOW)
+
+    result = store.analyze("engineer", "remote", now=NOW)
+
+    assert result["market_overview"]["total_jobs"] == 2
+    assert result["skills_demand"] == {"python": 2, "sql": 2}
@@ -0,0 +1,57 @@
+import pytest
+
+from ai_modules.skill_taxonomy import SkillTaxonomy, get_taxonomy
+from benchmarks.analysis_stages import LEGACY_SKILLS
+from dashboard_module.market_aggregator import MarketAggregator
+
+
+@pytest.fixture(scope="module")
+def taxonomy():
+    return get_taxonomy()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Backend in Node.js and Express.js, frontend in React.js and Vue.js",
+     {"node.js", "express.js", "react", "vue"}),
+    ("JS, TS and a bit of Python", {"javascript", "python"}),
+    ("Python. JS on the side", {"python", "javascript"}),
+    ("node js, nodejs", {"node.js"}),
+    ("Deployed on Google Cloud Platform", {"gcp"}),
+    ("Google Cloud and other cloud providers", {"gcp", "cloud"}),
+    ("Java and JavaScript", {"java", "javascript"}),
+    ("C++, C# and spring boot", {"c++", "c#", "spring"}),
+    ("Machine learning with scikit-learn", {"machine learning", "scikit-learn"}),
+    ("", set()),
+])
+def test_find(taxonomy, text, expected):
+    assert taxonomy.find(text) == expected
+
+
+@pytest.mark.parametrize("category, skill", [
+    (category, skill) for category, skills in LEGACY_SKILLS.items() for skill in sorted(skills)
+])
+def test_original_skills_are_still_found_in_their_category(taxonomy, category, skill):
+    assert taxonomy.find_by_category(f"Experience with {skill}, among others.")[category] == {skill}
+
+
+def test_longer_alias_hides_the_skill_it_contains():
+    taxonomy = SkillTaxonomy({"cloud": {"gcp": ["google cloud"], "cloud": []}})
+
+    assert taxonomy.find("google cloud") == {"gcp"}
+    assert [skill for _, _, skill in taxonomy.iter_matches("google cloud, any cloud")] == ["gcp", "cloud"]
+
+
+def test_iter_matches_spans(taxonomy):
+    text = "Node.js and Google Cloud"
+
+    assert [(text[start:end], skill) for start, end, skill in taxonomy.iter_matches(text)] == [
+        ("Node.js", "node.js"), ("Google Cloud", "gcp")
+    ]
+
+
+def test_market_skills_demand_counts_node_js_postings_as_node_js():
+    jobs = [{"job_id": f"job-{i}", "job_description": "Node.js developer on Google Cloud"} for i in range(30)]
+
+    skills = MarketAggregator().update(jobs).result()["skills_demand"]
+
+    assert skills == {"node.js": 30, "gcp": 30}